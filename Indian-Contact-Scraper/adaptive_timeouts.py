@@ -0,0 +1,51 @@
+import threading
+from collections import deque
+
+
+class AdaptiveTimeouts:
+    """
+    Per-host (connect, read) timeouts derived from a rolling window of observed
+    response times: a high percentile times a safety factor, clamped. Hosts
+    without enough history get the defaults.
+    """
+
+    def __init__(self, window=50, percentile=0.95, factor=3.0, min_samples=3,
+                 connect_range=(2.0, 10.0), read_range=(4.0, 30.0), default=(5.0, 15.0)):
+        self.window = window
+        self.percentile = percentile
+        self.factor = factor
+        self.min_samples = min_samples
+        self.connect_range = connect_range
+        self.read_range = read_range
+        self.default = default
+
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def record(self, host, seconds):
+        """Add the time a host took to send response headers"""
+        with self.lock:
+            samples = self.samples.get(host)
+            if samples is None:
+                samples = self.samples[host] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def estimate(self, host):
+        """The host's latency percentile, or None without enough samples"""
+        with self.lock:
+            samples = self.samples.get(host)
+            if not samples or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        return ordered[index]
+
+    def timeouts(self, host):
+        """(connect, read) timeouts to use for the next request to a host"""
+        latency = self.estimate(host)
+        if latency is None:
+            return self.default
+        budget = latency * self.factor
+        connect = min(max(budget, self.connect_range[0]), self.connect_range[1])
+        read = min(max(budget, self.read_range[0]), self.read_range[1])
+        return connect, read
@@ -0,0 +1,119 @@
+import signal
+import threading
+import time
+
+# Reason a token gives when its deadline, rather than a person, stopped the run
+TIME_LIMIT_REASON = "time limit reached"
+
+
+class Cancelled(Exception):
+    """The run was cancelled or reached its deadline; work in progress should stop"""
+
+
+class CancellationToken:
+    """
+    Shared stop signal for one run, with an optional deadline. The scrape
+    loop, fetch layer and extractors check it between steps, sleep on it so
+    a cancel wakes them immediately, and cap their timeouts to the time left.
+    """
+
+    def __init__(self, timeout=None):
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.event = threading.Event()
+        self.reason = None
+        self.lock = threading.Lock()
+        self.callbacks = []
+
+    def cancel(self, reason="cancelled"):
+        """Stop the run; callbacks registered with on_cancel (e.g. closing open responses) run now"""
+        with self.lock:
+            if self.event.is_set():
+                return
+            self.reason = reason
+            self.event.set()
+            callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+
+    @property
+    def cancelled(self):
+        if not self.event.is_set() and self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel(TIME_LIMIT_REASON)
+        return self.event.is_set()
+
+    def remaining(self):
+        """Seconds until the deadline (None without one); 0 once cancelled"""
+        if self.cancelled:
+            return 0.0
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    def can_finish(self, seconds):
+        """Whether work expected to take this long fits in the time left"""
+        remaining = self.remaining()
+        return remaining is None or remaining >= seconds
+
+    def cap(self, seconds):
+        """A timeout shortened so it doesn't run past the deadline"""
+        remaining = self.remaining()
+        if remaining is None:
+            return seconds
+        return max(min(seconds, remaining), 0.001)
+
+    def check(self):
+        """Raise Cancelled if the run should stop"""
+        if self.cancelled:
+            raise Cancelled(self.reason)
+
+    def sleep(self, seconds):
+        """Sleep that ends early (raising Cancelled) when the run is cancelled or runs out of time"""
+        self.check()
+        self.event.wait(self.cap(seconds))
+        self.check()
+
+    def on_cancel(self, callback):
+        """Call callback when the token is cancelled; returns a function that unregisters it"""
+        with self.lock:
+            if not self.event.is_set():
+                self.callbacks.append(callback)
+                registered = True
+            else:
+                registered = False
+        if not registered:
+            callback()
+
+        def unregister():
+            with self.lock:
+                if callback in self.callbacks:
+                    self.callbacks.remove(callback)
+        return unregister
+
+
+def install_interrupt_handler(token):
+    """
+    Make Ctrl-C cancel the token and abort whatever the main thread is doing,
+    so the run stops at once but still saves its results. A second Ctrl-C
+    interrupts as usual. Returns a function that puts the previous handler
+    back; call it once the run is over.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return lambda: None
+
+    def handle(signum, frame):
+        if token.event.is_set():
+            raise KeyboardInterrupt
+        print("\nInterrupted, stopping and saving results (Ctrl-C again to quit immediately)...")
+        token.cancel("interrupted by user")
+        raise Cancelled(token.reason)
+
+    previous = signal.signal(signal.SIGINT, handle)
+
+    def restore():
+        if signal.getsignal(signal.SIGINT) is handle:
+            # None means the previous handler wasn't installed from Python
+            signal.signal(signal.SIGINT, previous if previous is not None else signal.default_int_handler)
+    return restore
@@ -0,0 +1,134 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Subcommand -> (module whose main() runs it, help text). Modules are imported
+# only when their subcommand runs, so e.g. fixing a CSV never loads requests or bs4.
+COMMANDS = {
+    'scrape': ('run_scraper', 'Scrape contacts for a profession in a city'),
+    'enhanced': ('run_enhanced_scraper', 'Scrape with the enhanced runner (also repairs its CSV with --fix)'),
+    'distributed': ('run_distributed', 'Coordinator/worker runs over a shared work queue'),
+    'debug': ('debug_scraper', 'Inspect the search results for one query'),
+    'fix-csv': ('fix_csv_numbers', 'Repair phone numbers in scientific notation in a CSV file'),
+    'files': ('file_explorer', 'List and open the CSV files in the output directory'),
+    'reextract': ('page_archive', 'Re-run extraction over archived pages, without the network'),
+}
+
+# Modules whose import cost the benchmark reports by default
+BENCH_MODULES = ['cli', 'fix_csv_numbers', 'file_explorer', 'csv_manager', 'phone_normalizer',
+                 'indian_contact_scraper', 'run_scraper']
+
+# Third-party packages worth flagging when a module pulls them in
+HEAVY_PACKAGES = ('requests', 'bs4', 'pandas', 'httpx', 'streamlit', 're2')
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_TIMER = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = time.perf_counter() - start\n"
+    "print(elapsed, ','.join(p for p in {heavy!r} if p in sys.modules))\n"
+)
+
+
+def time_import(module, repeat=5):
+    """
+    Import a module in fresh interpreters and return (median seconds, heavy
+    packages it loaded), or (None, error message) if the import failed.
+    """
+    code = _TIMER.format(module=module, heavy=HEAVY_PACKAGES)
+    samples = []
+    loaded = ''
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', code], cwd=SCRIPT_DIR,
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        if result.returncode != 0:
+            lines = result.stderr.strip().splitlines()
+            return None, lines[-1] if lines else f"exit status {result.returncode}"
+        elapsed, _, loaded = result.stdout.strip().partition(' ')
+        samples.append(float(elapsed))
+    return statistics.median(samples), loaded
+
+
+def slowest_imports(module, limit=10):
+    """The imports with the highest self time when loading a module, from python -X importtime"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"], cwd=SCRIPT_DIR,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = [field.strip() for field in line[len('import time:'):].split('|')]
+        if len(fields) == 3 and fields[0].isdigit():
+            entries.append((int(fields[0]), int(fields[1]), fields[2].strip()))
+    return sorted(entries, reverse=True)[:limit]
+
+
+def bench_imports(argv=None):
+    parser = argparse.ArgumentParser(prog='cli.py bench-imports',
+                                     description='Measure how long each module takes to import in a fresh interpreter')
+    parser.add_argument('modules', nargs='*', help=f"Modules to time (default: {', '.join(BENCH_MODULES)})")
+    parser.add_argument('--repeat', type=int, default=5, help='Fresh interpreters per module; the median is reported (default: 5)')
+    parser.add_argument('--detail', action='store_true', help='Also list the slowest individual imports of each module')
+    parser.add_argument('--max-ms', type=float, default=None,
+                        help='Exit with status 1 if any module takes longer than this to import')
+    args = parser.parse_args(argv)
+
+    # Baseline: an interpreter that imports nothing extra
+    baseline, _ = time_import('sys', repeat=args.repeat)
+    over_budget = []
+    failed = []
+    print(f"{'module':<26} {'import ms':>10}  heavy packages loaded")
+    for module in args.modules or BENCH_MODULES:
+        elapsed, loaded = time_import(module, repeat=args.repeat)
+        if elapsed is None:
+            failed.append(module)
+            print(f"{module:<26} {'failed':>10}  {loaded}")
+            continue
+        ms = max(elapsed - baseline, 0) * 1000
+        print(f"{module:<26} {ms:>10.1f}  {loaded or '-'}")
+        if args.max_ms is not None and ms > args.max_ms:
+            over_budget.append(module)
+        if args.detail:
+            for self_us, cumulative_us, name in slowest_imports(module):
+                print(f"    {name:<40} self {self_us / 1000:>7.1f} ms, cumulative {cumulative_us / 1000:>7.1f} ms")
+
+    if over_budget:
+        print(f"\nOver the {args.max_ms:g} ms budget: {', '.join(over_budget)}")
+    return 1 if over_budget or failed else 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parser = argparse.ArgumentParser(
+        prog='cli.py',
+        description='Indian Contact Scraper command line',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='commands:\n' + '\n'.join(
+            f"  {name:<14}{help_text}" for name, (_, help_text) in COMMANDS.items()
+        ) + f"\n  {'bench-imports':<14}Measure the import time of each module\n\n"
+            "Run 'cli.py <command> --help' for a command's options."
+    )
+    parser.add_argument('command', choices=list(COMMANDS) + ['bench-imports'], metavar='command')
+
+    if not argv or argv[0] in ('-h', '--help'):
+        parser.print_help()
+        return 0
+    args = parser.parse_args(argv[:1])
+    rest = argv[1:]
+
+    if args.command == 'bench-imports':
+        return bench_imports(rest)
+
+    module_name, _ = COMMANDS[args.command]
+    # Imported here so each command only pays for its own dependencies
+    module = __import__(module_name)
+    sys.argv = [f"cli.py {args.command}"] + rest
+    return module.main(rest)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
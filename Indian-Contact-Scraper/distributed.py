@@ -0,0 +1,206 @@
+import os
+import socket
+import threading
+import time
+
+from host_health import host_key
+from indian_contact_scraper import IndianContactScraper
+from work_queue import PAGE_TASK, SEARCH_TASK
+
+
+def job_key(state, city, profession):
+    """Identifier contacts are stored under for one state/city/profession run"""
+    return f"{state}|{city}|{profession}"
+
+
+def dedup_scope(payload):
+    """Scope a task's dedup key is unique in: its job and the run that seeded it"""
+    scope = job_key(payload["state"], payload["city"], payload["profession"])
+    return f"{scope}|{payload['run']}" if payload.get("run") else scope
+
+
+class Coordinator:
+    """
+    Seeds the shared queue with the search queries for a run and collects the
+    contacts workers push back. It makes no requests itself.
+    """
+
+    def __init__(self, queue, state, city, profession, output_file=None):
+        self.queue = queue
+        self.job = {"state": state, "city": city, "profession": profession}
+        # Used only for query generation and CSV output
+        self.scraper = IndianContactScraper(state, city, profession, output_file=output_file)
+
+    def seed(self, pages_per_query=3):
+        """
+        Start a new run of the job and enqueue a search task per query and
+        results page; returns how many were queued. Seeding the same job again
+        later starts over rather than finding everything already queued.
+        """
+        run = self.queue.start_run(job_key(**self.job))
+        added = 0
+        for query in self.scraper.generate_search_queries():
+            for page in range(pages_per_query):
+                payload = dict(self.job, run=run, query=query, start=page * 10)
+                if self.queue.put(SEARCH_TASK, payload, dedup_key=f"search:{query.casefold()}:{page * 10}",
+                                  scope=dedup_scope(payload)):
+                    added += 1
+        print(f"Queued {added} search tasks for {self.job['profession']}s in {self.job['city']}")
+        return added
+
+    def wait(self, poll_interval=10.0):
+        """Block until no tasks are pending or leased, printing progress"""
+        while True:
+            stats = self.queue.stats()
+            print(f"Queue: {stats['pending']} pending, {stats['leased']} in progress, "
+                  f"{stats['done']} done, {stats['failed']} failed, {stats['contacts']} contacts")
+            if stats["pending"] == 0 and stats["leased"] == 0:
+                return stats
+            time.sleep(poll_interval)
+
+    def collect(self):
+        """Write every contact workers found for this run to the output CSV"""
+        self.scraper.contacts = self.queue.contacts(job_key(**self.job))
+        self.scraper.save_to_csv()
+        return len(self.scraper.contacts)
+
+
+class LeaseKeeper:
+    """
+    Renews a task's lease in the background while the worker runs it, so a
+    long wait for a busy host's slot or a slow site crawl doesn't let the
+    lease run out and hand the task to a second worker.
+    """
+
+    def __init__(self, queue, task, lease):
+        self.queue = queue
+        self.task = task
+        self.lease = lease
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._renew, daemon=True)
+
+    def _renew(self):
+        # Renew well before expiry, so one slow renewal doesn't lose the lease
+        while not self.stopped.wait(self.lease / 3):
+            try:
+                if not self.queue.extend(self.task, lease=self.lease):
+                    # Another worker has it now; our result will be dropped on complete
+                    return
+            except Exception as e:
+                print(f"Could not renew the lease on task {self.task.id}: {e}")
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stopped.set()
+        self.thread.join()
+
+
+class Worker:
+    """
+    Claims tasks from the shared queue: search tasks enqueue their result
+    pages, page tasks are extracted and their contacts pushed back. Page
+    dedup and per-host politeness go through the queue, so they hold across
+    every worker on every node. A task's lease is renewed for as long as the
+    worker is on it, including while it waits for a host's request slot.
+    """
+
+    def __init__(self, queue, scraper_factory, worker_id=None, lease=180.0,
+                 host_interval=2.0, search_interval=8.0, max_attempts=3):
+        self.queue = queue
+        self.scraper_factory = scraper_factory
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease = lease
+        self.host_interval = host_interval
+        self.search_interval = search_interval
+        self.max_attempts = max_attempts
+
+        # One scraper per job, reused across its tasks
+        self.scrapers = {}
+        self.stats = {"search": 0, "page": 0, "failed": 0, "contacts": 0}
+
+    def scraper_for(self, payload):
+        key = job_key(payload["state"], payload["city"], payload["profession"])
+        scraper = self.scrapers.get(key)
+        if scraper is None:
+            scraper = self.scrapers[key] = self.scraper_factory(
+                payload["state"], payload["city"], payload["profession"])
+        return scraper
+
+    def wait_for_slot(self, host, interval):
+        """Sleep until this worker's reserved request slot for a host comes up"""
+        wait = self.queue.acquire_host(host, interval)
+        if wait > 0:
+            time.sleep(wait)
+
+    def run_search(self, task, scraper):
+        payload = task.payload
+        self.wait_for_slot("www.google.com", self.search_interval)
+        urls, _ = scraper.get_search_result_urls(payload["query"], start=payload["start"])
+        if urls is None:
+            raise RuntimeError(f"Search failed for '{payload['query']}'")
+        if scraper.domain_stats:
+            urls = scraper.domain_stats.rank_urls(urls, limit=10)
+        else:
+            urls = urls[:10]
+
+        # Pages belong to the search's run: deduplicated within it, not across jobs
+        job = {key: payload[key] for key in ("state", "city", "profession", "run") if key in payload}
+        queued = sum(self.queue.put(PAGE_TASK, dict(job, url=url), dedup_key=f"page:{url}",
+                                    scope=dedup_scope(payload)) for url in urls)
+        print(f"[{self.worker_id}] '{payload['query']}' page {payload['start'] // 10 + 1}: "
+              f"queued {queued} of {len(urls)} URLs")
+        return []
+
+    def run_page(self, task, scraper):
+        url = task.payload["url"]
+        self.wait_for_slot(host_key(url), self.host_interval)
+        contacts_before = len(scraper.contacts)
+        scraper.extract_contact_info_from_page(url)
+        return scraper.contacts[contacts_before:]
+
+    def run_once(self):
+        """Claim and run one task; returns False if the queue had nothing to claim"""
+        task = self.queue.claim(self.worker_id, lease=self.lease)
+        if task is None:
+            return False
+
+        scraper = self.scraper_for(task.payload)
+        try:
+            with LeaseKeeper(self.queue, task, self.lease):
+                if task.kind == SEARCH_TASK:
+                    contacts = self.run_search(task, scraper)
+                else:
+                    contacts = self.run_page(task, scraper)
+        except Exception as e:
+            self.stats["failed"] += 1
+            status = self.queue.fail(task, e, max_attempts=self.max_attempts)
+            print(f"[{self.worker_id}] {task.kind} task {task.id} failed ({status}): {e}")
+            return True
+
+        job = job_key(task.payload["state"], task.payload["city"], task.payload["profession"])
+        if self.queue.complete(task, job=job, contacts=contacts):
+            self.stats[task.kind] += 1
+            self.stats["contacts"] += len(contacts)
+        else:
+            print(f"[{self.worker_id}] Lease on task {task.id} expired before it finished; result dropped")
+        return True
+
+    def run(self, idle_timeout=60.0, poll_interval=2.0):
+        """Work until the queue has been empty for idle_timeout seconds (None to run forever)"""
+        print(f"Worker {self.worker_id} started")
+        idle_since = None
+        while True:
+            if self.run_once():
+                idle_since = None
+                continue
+            now = time.time()
+            idle_since = idle_since or now
+            if idle_timeout is not None and now - idle_since >= idle_timeout:
+                break
+            time.sleep(poll_interval)
+        print(f"Worker {self.worker_id} finished: {self.stats['search']} searches, {self.stats['page']} pages, "
+              f"{self.stats['failed']} failures, {self.stats['contacts']} contacts")
+        return self.stats
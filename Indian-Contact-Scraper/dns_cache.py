@@ -0,0 +1,183 @@
+import ipaddress
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+# dnspython is optional: with it, entries live for the record's own TTL
+try:
+    import dns.exception
+    import dns.resolver
+except ImportError:
+    dns = None
+
+# Resolver errors that mean the name doesn't exist (worth caching) rather than a transient failure
+_NEGATIVE_ERRORS = tuple(
+    getattr(socket, name) for name in ("EAI_NONAME", "EAI_NODATA") if hasattr(socket, name)
+)
+
+
+def _is_ip_address(host):
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+class DnsCache:
+    """
+    In-process cache in front of socket.getaddrinfo. Answers are kept for
+    their TTL (or default_ttl without dnspython), names that don't exist are
+    cached for negative_ttl so dead result domains fail instantly, and the
+    hosts of upcoming URLs can be resolved in the background. install()
+    patches socket.getaddrinfo for the whole process until uninstall(); used
+    as a context manager the cache is installed only inside the with block.
+    """
+
+    def __init__(self, default_ttl=300.0, negative_ttl=120.0, min_ttl=30.0, max_ttl=3600.0,
+                 prefetch_workers=8):
+        self.default_ttl = default_ttl
+        self.negative_ttl = negative_ttl
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.prefetch_workers = prefetch_workers
+
+        # (host, port, family, type, proto, flags) -> (expires_at, addresses or gaierror)
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.executor = None
+        self.system_getaddrinfo = socket.getaddrinfo
+        self.installed = False
+        self.stats = {"hits": 0, "misses": 0, "negative_hits": 0, "prefetched": 0}
+
+    def install(self):
+        """Route every getaddrinfo call in the process (requests/urllib3 included) through the cache"""
+        with self.lock:
+            if not self.installed:
+                # Whatever is installed now (the system resolver or another wrapper) answers misses
+                self.system_getaddrinfo = socket.getaddrinfo
+                socket.getaddrinfo = self.getaddrinfo
+                self.installed = True
+        return self
+
+    def uninstall(self):
+        """Put back the getaddrinfo that install() replaced"""
+        with self.lock:
+            if self.installed:
+                # Only if nothing has wrapped us since; otherwise that wrapper would be lost
+                if socket.getaddrinfo == self.getaddrinfo:
+                    socket.getaddrinfo = self.system_getaddrinfo
+                self.installed = False
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.uninstall()
+        self.shutdown()
+
+    def _count(self, stat):
+        with self.lock:
+            self.stats[stat] += 1
+
+    def _resolve_with_dnspython(self, host, port, family, type, proto):
+        """Resolve through dnspython, returning (addresses, ttl), or None to use the system resolver"""
+        if dns is None:
+            return None
+        record_types = {socket.AF_INET: ("A",), socket.AF_INET6: ("AAAA",)}.get(family, ("A", "AAAA"))
+        sock_type = type or socket.SOCK_STREAM
+        sock_proto = proto or (socket.IPPROTO_TCP if sock_type == socket.SOCK_STREAM else 0)
+
+        addresses = []
+        ttls = []
+        for record_type in record_types:
+            try:
+                answer = dns.resolver.resolve(host, record_type)
+            except dns.resolver.NXDOMAIN:
+                raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+            except (dns.resolver.NoAnswer, dns.resolver.NoNameservers):
+                continue
+            except dns.exception.DNSException:
+                return None
+            ttls.append(answer.rrset.ttl)
+            for record in answer:
+                if record_type == "A":
+                    addresses.append((socket.AF_INET, sock_type, sock_proto, "", (record.address, port)))
+                else:
+                    addresses.append((socket.AF_INET6, sock_type, sock_proto, "", (record.address, port, 0, 0)))
+        if not addresses:
+            return None
+        return addresses, min(ttls)
+
+    def _resolve(self, key):
+        """Resolve a key, returning (addresses or gaierror, ttl)"""
+        host, port, family, type, proto, flags = key
+        try:
+            resolved = self._resolve_with_dnspython(host, port, family, type, proto)
+            if resolved is not None:
+                addresses, ttl = resolved
+                return addresses, min(max(ttl, self.min_ttl), self.max_ttl)
+            return self.system_getaddrinfo(host, port, family, type, proto, flags), self.default_ttl
+        except socket.gaierror as e:
+            if e.args and e.args[0] in _NEGATIVE_ERRORS:
+                return e, self.negative_ttl
+            raise
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        """Drop-in replacement for socket.getaddrinfo"""
+        if host is None or not isinstance(host, str) or _is_ip_address(host) or host == "localhost":
+            return self.system_getaddrinfo(host, port, family, type, proto, flags)
+
+        key = (host.lower(), port, family, type, proto, flags)
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+        if entry is not None and entry[0] > now:
+            if isinstance(entry[1], socket.gaierror):
+                self._count("negative_hits")
+                raise entry[1]
+            self._count("hits")
+            return list(entry[1])
+
+        self._count("misses")
+        result, ttl = self._resolve(key)
+        with self.lock:
+            self.entries[key] = (time.monotonic() + ttl, result)
+        if isinstance(result, socket.gaierror):
+            raise result
+        return list(result)
+
+    def prefetch(self, urls):
+        """Start resolving the hosts of URLs about to be fetched, without waiting for the answers"""
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.prefetch_workers)
+        seen = set()
+        for url in urls:
+            parsed = urlparse(url)
+            host = parsed.hostname
+            if not host or host in seen:
+                continue
+            seen.add(host)
+            port = parsed.port or (443 if parsed.scheme == "https" else 80)
+            # Same arguments urllib3 uses, so the fetch hits this cache entry
+            self.executor.submit(self._prefetch_one, host, port)
+
+    def _prefetch_one(self, host, port):
+        try:
+            self.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+            self._count("prefetched")
+        except (socket.gaierror, OSError):
+            pass
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    def summary(self):
+        with self.lock:
+            stats = dict(self.stats)
+        return (f"- DNS cache: {stats['hits']} hits, {stats['misses']} misses, "
+                f"{stats['negative_hits']} negative hits, {stats['prefetched']} prefetched")
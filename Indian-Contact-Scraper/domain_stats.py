@@ -0,0 +1,113 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+from storage import DEFAULT_DB_PATH, open_database
+
+
+def domain_key(url):
+    """Domain a URL's statistics are kept under (lowercase, without www.)"""
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class DomainStatsStore:
+    """
+    Persistent per-domain fetch statistics (fetches, successes, contacts
+    yielded, latency, bytes) used to rank candidate URLs by expected
+    contacts per second and to skip domains that never produce contacts
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, block_after=5, prior_fetches=2,
+                 prior_contacts=1.0, default_latency=3.0):
+        # Domains with this many successful fetches and no contacts are skipped
+        self.block_after = block_after
+
+        # Unknown domains are scored as if they had this small history
+        self.prior_fetches = prior_fetches
+        self.prior_contacts = prior_contacts
+        self.default_latency = default_latency
+
+        self.lock = threading.Lock()
+        self.connection = open_database(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS domain_stats ("
+            " domain TEXT PRIMARY KEY,"
+            " fetches INTEGER NOT NULL DEFAULT 0,"
+            " successes INTEGER NOT NULL DEFAULT 0,"
+            " contacts INTEGER NOT NULL DEFAULT 0,"
+            " total_latency REAL NOT NULL DEFAULT 0,"
+            " total_bytes INTEGER NOT NULL DEFAULT 0,"
+            " updated_at REAL NOT NULL DEFAULT 0)"
+        )
+        self.connection.commit()
+
+        # Keep every row in memory; ranking a results page shouldn't hit the disk
+        self.rows = {}
+        for row in self.connection.execute(
+                "SELECT domain, fetches, successes, contacts, total_latency, total_bytes FROM domain_stats"):
+            self.rows[row[0]] = {
+                "fetches": row[1], "successes": row[2], "contacts": row[3],
+                "total_latency": row[4], "total_bytes": row[5],
+            }
+
+    def get(self, domain):
+        """Statistics for a domain (zeros if it has never been fetched)"""
+        return self.rows.get(domain) or {
+            "fetches": 0, "successes": 0, "contacts": 0, "total_latency": 0.0, "total_bytes": 0,
+        }
+
+    def _save(self, domain, stats):
+        self.rows[domain] = stats
+        self.connection.execute(
+            "INSERT OR REPLACE INTO domain_stats "
+            "(domain, fetches, successes, contacts, total_latency, total_bytes, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (domain, stats["fetches"], stats["successes"], stats["contacts"],
+             stats["total_latency"], stats["total_bytes"], time.time())
+        )
+        self.connection.commit()
+
+    def record_fetch(self, url, success, latency, size=0):
+        """Record one page fetch for the URL's domain"""
+        domain = domain_key(url)
+        with self.lock:
+            stats = dict(self.get(domain))
+            stats["fetches"] += 1
+            stats["total_latency"] += latency
+            if success:
+                stats["successes"] += 1
+                stats["total_bytes"] += size
+            self._save(domain, stats)
+
+    def record_contacts(self, url, count):
+        """Credit contacts extracted from a page to the URL's domain"""
+        if not count:
+            return
+        domain = domain_key(url)
+        with self.lock:
+            stats = dict(self.get(domain))
+            stats["contacts"] += count
+            self._save(domain, stats)
+
+    def is_blocked(self, url):
+        """Whether the URL's domain has consistently produced nothing"""
+        stats = self.get(domain_key(url))
+        return stats["successes"] >= self.block_after and stats["contacts"] == 0
+
+    def score(self, url):
+        """Expected contacts per second of fetch time for the URL's domain"""
+        stats = self.get(domain_key(url))
+        fetches = stats["fetches"]
+
+        expected_contacts = (stats["contacts"] + self.prior_contacts) / (fetches + self.prior_fetches)
+        average_latency = ((stats["total_latency"] + self.default_latency * self.prior_fetches)
+                           / (fetches + self.prior_fetches))
+        return expected_contacts / max(average_latency, 0.1)
+
+    def rank_urls(self, urls, limit=None):
+        """Drop blocklisted domains and order URLs by expected yield; ties keep result rank"""
+        candidates = [(index, url) for index, url in enumerate(urls) if not self.is_blocked(url)]
+        candidates.sort(key=lambda item: (-self.score(item[1]), item[0]))
+        ranked = [url for _, url in candidates]
+        return ranked[:limit] if limit else ranked
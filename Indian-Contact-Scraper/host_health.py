@@ -0,0 +1,152 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def host_key(url):
+    """Host a URL's health is tracked under (lowercase, port included)"""
+    return urlparse(url).netloc.lower()
+
+
+def parse_retry_after(value, now=None):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+    return max(0.0, retry_at - (now if now is not None else time.time()))
+
+
+class HostState:
+    """Failure count, breaker state and backoff window of one host"""
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.retry_at = 0.0
+        self.probe_in_flight = False
+
+
+class HostHealthTracker:
+    """
+    Per-host circuit breaker with bounded exponential backoff. A host opens
+    after failure_threshold consecutive failures and is skipped until
+    reset_timeout has passed; then a single probe request decides whether
+    it closes again. Failures and Retry-After only delay the failing host.
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=120.0, base_backoff=1.0,
+                 max_backoff=60.0, max_retry_after=300.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+
+        self.hosts = {}
+        self.lock = threading.Lock()
+        self.stats = {"failures": 0, "throttled": 0, "circuits_opened": 0, "skipped": 0}
+
+    def _state(self, host):
+        state = self.hosts.get(host)
+        if state is None:
+            state = self.hosts[host] = HostState()
+        return state
+
+    def backoff(self, failures):
+        """Delay after a number of consecutive failures: exponential, capped, with jitter"""
+        delay = min(self.max_backoff, self.base_backoff * 2 ** max(failures - 1, 0))
+        # "Equal jitter": keep at least half the delay, randomize the rest
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def allow(self, host):
+        """Whether a request to the host may be made now (claims the probe when half-open)"""
+        with self.lock:
+            state = self._state(host)
+            if state.state == OPEN:
+                if time.monotonic() - state.opened_at < self.reset_timeout:
+                    self.stats["skipped"] += 1
+                    return False
+                state.state = HALF_OPEN
+                state.probe_in_flight = False
+            if state.state == HALF_OPEN:
+                if state.probe_in_flight:
+                    self.stats["skipped"] += 1
+                    return False
+                state.probe_in_flight = True
+            return True
+
+    def release_probe(self, host):
+        """
+        Give up a claimed probe that ended without telling us anything about the
+        host (e.g. the run was cancelled), so the next request can probe instead
+        """
+        with self.lock:
+            state = self.hosts.get(host)
+            if state is not None and state.state == HALF_OPEN:
+                state.probe_in_flight = False
+
+    def wait_time(self, host):
+        """Seconds until the host's backoff window ends (0 if it may be tried now)"""
+        with self.lock:
+            state = self.hosts.get(host)
+            if state is None:
+                return 0.0
+            return max(0.0, state.retry_at - time.monotonic())
+
+    def record_success(self, host):
+        with self.lock:
+            state = self._state(host)
+            state.state = CLOSED
+            state.failures = 0
+            state.retry_at = 0.0
+            state.probe_in_flight = False
+
+    def record_failure(self, host, retry_after=None):
+        """
+        Record a timeout, connection error or throttling response. Returns the
+        delay before the host should be tried again.
+        """
+        with self.lock:
+            state = self._state(host)
+            state.failures += 1
+            self.stats["failures"] += 1
+
+            if retry_after is not None:
+                self.stats["throttled"] += 1
+                delay = min(retry_after, self.max_retry_after)
+            else:
+                delay = self.backoff(state.failures)
+            now = time.monotonic()
+            state.retry_at = now + delay
+
+            # A failed probe re-opens the circuit straight away
+            if state.state == HALF_OPEN or state.failures >= self.failure_threshold:
+                if state.state != OPEN:
+                    self.stats["circuits_opened"] += 1
+                state.state = OPEN
+                state.opened_at = now
+                state.probe_in_flight = False
+            return delay
+
+    def is_open(self, host):
+        with self.lock:
+            state = self.hosts.get(host)
+            return state is not None and state.state == OPEN
+
+    def summary(self):
+        return (f"- Host health: {self.stats['failures']} failures, {self.stats['throttled']} throttled, "
+                f"{self.stats['circuits_opened']} circuits opened, {self.stats['skipped']} requests skipped")
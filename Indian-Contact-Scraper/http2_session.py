@@ -0,0 +1,133 @@
+import time
+from datetime import timedelta
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# httpx (with its h2 extra) is optional; without it we stay on requests' HTTP/1.1
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+def http2_available():
+    """Whether httpx and the h2 package are installed"""
+    if httpx is None:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class _StreamedBody:
+    """File-like view of an httpx streamed body, so requests' iter_content can read it"""
+
+    def __init__(self, response, stream_context):
+        self.response = response
+        self.stream_context = stream_context
+        self.chunks = response.iter_bytes()
+        self.buffer = b""
+
+    def read(self, amount=None):
+        try:
+            while amount is None or len(self.buffer) < amount:
+                chunk = next(self.chunks, None)
+                if chunk is None:
+                    break
+                self.buffer += chunk
+        except httpx.HTTPError as e:
+            raise _translate_error(e)
+        if amount is None:
+            data, self.buffer = self.buffer, b""
+        else:
+            data, self.buffer = self.buffer[:amount], self.buffer[amount:]
+        return data
+
+    def read1(self, amount=None, decode_content=None):
+        """What's buffered or the next chunk, without waiting for amount bytes"""
+        if not self.buffer:
+            try:
+                self.buffer = next(self.chunks, b"")
+            except httpx.HTTPError as e:
+                raise _translate_error(e)
+        return self.read(min(amount, len(self.buffer)) if amount is not None else len(self.buffer))
+
+    def close(self):
+        self.stream_context.__exit__(None, None, None)
+
+
+def _translate_error(error):
+    """Map an httpx exception onto the requests exception the fetch layer handles"""
+    if isinstance(error, httpx.ConnectTimeout):
+        return requests.ConnectTimeout(str(error))
+    if isinstance(error, httpx.TimeoutException):
+        return requests.Timeout(str(error))
+    if isinstance(error, httpx.TooManyRedirects):
+        return requests.TooManyRedirects(str(error))
+    if isinstance(error, (httpx.NetworkError, httpx.RemoteProtocolError)):
+        return requests.ConnectionError(str(error))
+    return requests.RequestException(str(error))
+
+
+class Http2Session:
+    """
+    Drop-in for the parts of requests.Session the fetch layer uses, backed by
+    an HTTP/2-capable httpx client. Requests to the same origin share one
+    multiplexed connection; servers without HTTP/2 are spoken to over HTTP/1.1.
+    Responses are returned as ordinary requests.Response objects.
+    """
+
+    def __init__(self, verify=True, max_connections=100):
+        self.client = httpx.Client(
+            http2=True,
+            follow_redirects=True,
+            verify=verify,
+            limits=httpx.Limits(max_connections=max_connections),
+        )
+        self.stats = {}
+
+    def get(self, url, headers=None, stream=False, timeout=None, **kwargs):
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            timeout = httpx.Timeout(read, connect=connect, pool=connect)
+
+        started = time.monotonic()
+        stream_context = self.client.stream("GET", url, headers=headers, timeout=timeout, **kwargs)
+        try:
+            upstream = stream_context.__enter__()
+        except httpx.HTTPError as e:
+            raise _translate_error(e)
+
+        self.stats[upstream.http_version] = self.stats.get(upstream.http_version, 0) + 1
+
+        response = requests.Response()
+        response.status_code = upstream.status_code
+        response.reason = upstream.reason_phrase
+        response.headers = CaseInsensitiveDict(upstream.headers.items())
+        response.url = str(upstream.url)
+        response.encoding = upstream.charset_encoding
+        response.elapsed = timedelta(seconds=time.monotonic() - started)
+        response.raw = _StreamedBody(upstream, stream_context)
+        if not stream:
+            response.content  # read the body now, like requests does
+            response.raw.close()
+        return response
+
+    def close(self):
+        self.client.close()
+
+    def summary(self):
+        versions = ", ".join(f"{count} over {version}" for version, count in sorted(self.stats.items()))
+        return f"- HTTP protocol: {versions or 'no requests'}"
+
+
+def create_session(http2=False, verify=True):
+    """requests.Session, or an Http2Session when HTTP/2 is requested and available"""
+    if http2:
+        if http2_available():
+            return Http2Session(verify=verify)
+        print("HTTP/2 needs 'pip install httpx[http2]'; falling back to HTTP/1.1")
+    return requests.Session()
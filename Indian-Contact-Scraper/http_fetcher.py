@@ -0,0 +1,252 @@
+import socket
+import time
+
+import requests
+import urllib3
+
+from adaptive_timeouts import AdaptiveTimeouts
+from cancellation import Cancelled
+from host_health import HostHealthTracker, host_key, parse_retry_after
+
+# Responses worth retrying after a backoff; 429/503 may say how long to wait
+RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+THROTTLE_STATUS = (429, 503)
+
+
+# Body chunk size for the streamed read that enforces the total fetch deadline
+READ_CHUNK_SIZE = 65536
+
+# Causes that mean the host can't be reached at all; another try won't change that
+UNREACHABLE_ERRORS = (socket.gaierror, ConnectionRefusedError)
+
+# Causes worth another try: the host was reached but timed out or dropped the connection
+TRANSIENT_ERRORS = (socket.timeout, urllib3.exceptions.TimeoutError, ConnectionResetError,
+                    ConnectionAbortedError, urllib3.exceptions.ProtocolError)
+
+
+class HostUnavailable(requests.RequestException):
+    """The host's circuit is open, or its backoff is longer than we're willing to wait"""
+
+
+class FetchDeadlineExceeded(requests.Timeout):
+    """The whole fetch (headers and body) took longer than the total deadline"""
+
+
+def _body_chunks(response):
+    """
+    Yield a streamed body as it arrives, rather than in full READ_CHUNK_SIZE
+    blocks, so deadline and cancel checks still run while a server trickles
+    data. Falls back to iter_content where the body has no read1 (urllib3 1.x).
+    """
+    read1 = getattr(response.raw, "read1", None)
+    if read1 is None:
+        yield from response.iter_content(READ_CHUNK_SIZE)
+        return
+    # The same translation iter_content does, so callers see requests exceptions
+    try:
+        while True:
+            chunk = read1(READ_CHUNK_SIZE, decode_content=True)
+            if not chunk:
+                return
+            yield chunk
+    except urllib3.exceptions.ProtocolError as e:
+        raise requests.exceptions.ChunkedEncodingError(e)
+    except urllib3.exceptions.DecodeError as e:
+        raise requests.exceptions.ContentDecodingError(e)
+    except urllib3.exceptions.ReadTimeoutError as e:
+        raise requests.exceptions.ConnectionError(e)
+    except urllib3.exceptions.SSLError as e:
+        raise requests.exceptions.SSLError(e)
+
+
+def _causes(error):
+    """An exception and everything it wraps (urllib3 reasons, chained causes and args)"""
+    seen = set()
+    pending = [error]
+    while pending:
+        error = pending.pop()
+        if error is None or id(error) in seen:
+            continue
+        seen.add(id(error))
+        yield error
+        pending.extend([getattr(error, "reason", None), error.__cause__, error.__context__])
+        pending.extend(arg for arg in error.args if isinstance(arg, BaseException))
+
+
+def _is_retryable(error):
+    """Whether a failed request is worth retrying: timeouts and reset connections only"""
+    causes = list(_causes(error))
+    if any(isinstance(cause, UNREACHABLE_ERRORS) for cause in causes):
+        return False
+    if isinstance(error, (requests.Timeout, requests.exceptions.ChunkedEncodingError)):
+        return True
+    return any(isinstance(cause, TRANSIENT_ERRORS) for cause in causes)
+
+
+class HttpFetcher:
+    """
+    Fetch layer shared by search and page requests: one requests.Session for
+    connection reuse, with per-host backoff and circuit breaking so failing
+    or throttling hosts don't hold up the rest of the crawl
+    """
+
+    def __init__(self, host_health=None, max_retries=2, max_wait=20.0, timeouts=None,
+                 total_timeout=45.0, session=None, dns_cache=None, http2=False):
+        self.host_health = host_health or HostHealthTracker()
+        self.max_retries = max_retries
+
+        # Longest backoff we sleep through for a host before giving up on the request
+        self.max_wait = max_wait
+
+        # Connect/read timeouts follow each host's observed latency; total_timeout
+        # caps a whole get(), retries, backoff and a slowly trickling body included
+        self.timeouts = timeouts or AdaptiveTimeouts()
+        self.total_timeout = total_timeout
+        # requests' HTTP/1.1 session, or an HTTP/2 client that multiplexes requests per origin
+        if session is None and http2:
+            # httpx is only imported when HTTP/2 is asked for
+            from http2_session import create_session
+            session = create_session(http2=True)
+        self.session = session or requests.Session()
+
+        # Optional in-process DNS cache (see dns_cache.py), installed process-wide
+        self.dns_cache = dns_cache.install() if dns_cache else None
+
+    def close(self):
+        """Release the session's connections and take the DNS cache out of the process"""
+        if self.dns_cache:
+            self.dns_cache.uninstall()
+            self.dns_cache.shutdown()
+        self.session.close()
+
+    def summary(self):
+        """Protocol usage line for the run summary, when the session reports it"""
+        return self.session.summary() if hasattr(self.session, "summary") else None
+
+    def prefetch(self, urls):
+        """Resolve the hosts of upcoming URLs in the background, if DNS caching is on"""
+        if self.dns_cache:
+            self.dns_cache.prefetch(urls)
+
+    def expected_duration(self, url):
+        """Rough time a request to url should take, from the host's recent latency"""
+        latency = self.timeouts.estimate(host_key(url))
+        return latency if latency is not None else self.timeouts.default[0]
+
+    def _wait_for_host(self, host, url, deadline, cancel_token=None):
+        """Sleep out a short backoff window, or raise if the host can't be tried soon"""
+        wait = self.host_health.wait_time(host)
+        if wait > self.max_wait:
+            raise HostUnavailable(f"{host} is backing off for another {wait:.0f}s, skipping {url}")
+        if wait >= deadline - time.monotonic():
+            raise FetchDeadlineExceeded(f"{url} can't be retried within {self.total_timeout:g}s")
+        if not self.host_health.allow(host):
+            raise HostUnavailable(f"Circuit open for {host}, skipping {url}")
+        if wait:
+            try:
+                if cancel_token:
+                    cancel_token.sleep(wait)
+                else:
+                    time.sleep(wait)
+            except BaseException:
+                self.host_health.release_probe(host)
+                raise
+
+    def _read_body(self, response, deadline, cancel_token=None):
+        """
+        Read a streamed body, giving up once the fetch passes its total deadline
+        or the run is cancelled (a cancel from another thread closes the response)
+        """
+        chunks = []
+        unregister = cancel_token.on_cancel(response.close) if cancel_token else None
+        try:
+            for chunk in _body_chunks(response):
+                chunks.append(chunk)
+                if cancel_token:
+                    cancel_token.check()
+                if time.monotonic() > deadline:
+                    raise FetchDeadlineExceeded(
+                        f"{response.url} took longer than {self.total_timeout:g}s to download")
+        except Exception:
+            # A response closed by cancel() surfaces as a read error
+            if cancel_token and cancel_token.cancelled:
+                raise Cancelled(cancel_token.reason)
+            raise
+        finally:
+            if unregister:
+                unregister()
+            response.close()
+        # Hand back a normal, fully-read Response
+        response._content = b"".join(chunks)
+        response._content_consumed = True
+
+    def _attempt(self, url, host, headers, kwargs, deadline, cancel_token=None):
+        """One request with the host's current timeouts, body read under the total deadline"""
+        options = dict(kwargs)
+        if "timeout" not in options:
+            connect, read = self.timeouts.timeouts(host)
+            # Never wait past the fetch's deadline or the end of the run
+            remaining = max(deadline - time.monotonic(), 0.001)
+            connect, read = min(connect, remaining), min(read, remaining)
+            if cancel_token:
+                connect, read = cancel_token.cap(connect), cancel_token.cap(read)
+            options["timeout"] = (connect, read)
+        response = self.session.get(url, headers=headers, stream=True, **options)
+        self.timeouts.record(host, response.elapsed.total_seconds())
+        self._read_body(response, deadline, cancel_token)
+        return response
+
+    def get(self, url, headers=None, cancel_token=None, **kwargs):
+        """
+        GET a URL, retrying timeouts, reset connections and 429/5xx responses
+        with the host's backoff, all within total_timeout. Raises
+        requests.RequestException (including HostUnavailable) if no response
+        could be had; otherwise returns the last response, which may still be
+        an error status. With a cancel_token (see cancellation.py), raises
+        Cancelled as soon as the run is stopped.
+        """
+        host = host_key(url)
+        deadline = time.monotonic() + self.total_timeout
+        attempt = 0
+        while True:
+            if cancel_token:
+                cancel_token.check()
+            self._wait_for_host(host, url, deadline, cancel_token)
+            try:
+                response = self._attempt(url, host, headers, kwargs, deadline, cancel_token)
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                # Timing out because the run's deadline arrived says nothing about the host
+                if cancel_token and cancel_token.cancelled:
+                    self.host_health.release_probe(host)
+                    raise Cancelled(cancel_token.reason)
+                delay = self.host_health.record_failure(host)
+                # Unknown hosts and refused connections fail the same way next time,
+                # and a fetch that already used the whole deadline can't try again
+                if (attempt >= self.max_retries or self.host_health.is_open(host)
+                        or not _is_retryable(e) or delay >= deadline - time.monotonic()):
+                    raise
+                attempt += 1
+                continue
+            except requests.RequestException:
+                # Not the host's fault (bad URL, redirect loop, ...); don't hold the circuit
+                self.host_health.record_success(host)
+                raise
+            except BaseException:
+                # Cancelled mid-request, or anything else that leaves the host's health
+                # unknown: a half-open host mustn't stay blocked on a probe that never reports
+                self.host_health.release_probe(host)
+                raise
+
+            if response.status_code in RETRYABLE_STATUS:
+                retry_after = None
+                if response.status_code in THROTTLE_STATUS:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                delay = self.host_health.record_failure(host, retry_after)
+                if (attempt >= self.max_retries or delay > self.max_wait
+                        or self.host_health.is_open(host) or delay >= deadline - time.monotonic()):
+                    return response
+                attempt += 1
+                continue
+
+            self.host_health.record_success(host)
+            return response
@@ -0,0 +1,214 @@
+import json
+import threading
+import time
+
+from storage import DEFAULT_DB_PATH, open_database
+
+# Delta kinds, also used as the suffix of each delta CSV
+NEW = "new"
+CHANGED = "changed"
+VANISHED = "vanished"
+
+
+def run_key(state, city, profession):
+    """Snapshots are kept per state/city/profession run"""
+    return f"{state}|{city}|{profession}"
+
+
+def contact_identity(contact):
+    """
+    What makes two contacts from different runs the same person: the page
+    plus the name, or the email/phone when the page gave no name
+    """
+    for field in ("name", "email", "phone"):
+        value = contact.get(field)
+        if value and value != "Not found":
+            return (contact.get("source_url"), field, str(value).casefold())
+    return (contact.get("source_url"), "", "")
+
+
+def index_contacts(contacts):
+    """Contacts keyed by identity; repeated identities on a page are numbered"""
+    indexed = {}
+    for contact in contacts:
+        identity = contact_identity(contact)
+        key = identity + (0,)
+        while key in indexed:
+            key = identity + (key[-1] + 1,)
+        indexed[key] = contact
+    return indexed
+
+
+class PageSnapshot:
+    """What one page looked like on a run, and what was extracted from it"""
+
+    def __init__(self, url, digest=None, etag=None, last_modified=None, via=None,
+                 result=None, contacts=None):
+        self.url = url
+        self.digest = digest
+        self.etag = etag
+        self.last_modified = last_modified
+        self.via = via
+        self.result = result
+        self.contacts = contacts or []
+
+
+class IncrementalStore:
+    """
+    Per-URL content fingerprints, validators and extracted contacts from the
+    last run of each state/city/profession, so the next run only re-extracts
+    pages that changed
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.lock = threading.Lock()
+        self.connection = open_database(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS page_snapshots ("
+            " job TEXT NOT NULL,"
+            " url TEXT NOT NULL,"
+            " digest TEXT,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " via TEXT,"
+            " result TEXT,"
+            " contacts TEXT NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " PRIMARY KEY (job, url))"
+        )
+        self.connection.commit()
+
+    def load(self, job):
+        """Every page snapshot from the job's last run, keyed by URL"""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT url, digest, etag, last_modified, via, result, contacts FROM page_snapshots WHERE job = ?",
+                (job,)
+            ).fetchall()
+        return {row[0]: PageSnapshot(row[0], row[1], row[2], row[3], row[4],
+                                     json.loads(row[5]) if row[5] else None, json.loads(row[6]))
+                for row in rows}
+
+    def replace(self, job, snapshots):
+        """Make snapshots the job's new baseline, dropping pages that aren't in it"""
+        now = time.time()
+        with self.lock:
+            try:
+                self.connection.execute("DELETE FROM page_snapshots WHERE job = ?", (job,))
+                self.connection.executemany(
+                    "INSERT INTO page_snapshots (job, url, digest, etag, last_modified, via, result, contacts,"
+                    " updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(job, s.url, s.digest, s.etag, s.last_modified, s.via,
+                      json.dumps(s.result) if s.result is not None else None, json.dumps(s.contacts), now)
+                     for s in snapshots]
+                )
+                self.connection.commit()
+            except Exception:
+                self.connection.rollback()
+                raise
+
+    def begin(self, state, city, profession):
+        """Start an incremental run against the job's last snapshot"""
+        job = run_key(state, city, profession)
+        return IncrementalRun(self, job, self.load(job))
+
+
+class IncrementalRun:
+    """
+    One run's view of the previous snapshot: conditional request headers,
+    unchanged-page detection, and the new/changed/vanished delta at the end.
+    Only pages the server said are gone (404/410) take their contacts with
+    them; pages this run didn't reach are kept as they were.
+    """
+
+    def __init__(self, store, job, previous):
+        self.store = store
+        self.job = job
+        self.previous = previous
+        self.current = {}
+        # Pages from last run that now answer 404/410
+        self.gone = set()
+        self.finished = False
+        self.stats = {"extracted": 0, "not_modified": 0, "unchanged": 0, "carried_forward": 0,
+                      "gone": 0, "not_visited": 0}
+
+    def conditional_headers(self, url):
+        """If-None-Match/If-Modified-Since for a page seen last run, so servers can answer 304"""
+        snapshot = self.previous.get(url)
+        headers = {}
+        if snapshot is not None and snapshot.digest:
+            if snapshot.etag:
+                headers["If-None-Match"] = snapshot.etag
+            if snapshot.last_modified:
+                headers["If-Modified-Since"] = snapshot.last_modified
+        return headers
+
+    def unchanged(self, url, digest):
+        snapshot = self.previous.get(url)
+        return snapshot is not None and snapshot.digest == digest
+
+    def reuse(self, url, reason="unchanged"):
+        """
+        Keep a page (and the pages crawled from it) as they were last run.
+        Returns (contacts, result, urls) or None if the page wasn't seen before.
+        """
+        snapshot = self.previous.get(url)
+        if snapshot is None:
+            return None
+        pages = [snapshot] + [s for s in self.previous.values() if s.via == url and s.url not in self.current]
+        contacts = []
+        for page in pages:
+            self.current[page.url] = page
+            contacts.extend(page.contacts)
+        self.stats[reason] += 1
+        return contacts, snapshot.result, [page.url for page in pages]
+
+    def record(self, url, digest, headers, result, contacts, via=None):
+        """Store what was extracted from a fetched page"""
+        self.current[url] = PageSnapshot(url, digest, headers.get("ETag"), headers.get("Last-Modified"),
+                                         via, result, list(contacts))
+        self.stats["extracted"] += 1
+
+    def mark_gone(self, url):
+        """A page from last run that the server says no longer exists"""
+        if url in self.previous and url not in self.gone:
+            self.gone.add(url)
+            self.stats["gone"] += 1
+
+    def finish(self, contacts):
+        """
+        Save this run as the new baseline and return (delta, carried). Pages
+        from last run that weren't visited (the run was stopped, or searches
+        no longer lead to them) are carried forward, and their contacts are
+        returned in carried to complete the snapshot. Contacts vanish only
+        when their page is gone or no longer lists them.
+        """
+        carried = []
+        for url, snapshot in self.previous.items():
+            if url not in self.current and url not in self.gone:
+                self.current[url] = snapshot
+                carried.extend(snapshot.contacts)
+                self.stats["not_visited"] += 1
+
+        previous = index_contacts(c for s in self.previous.values() for c in s.contacts)
+        current = index_contacts(list(contacts) + carried)
+        delta = {NEW: [], CHANGED: [], VANISHED: []}
+        for key, contact in current.items():
+            before = previous.get(key)
+            if before is None:
+                delta[NEW].append(contact)
+            elif before != contact:
+                changed = sorted(field for field in set(before) | set(contact)
+                                 if before.get(field) != contact.get(field))
+                delta[CHANGED].append(dict(contact, changed_fields=", ".join(changed)))
+        delta[VANISHED] = [contact for key, contact in previous.items() if key not in current]
+
+        self.store.replace(self.job, self.current.values())
+        self.finished = True
+        return delta, carried
+
+    def summary(self):
+        return (f"- Incremental: {self.stats['extracted']} pages extracted, "
+                f"{self.stats['not_modified']} not modified, {self.stats['unchanged']} unchanged, "
+                f"{self.stats['carried_forward']} kept after fetch errors, "
+                f"{self.stats['not_visited']} kept without a visit, {self.stats['gone']} gone")
@@ -1,630 +1,1160 @@
-import requests
-from bs4 import BeautifulSoup
-import re
-import time
-import random
-import csv
-import os
-from urllib.parse import urlparse, quote
-
-class IndianContactScraper:
-    def __init__(self, state, city, profession, output_file=None):
-        self.state = state
-        self.city = city
-        self.profession = profession
-        self.output_file = output_file or f"{state}_{city}_{profession}_contacts.csv"
-        self.headers_list = [
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0",
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.1 Safari/605.1.15",
-            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.101 Safari/537.36"
-        ]
-        
-        # Regular expression patterns
-        self.email_pattern = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
-        
-        # Updated phone pattern to catch more variations
-        self.indian_phone_pattern = r"(?:\+?91[-\s]*)?(?:[0]?)?[6-9][0-9\s\-]{8,11}"
-        
-        self.linkedin_pattern = r"(?:https?:\/\/)?(?:www\.)?linkedin\.com\/(?:in|company)\/[a-zA-Z0-9_-]+"
-        self.instagram_pattern = r"(?:https?:\/\/)?(?:www\.)?instagram\.com\/[a-zA-Z0-9_.]+"
-        self.twitter_pattern = r"(?:https?:\/\/)?(?:www\.)?(?:twitter|x)\.com\/[a-zA-Z0-9_]+"
-        self.name_pattern = r"(?:[A-Z][a-z]+(?:\s[A-Z][a-z]+){1,3})"
-        
-        # Additional patterns for doctor-specific information
-        self.designation_pattern = r"(?:Dr\.|Prof\.|Doctor|Professor|MD|MBBS|MS|MDS|DM|DNB|MCh)[,\s]+(?:[A-Z][a-zA-Z\s\.]+)"
-        self.specialization_pattern = r"(?:Specialist|Speciality|Specialization)[\s\:]+([A-Za-z\s\&]+)"
-        self.qualification_pattern = r"(?:MBBS|MD|MS|DNB|DM|MCh|BDS|MDS|DO|DCH|DTCD|FRCS|MRCP)(?:\([A-Za-z]+\))?"
-        
-        # Storage for extracted contacts
-        self.contacts = []
-        self.visited_urls = set()
-        
-        # Filters
-        self.disposable_email_domains = [
-            "mailinator.com", "yopmail.com", "10minutemail.com", "guerrillamail.com", 
-            "tempmail.com", "example.com", "test.com"
-        ]
-        
-        # Additional fields to extract
-        self.additional_fields = [
-            "designation", "qualification", "specialization", 
-            "clinic_hospital", "address", "experience"
-        ]
-        
-        # Add debug flag and counter
-        self.debug = False
-        self.search_attempts = 0
-        self.successful_searches = 0
-
-    def generate_search_queries(self):
-        """Generate search queries based on state, city and profession"""
-        base_queries = [
-            f"{self.profession} in {self.city} {self.state} India contact",
-            f"{self.profession} {self.city} {self.state} email phone",
-            f"top {self.profession} in {self.city} {self.state} contact information",
-            f"{self.city} {self.state} {self.profession} directory",
-            f"{self.profession} association members {self.city} {self.state}",
-            f"contact details of {self.profession} in {self.city} {self.state}"
-        ]
-        
-        # For doctors, add more specific queries
-        if self.profession.lower() == "doctor":
-            base_queries.extend([
-                f"medical practitioners in {self.city} {self.state} contact details",
-                f"specialist doctors in {self.city} {self.state}",
-                f"hospitals in {self.city} {self.state} doctors contact",
-                f"clinics in {self.city} {self.state} doctor information"
-            ])
-            
-        return base_queries
-
-    def get_random_headers(self):
-        """Get random user agent headers to avoid detection"""
-        user_agent = random.choice(self.headers_list)
-        return {
-            "User-Agent": user_agent,
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Referer": "https://www.google.com/",
-            "DNT": "1",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1"
-        }
-
-    def fetch_google_search_results(self, query, start=0):
-        """Fetch search results from Google with the given query and start index"""
-        encoded_query = quote(query)
-        url = f"https://www.google.com/search?q={encoded_query}&start={start}"
-        
-        try:
-            headers = self.get_random_headers()
-            response = requests.get(url, headers=headers, timeout=15)
-            
-            # Track search attempts
-            self.search_attempts += 1
-            
-            # Check if we're getting a valid response
-            if response.status_code == 200:
-                self.successful_searches += 1
-                return response.text
-            else:
-                print(f"Search request failed with status code: {response.status_code}")
-                # Add delay to avoid triggering anti-scraping measures
-                time.sleep(random.uniform(5, 10))
-                return None
-                
-        except requests.RequestException as e:
-            print(f"Error fetching search results for '{query}' (page {start//10 + 1}): {e}")
-            # Add longer delay after an error
-            time.sleep(random.uniform(10, 15))
-            return None
-
-    def extract_urls_from_search_results(self, html):
-        """Extract URLs from Google search results HTML"""
-        if not html:
-            return []
-            
-        urls = []
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Google search results can have different structures, try multiple selectors
-        selectors = [
-            'div.yuRUbf a',           # Common modern structure
-            'div.g div.yuRUbf a',     # Alternative structure
-            'div.rc a',               # Older structure
-            'h3.LC20lb a',            # Another variation
-            'a[href^="http"]',        # Fallback: any external link
-            'div.g a[href^="http"]'   # Another fallback
-        ]
-        
-        for selector in selectors:
-            results = soup.select(selector)
-            if results:
-                for result in results:
-                    href = result.get('href')
-                    if href and href.startswith('http') and 'google.com' not in href:
-                        urls.append(href)
-        
-        # Alternative method for different Google layouts
-        if not urls:
-            for a_tag in soup.find_all('a', href=True):
-                href = a_tag['href']
-                if href.startswith('/url?q='):
-                    actual_url = href.split('/url?q=')[1].split('&')[0]
-                    if 'google.com' not in actual_url:
-                        urls.append(actual_url)
-                elif href.startswith('http') and 'google.com' not in href:
-                    urls.append(href)
-        
-        if self.debug:
-            print(f"Found {len(urls)} URLs in search results")
-            
-        return list(set(urls))  # Remove duplicates
-
-    def extract_and_filter_emails(self, html_content):
-        """Extract email addresses from HTML content and filter out disposable/fake ones"""
-        emails = []
-        
-        # Find all email addresses
-        email_matches = re.findall(self.email_pattern, html_content)
-        
-        # Filter the emails
-        for email in email_matches:
-            # Skip very short emails
-            if len(email) < 5:
-                continue
-                
-            # Skip emails with disposable domains
-            domain = email.split('@')[-1].lower()
-            if any(disposable in domain for disposable in self.disposable_email_domains):
-                continue
-                
-            # Skip common test emails
-            if email.startswith(('test', 'example', 'user', 'admin', 'info@')):
-                continue
-                
-            emails.append(email.lower())  # Convert to lowercase for consistency
-        
-        # Remove duplicates and return
-        return list(set(emails))
-
-    def extract_names(self, html_content, soup):
-        """Extract names from HTML content"""
-        names = []
-        
-        # Method 1: Using regex for common name patterns
-        name_matches = re.findall(self.name_pattern, html_content)
-        names.extend([name.strip() for name in name_matches if 8 <= len(name) <= 40])
-        
-        # Method 2: Look for common elements that might contain names
-        for tag in soup.select('h1, h2, h3, h4, h5'):
-            text = tag.text.strip()
-            # Check if it looks like a name (2-3 words, proper case)
-            words = text.split()
-            if 2 <= len(words) <= 5 and all(word[0].isupper() for word in words if word):
-                if 8 <= len(text) <= 40:  # Reasonable name length
-                    names.append(text)
-        
-        # Method 3: Look for doctor-specific patterns if profession is doctor
-        if self.profession.lower() == "doctor":
-            dr_name_pattern = r"Dr\.?\s+([A-Z][a-z]+(\s+[A-Z][a-z]+){1,3})"
-            dr_matches = re.findall(dr_name_pattern, html_content)
-            if dr_matches:
-                for match in dr_matches:
-                    if isinstance(match, tuple) and match:
-                        names.append(f"Dr. {match[0]}")
-                    elif isinstance(match, str):
-                        names.append(f"Dr. {match}")
-        
-        # Remove duplicates and return
-        return list(set(names))
-
-    def extract_doctor_info(self, html_content, soup):
-        """Extract doctor-specific information from HTML content"""
-        results = {
-            "designation": "Not found",
-            "qualification": "Not found",
-            "specialization": "Not found",
-            "clinic_hospital": "Not found",
-            "address": "Not found",
-            "experience": "Not found"
-        }
-        
-        # Extract qualifications (MD, MBBS, etc.)
-        qualification_matches = re.findall(self.qualification_pattern, html_content)
-        if qualification_matches:
-            results["qualification"] = ", ".join(list(set(qualification_matches)))
-        
-        # Extract specialization
-        specialization_matches = re.findall(self.specialization_pattern, html_content)
-        if specialization_matches:
-            results["specialization"] = specialization_matches[0].strip()
-        
-        # Extract designation
-        designation_matches = re.findall(self.designation_pattern, html_content)
-        if designation_matches:
-            results["designation"] = designation_matches[0].strip()
-        
-        # Extract experience
-        exp_pattern = r"([0-9]+)\+?\s+years\s+(?:of\s+)?experience"
-        exp_matches = re.findall(exp_pattern, html_content, re.IGNORECASE)
-        if exp_matches:
-            results["experience"] = f"{exp_matches[0]} years"
-        
-        # Look for address and clinic information
-        address_pattern = r"(?:Address|Location|Clinic)[\s\:]+([A-Za-z0-9\s\,\-\#\.\(\)]+)(?:[\n\.\,]|Phone)"
-        addr_matches = re.findall(address_pattern, html_content, re.IGNORECASE)
-        if addr_matches:
-            results["address"] = addr_matches[0].strip()
-            
-            # If address is found, try to extract clinic/hospital name
-            lines = html_content.split('\n')
-            for i, line in enumerate(lines):
-                if addr_matches[0] in line and i > 0:
-                    potential_clinic = lines[i-1].strip()
-                    if 3 <= len(potential_clinic) <= 50:  # Reasonable clinic name length
-                        results["clinic_hospital"] = potential_clinic
-                        break
-        
-        return results
-
-    def create_contact_records(self, domain, url, names, emails, phones, 
-                              linkedin_profiles, instagram_profiles, twitter_profiles, doctor_info=None):
-        """Create contact records by combining the extracted information"""
-        
-        # If we have more of one type than others, we'll create multiple records
-        max_items = max(
-            len(names), 
-            len(emails), 
-            len(phones), 
-            len(linkedin_profiles), 
-            len(instagram_profiles), 
-            len(twitter_profiles)
-        )
-        
-        # If we didn't find any contact info at all, don't create a record
-        if max_items == 0:
-            return
-        
-        # Start with one default record
-        if max_items == 0:
-            max_items = 1
-        
-        for i in range(min(max_items, 5)):  # Limit to 5 records per page to avoid noise
-            record = {
-                "name": names[i] if i < len(names) else "Not found",
-                "email": emails[i] if i < len(emails) else "Not found",
-                "phone": phones[i] if i < len(phones) else "Not found",
-                "linkedin": linkedin_profiles[i] if i < len(linkedin_profiles) else "Not found",
-                "instagram": instagram_profiles[i] if i < len(instagram_profiles) else "Not found",
-                "twitter": twitter_profiles[i] if i < len(twitter_profiles) else "Not found",
-                "profession": self.profession,
-                "city": self.city,
-                "state": self.state,
-                "domain": domain,
-                "source_url": url
-            }
-            
-            # Add doctor-specific info if available
-            if doctor_info and self.profession.lower() == "doctor":
-                for key, value in doctor_info.items():
-                    record[key] = value
-            
-            # Add the record only if it has at least a name, email or phone
-            if (record["name"] != "Not found" or 
-                record["email"] != "Not found" or 
-                record["phone"] != "Not found"):
-                self.contacts.append(record)
-                
-                # Debug info
-                if self.debug:
-                    print(f"Created record: {record['name']}, {record['email']}, {record['phone']}")
-
-    def extract_social_media(self, html_content, pattern):
-        """Extract social media profile links from HTML content"""
-        profiles = []
-        
-        # Find all profile URLs
-        matches = re.findall(pattern, html_content)
-        
-        # Clean and deduplicate
-        for match in matches:
-            # Make sure we have a full URL
-            if not match.startswith('http'):
-                if 'linkedin.com' in match:
-                    match = f"https://{match}"
-                elif 'instagram.com' in match:
-                    match = f"https://{match}"
-                elif 'twitter.com' in match or 'x.com' in match:
-                    match = f"https://{match}"
-            
-            profiles.append(match)
-        
-        # Remove duplicates and return
-        return list(set(profiles))
-
-    def extract_phone_numbers(self, html_content):
-        """Extract phone numbers from HTML content"""
-        phones = []
-        
-        # Improved phone number patterns
-        patterns = [
-            r"(?:\+?91[-\s]*)?(?:[0]?)?[6-9][0-9\s\-]{8,11}",  # Basic Indian pattern
-            r"(?:[\+]?91)?[-\s]*[6-9][0-9]{9}",                # Strict 10-digit format
-            r"[0-9]{3}[-\s][0-9]{3}[-\s][0-9]{4}",             # XXX-XXX-XXXX format
-            r"[0-9]{5}[-\s][0-9]{5}"                          # XXXXX-XXXXX format
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, html_content)
-            for match in matches:
-                # Clean up the phone number
-                phone = match.strip()
-                phone = re.sub(r'\s+', '', phone)  # Remove spaces
-                phone = re.sub(r'^0+', '', phone)  # Remove leading zeros
-                
-                # Format for consistency
-                if len(phone) >= 10:
-                    if not phone.startswith('+'):
-                        # If it's a 10-digit number, add +91 prefix
-                        if len(phone) == 10 and phone[0] in '6789':
-                            phone = f"+91{phone}"
-                        # If it has 91 prefix but no +, add the +
-                        elif phone.startswith('91') and len(phone) >= 12:
-                            phone = f"+{phone}"
-                    phones.append(phone)
-        
-        # Remove duplicates and return
-        return list(set(phones))
-
-    def extract_contact_info_from_page(self, url):
-        """Visit a URL and extract contact information"""
-        if url in self.visited_urls:
-            return None
-        
-        self.visited_urls.add(url)
-        print(f"Visiting: {url}")
-        
-        try:
-            headers = self.get_random_headers()
-            response = requests.get(url, headers=headers, timeout=15)
-            
-            if response.status_code != 200:
-                print(f"Failed to fetch {url}, status code: {response.status_code}")
-                return None
-                
-            html_content = response.text
-            domain = get_domain_name(url)
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Extract all types of information
-            emails = self.extract_and_filter_emails(html_content)
-            phones = self.extract_phone_numbers(html_content)
-            linkedin_profiles = self.extract_social_media(html_content, self.linkedin_pattern)
-            instagram_profiles = self.extract_social_media(html_content, self.instagram_pattern)
-            twitter_profiles = self.extract_social_media(html_content, self.twitter_pattern)
-            names = self.extract_names(html_content, soup)
-            
-            # Extract doctor-specific info if profession is doctor
-            doctor_info = {}
-            if self.profession.lower() == "doctor":
-                doctor_info = self.extract_doctor_info(html_content, soup)
-            
-            # Create contact records
-            self.create_contact_records(domain, url, names, emails, phones, 
-                                      linkedin_profiles, instagram_profiles, twitter_profiles, doctor_info)
-            
-            return {
-                'emails': emails,
-                'phones': phones,
-                'linkedin': linkedin_profiles,
-                'instagram': instagram_profiles,
-                'twitter': twitter_profiles,
-                'names': names,
-                'doctor_info': doctor_info
-            }
-            
-        except requests.RequestException as e:
-            print(f"Request error for {url}: {e}")
-        except Exception as e:
-            print(f"Error processing {url}: {e}")
-        
-        return None
-
-    def scrape_specific_url(self, url):
-        """
-        Scrape contact information directly from a specific URL
-        Returns a dictionary with extraction results and the contact record
-        """
-        print(f"Directly scraping URL: {url}")
-        
-        if not url.startswith(('http://', 'https://')):
-            url = 'https://' + url
-        
-        # Reset contacts list for this specific URL scraping
-        self.contacts = []
-        
-        try:
-            # Extract domain for record keeping
-            domain = get_domain_name(url)
-            
-            # Extract contact information
-            extraction_result = self.extract_contact_info_from_page(url)
-            
-            # Return the extraction results and contacts
-            return {
-                'success': True,
-                'extraction_result': extraction_result,
-                'contacts': self.contacts,
-                'domain': domain,
-                'url': url
-            }
-        except Exception as e:
-            print(f"Error scraping URL {url}: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e),
-                'contacts': self.contacts
-            }
-
-    def scrape(self, max_pages=None):
-        """Main scraping method that coordinates the entire process"""
-        search_queries = self.generate_search_queries()
-        
-        # Initialize counters
-        total_urls_found = 0
-        total_pages_processed = 0
-        
-        # Enable debug mode to see more information
-        self.debug = True
-        
-        for query in search_queries:
-            print(f"\nProcessing search query: {query}")
-            
-            page = 0
-            empty_pages_count = 0
-            max_empty_pages = 2  # Stop after this many consecutive empty pages
-            
-            while (max_pages is None or page < max_pages) and empty_pages_count < max_empty_pages:
-                start_index = page * 10
-                
-                # Fetch search results
-                html = self.fetch_google_search_results(query, start=start_index)
-                if not html:
-                    print(f"No HTML content returned for page {page+1} of query: {query}")
-                    empty_pages_count += 1
-                    if empty_pages_count >= max_empty_pages:
-                        print(f"Too many empty pages, moving to next query")
-                        break
-                    time.sleep(random.uniform(4, 7))  # Add more delay after failed attempt
-                    continue
-                    
-                # Extract URLs from search results
-                urls = self.extract_urls_from_search_results(html)
-                if not urls:
-                    print(f"No URLs found on page {page+1} for query: {query}")
-                    empty_pages_count += 1
-                    if empty_pages_count >= max_empty_pages:
-                        print(f"No more URLs found, moving to next query")
-                        break
-                else:
-                    empty_pages_count = 0  # Reset counter when we find URLs
-                    total_urls_found += len(urls)
-                    total_pages_processed += 1
-                    
-                    # Process each URL - increased limit from 5 to 10
-                    url_limit = min(10, len(urls))
-                    print(f"Processing {url_limit} URLs from page {page+1}")
-                    
-                    for url_idx, url in enumerate(urls[:url_limit]):
-                        print(f"URL {url_idx+1}/{url_limit}: {url}")
-                        result = self.extract_contact_info_from_page(url)
-                        
-                        # Print more detailed results for debugging
-                        if result:
-                            found_items = {k: len(v) for k, v in result.items() if isinstance(v, list)}
-                            print(f"Found items: {found_items}")
-                        
-                        # Add random delay between requests
-                        time.sleep(random.uniform(2, 4))
-                
-                page += 1
-                print(f"Completed page {page} for query: {query}")
-                # Add longer delay between pages to prevent rate limiting
-                time.sleep(random.uniform(4, 7))
-        
-        print(f"\nScraping summary:")
-        print(f"- Search attempts: {self.search_attempts}")
-        print(f"- Successful searches: {self.successful_searches}")
-        print(f"- Pages processed: {total_pages_processed}")
-        print(f"- URLs found: {total_urls_found}")
-        print(f"- Contacts extracted: {len(self.contacts)}")
-                
-        # Return the number of contacts found
-        return len(self.contacts)
-
-    def save_to_csv(self):
-        """Save extracted contacts to CSV file"""
-        if not self.contacts:
-            print("No contacts were found to save.")
-            # Create an empty file with headers to prevent file not found errors
-            try:
-                # Base fieldnames
-                fieldnames = ['name', 'email', 'phone', 'linkedin', 'instagram', 'twitter',
-                             'profession', 'city', 'state', 'domain', 'source_url']
-                
-                # Add doctor-specific fields if profession is doctor
-                if self.profession.lower() == "doctor":
-                    fieldnames.extend(self.additional_fields)
-                
-                # Ensure the output directory exists
-                output_dir = os.path.dirname(self.output_file)
-                if output_dir and not os.path.exists(output_dir):
-                    os.makedirs(output_dir)
-                
-                with open(self.output_file, 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    writer.writeheader()
-                
-                print(f"Created empty CSV file with headers: {self.output_file}")
-                return True
-            except Exception as e:
-                print(f"Error creating empty CSV file: {e}")
-                return False
-            
-        try:
-            # Base fieldnames
-            fieldnames = ['name', 'email', 'phone', 'linkedin', 'instagram', 'twitter',
-                         'profession', 'city', 'state', 'domain', 'source_url']
-            
-            # Add doctor-specific fields if profession is doctor
-            if self.profession.lower() == "doctor":
-                fieldnames.extend(self.additional_fields)
-            
-            # Ensure the output directory exists
-            output_dir = os.path.dirname(self.output_file)
-            if output_dir and not os.path.exists(output_dir):
-                os.makedirs(output_dir)
-            
-            with open(self.output_file, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for contact in self.contacts:
-                    # Ensure phone is stored as a properly formatted string
-                    if contact['phone'] != 'Not found':
-                        # Make sure it's a string to prevent scientific notation
-                        if isinstance(contact['phone'], (int, float)):
-                            contact['phone'] = f"+{int(contact['phone'])}"
-                        else:
-                            contact['phone'] = str(contact['phone'])
-                    
-                    # Write only the fields in fieldnames
-                    row_data = {field: contact.get(field, 'Not found') for field in fieldnames}
-                    writer.writerow(row_data)
-                    
-            print(f"Successfully saved {len(self.contacts)} contacts to {self.output_file}")
-            return True
-        except Exception as e:
-            print(f"Error saving to CSV: {e}")
-            # Try a fallback approach with a different filename
-            try:
-                fallback_file = f"{self.output_file}.fallback.csv"
-                with open(fallback_file, 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    writer.writeheader()
-                    for contact in self.contacts:
-                        row_data = {field: str(contact.get(field, 'Not found')) for field in fieldnames}
-                        writer.writerow(row_data)
-                print(f"Fallback save successful: {fallback_file}")
-                return True
-            except Exception as e2:
-                print(f"Fallback save also failed: {e2}")
-                return False
-
-
-def get_domain_name(url):
-    """Extract domain name from URL"""
-    parsed_url = urlparse(url)
-    return parsed_url.netloc
+import requests
+import time
+import random
+import csv
+import os
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlparse, quote
+from phone_normalizer import PhoneNormalizer
+from name_extractor import NameExtractor
+from page_prefilter import PagePrefilter
+from profession_plugins import get_profession_plugin
+from page_fingerprint import content_hash
+from serp_links import iter_result_links
+from structured_data import StructuredDataExtractor
+from http_fetcher import HttpFetcher, HostUnavailable
+from page_decoding import decode_page, is_ascii_compatible
+from regex_backend import BACKEND as REGEX_BACKEND, ExtractionDeadline, ExtractionTimeout, compile_pattern, findall
+from query_planner import query_scope
+from scraper_state import ScraperConfig, ScrapeRun
+from cancellation import Cancelled
+from scrape_events import (ThrottledObserver, DEFAULT_INTERVAL, QUERY_STARTED, SEARCH_PAGE_FETCHED,
+                           PAGE_FETCHED, CONTACT_FOUND, STATS, FINISHED)
+
+class IndianContactScraper:
+    def __init__(self, state, city, profession, output_file=None, search_cache=None,
+                 query_planner=None, domain_stats=None, site_crawler=None, extraction_budget=5.0,
+                 fetcher=None, incremental=None, archive=None, debug=False):
+        # Read-only after construction, so any number of threads and runs can share the scraper
+        self.config = ScraperConfig(state, city, profession,
+                                    output_file or f"{state}_{city}_{profession}_contacts.csv",
+                                    extraction_budget, debug)
+        self.headers_list = [
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0",
+            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.1 Safari/605.1.15",
+            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.101 Safari/537.36"
+        ]
+        
+        # Regular expression patterns
+        self.email_pattern = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
+        
+        # Phone numbers are matched and validated against the Indian numbering plan
+        self.phone_normalizer = PhoneNormalizer()
+        
+        # Names are matched against a gazetteer of Indian names and titles
+        self.name_extractor = NameExtractor()
+        
+        # Byte-level check that decides which pages and extractors are worth running
+        self.prefilter = PagePrefilter()
+        
+        # schema.org JSON-LD, microdata, hCard and mailto:/tel: links, tried before the regexes
+        self.structured_data = StructuredDataExtractor()
+        
+        self.linkedin_pattern = r"(?:https?:\/\/)?(?:www\.)?linkedin\.com\/(?:in|company)\/[a-zA-Z0-9_-]+"
+        self.instagram_pattern = r"(?:https?:\/\/)?(?:www\.)?instagram\.com\/[a-zA-Z0-9_.]+"
+        self.twitter_pattern = r"(?:https?:\/\/)?(?:www\.)?(?:twitter|x)\.com\/[a-zA-Z0-9_]+"
+        
+        # Compiled with RE2 when it's installed (linear time, no catastrophic backtracking)
+        self.compiled_patterns = {}
+        
+        # Shared session with per-host backoff and circuit breaking (see http_fetcher.py)
+        self.fetcher = fetcher or HttpFetcher()
+        
+        # Filters
+        self.disposable_email_domains = [
+            "mailinator.com", "yopmail.com", "10minutemail.com", "guerrillamail.com", 
+            "tempmail.com", "example.com", "test.com"
+        ]
+        
+        # Profession-specific patterns and extra CSV fields (None for generic professions)
+        self.profession_plugin = get_profession_plugin(profession)
+        self.additional_fields = list(self.profession_plugin.fields) if self.profession_plugin else []
+        
+        # Optional persistent cache of search result URLs (see search_cache.py)
+        self.search_cache = search_cache
+        
+        # Optional planner that orders queries by historical yield (see query_planner.py)
+        self.query_planner = query_planner
+        
+        # Optional per-domain yield statistics used to pick which results to visit
+        self.domain_stats = domain_stats
+        
+        # Optional same-site crawl from each landing page (see site_crawler.py)
+        self.site_crawler = site_crawler
+        
+        # Optional WARC archive of every fetched page, for offline re-extraction (see page_archive.py)
+        self.archive = archive
+        
+        # Contacts, visited URLs and counters live in a run (see scraper_state.py). Threads use
+        # this default run unless they start their own with using_run(), e.g. one per job.
+        # Optional incremental mode: unchanged pages reuse last run's contacts (see incremental.py)
+        self.default_run = ScrapeRun(incremental.begin(state, city, profession) if incremental else None)
+        self._local = threading.local()
+
+    # Configuration, read-only
+    state = property(lambda self: self.config.state)
+    city = property(lambda self: self.config.city)
+    profession = property(lambda self: self.config.profession)
+    output_file = property(lambda self: self.config.output_file)
+    extraction_budget = property(lambda self: self.config.extraction_budget)
+
+    @property
+    def debug(self):
+        return self.config.debug
+
+    @debug.setter
+    def debug(self, value):
+        # Set up front like the constructor argument; a scrape never changes it
+        self.config = self.config._replace(debug=value)
+
+    @property
+    def run(self):
+        """The run this thread is working on"""
+        return getattr(self._local, 'run', None) or self.default_run
+
+    def new_run(self, cancel_token=None):
+        """Fresh run state for another job on this scraper"""
+        return ScrapeRun(cancel_token=cancel_token)
+
+    @contextmanager
+    def using_run(self, run):
+        """Direct this thread's work on the scraper into run"""
+        previous = getattr(self._local, 'run', None)
+        self._local.run = run
+        try:
+            yield run
+        finally:
+            self._local.run = previous
+
+    # Run state, for callers that read it off the scraper
+    @property
+    def contacts(self):
+        return self.run.contacts
+
+    @contacts.setter
+    def contacts(self, contacts):
+        self.run.contacts = contacts
+
+    @property
+    def visited_urls(self):
+        return self.run.visited_urls
+
+    @property
+    def search_attempts(self):
+        return self.run.search_attempts.value
+
+    @property
+    def successful_searches(self):
+        return self.run.successful_searches.value
+
+    def get_query_templates(self):
+        """Search query templates for this profession, with {profession}, {city} and {state} placeholders"""
+        templates = [
+            "{profession} in {city} {state} India contact",
+            "{profession} {city} {state} email phone",
+            "top {profession} in {city} {state} contact information",
+            "{city} {state} {profession} directory",
+            "{profession} association members {city} {state}",
+            "contact details of {profession} in {city} {state}"
+        ]
+        
+        # Add profession-specific queries (e.g. hospitals and clinics for doctors)
+        if self.profession_plugin:
+            templates.extend(self.profession_plugin.extra_queries)
+            
+        return templates
+
+    def format_query(self, template):
+        """Fill a query template with this scraper's state, city and profession"""
+        return template.format(profession=self.profession, city=self.city, state=self.state)
+
+    def generate_search_queries(self):
+        """Generate search queries based on state, city and profession"""
+        return [self.format_query(template) for template in self.get_query_templates()]
+
+    def get_random_headers(self):
+        """Get random user agent headers to avoid detection"""
+        user_agent = random.choice(self.headers_list)
+        return {
+            "User-Agent": user_agent,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.5",
+            "Referer": "https://www.google.com/",
+            "DNT": "1",
+            "Connection": "keep-alive",
+            "Upgrade-Insecure-Requests": "1"
+        }
+
+    def fetch_google_search_results(self, query, start=0):
+        """Fetch search results from Google with the given query and start index"""
+        encoded_query = quote(query)
+        url = f"https://www.google.com/search?q={encoded_query}&start={start}"
+        
+        try:
+            headers = self.get_random_headers()
+            response = self.fetcher.get(url, headers=headers, cancel_token=self.run.cancel_token)
+            
+            # Track search attempts
+            self.run.search_attempts.increment()
+            
+            # Check if we're getting a valid response
+            if response.status_code == 200:
+                self.run.successful_searches.increment()
+                return response.text
+            else:
+                # Throttling and server errors were already retried with backoff,
+                # and later search requests wait out the same backoff window
+                print(f"Search request failed with status code: {response.status_code}")
+                return None
+                
+        except requests.RequestException as e:
+            print(f"Error fetching search results for '{query}' (page {start//10 + 1}): {e}")
+            return None
+
+    def extract_urls_from_search_results(self, html, limit=None):
+        """Extract result URLs from Google search results HTML, in rank order"""
+        if not html:
+            return []
+        
+        # Stream the page through a tokenizer instead of building a full tree,
+        # stopping as soon as we have enough results
+        urls = list(iter_result_links(html, limit=limit))
+        
+        if self.debug:
+            print(f"Found {len(urls)} URLs in search results")
+            
+        return urls
+
+    def get_search_result_urls(self, query, start=0, limit=None):
+        """
+        Return (urls, from_cache) for a results page, checking the search cache
+        before going to the network. urls is None if the search request failed.
+        """
+        if self.search_cache:
+            cached = self.search_cache.get(query, start)
+            # Empty lists (cached before empty results were skipped) don't count as hits
+            if cached:
+                if self.debug:
+                    print(f"Using cached search results for '{query}' (page {start//10 + 1})")
+                return cached[:limit] if limit else cached, True
+        
+        html = self.fetch_google_search_results(query, start=start)
+        if not html:
+            return None, False
+        
+        # Cache the full result list so later runs with a higher limit can reuse it.
+        # An empty list is usually a consent or "unusual traffic" page, not a real
+        # answer, so it isn't cached and the next run asks again.
+        urls = self.extract_urls_from_search_results(html)
+        if self.search_cache and urls:
+            self.search_cache.put(query, start, urls)
+        return urls[:limit] if limit else urls, False
+
+    def compile(self, pattern):
+        """Compiled form of one of the extractor patterns, cached per scraper"""
+        compiled = self.compiled_patterns.get(pattern)
+        if compiled is None:
+            compiled = self.compiled_patterns[pattern] = compile_pattern(pattern)
+        return compiled
+
+    def run_extractor(self, name, url, deadline, extractor, *args, default=None):
+        """
+        Run one extractor under the page's extraction deadline. An extractor that
+        runs out of time is abandoned and the page is logged.
+        """
+        self.run.cancel_token.check()
+        if deadline.expired():
+            print(f"Extraction budget used up on {url}, skipping {name}")
+            return default
+        try:
+            return extractor(*args, deadline=deadline)
+        except ExtractionTimeout:
+            self.run.extraction_timeouts.increment()
+            print(f"Extraction budget exceeded on {url}: abandoned {name} after {deadline.elapsed():.1f}s")
+            return default
+
+    def find_pattern(self, pattern, content, deadline=None):
+        """
+        findall for an ASCII-only pattern over decoded text, or directly over
+        raw page bytes so the page doesn't have to be decoded first
+        """
+        if isinstance(content, bytes):
+            matches = findall(self.compile(pattern.encode('ascii')), content, deadline)
+            return [match.decode('ascii') for match in matches]
+        return findall(self.compile(pattern), content, deadline)
+
+    def extract_and_filter_emails(self, html_content, deadline=None):
+        """Extract email addresses from HTML content (text or bytes) and filter out disposable/fake ones"""
+        return self.filter_emails(self.find_pattern(self.email_pattern, html_content, deadline))
+
+    def filter_emails(self, email_matches):
+        """Filter out disposable/fake email addresses"""
+        emails = []
+        
+        # Filter the emails
+        for email in email_matches:
+            # Skip very short emails
+            if len(email) < 5:
+                continue
+                
+            # Skip emails with disposable domains
+            domain = email.split('@')[-1].lower()
+            if any(disposable in domain for disposable in self.disposable_email_domains):
+                continue
+                
+            # Skip common test emails
+            if email.startswith(('test', 'example', 'user', 'admin', 'info@')):
+                continue
+                
+            emails.append(email.lower())  # Convert to lowercase for consistency
+        
+        # Remove duplicates and return
+        return list(set(emails))
+
+    def parse_html(self, html_content):
+        """BeautifulSoup tree for a page; bs4 is imported on first use to keep startup fast"""
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(html_content, 'html.parser')
+
+    def extract_names(self, html_content, soup=None, deadline=None):
+        """Extract person names from the visible text of the page (parsed here unless soup is given)"""
+        # Scan rendered text rather than raw HTML so markup, scripts and attribute
+        # values don't turn into name candidates
+        if soup is None:
+            soup = self.parse_html(html_content)
+            if deadline is not None:
+                deadline.check()
+        for tag in soup(['script', 'style', 'noscript']):
+            tag.decompose()
+        text = soup.get_text(' ')
+        if deadline is not None:
+            deadline.check()
+        
+        return self.name_extractor.extract(text)
+
+    def extract_structured_data(self, html_content):
+        """
+        Extract contacts from JSON-LD, microdata, hCard and mailto:/tel: links.
+        Returns (records, fields, known): one dict per structured contact with name,
+        email, phone, social profiles and address; every value found per field; and
+        for each field it found, the values as written in the page (for the prefilter).
+        """
+        raw_records, mailto_emails, tel_phones = self.structured_data.extract(html_content, self.run.structured_data_stats)
+        
+        records = []
+        for raw in raw_records:
+            emails = self.filter_emails(raw['email'])
+            phones = [phone for phone in self.phone_normalizer.normalize_batch(raw['telephone']) if phone]
+            links = ' '.join(raw['links'])
+            if not emails and not phones:
+                continue
+            records.append({
+                'name': raw['name'],
+                'email': emails[0] if emails else '',
+                'phone': phones[0] if phones else '',
+                'linkedin': next(iter(self.extract_social_media(links, self.linkedin_pattern)), ''),
+                'instagram': next(iter(self.extract_social_media(links, self.instagram_pattern)), ''),
+                'twitter': next(iter(self.extract_social_media(links, self.twitter_pattern)), ''),
+                'address': raw['address'],
+            })
+        
+        def unique(values):
+            return list(dict.fromkeys(value for value in values if value))
+        
+        fields = {
+            'names': unique(record['name'] for record in records),
+            'emails': unique([record['email'] for record in records] + self.filter_emails(mailto_emails)),
+            'phones': unique([record['phone'] for record in records]
+                             + self.phone_normalizer.normalize_batch(tel_phones)),
+            'linkedin': unique(record['linkedin'] for record in records),
+            'instagram': unique(record['instagram'] for record in records),
+            'twitter': unique(record['twitter'] for record in records),
+        }
+        
+        links = [link for raw in raw_records for link in raw['links']]
+        known = {
+            'emails': [email for raw in raw_records for email in raw['email']] + mailto_emails,
+            'phones': [phone for raw in raw_records for phone in raw['telephone']] + tel_phones,
+            'linkedin': links, 'instagram': links, 'twitter': links,
+        }
+        known = {field: values for field, values in known.items() if fields[field]}
+        return records, fields, known
+
+    def extract_profession_info(self, html_content, deadline=None):
+        """Extract profession-specific fields (e.g. qualification for doctors) from HTML content"""
+        if not self.profession_plugin:
+            return {}
+        return self.profession_plugin.extract(html_content, deadline)
+
+    def create_contact_records(self, domain, url, names, emails, phones, 
+                              linkedin_profiles, instagram_profiles, twitter_profiles, profession_info=None):
+        """Create contact records by combining the extracted information"""
+        
+        # If we have more of one type than others, we'll create multiple records
+        max_items = max(
+            len(names), 
+            len(emails), 
+            len(phones), 
+            len(linkedin_profiles), 
+            len(instagram_profiles), 
+            len(twitter_profiles)
+        )
+        
+        # If we didn't find any contact info at all, don't create a record
+        if max_items == 0:
+            return
+        
+        # Start with one default record
+        if max_items == 0:
+            max_items = 1
+        
+        for i in range(min(max_items, 5)):  # Limit to 5 records per page to avoid noise
+            record = {
+                "name": names[i] if i < len(names) else "Not found",
+                "email": emails[i] if i < len(emails) else "Not found",
+                "phone": phones[i] if i < len(phones) else "Not found",
+                "linkedin": linkedin_profiles[i] if i < len(linkedin_profiles) else "Not found",
+                "instagram": instagram_profiles[i] if i < len(instagram_profiles) else "Not found",
+                "twitter": twitter_profiles[i] if i < len(twitter_profiles) else "Not found",
+                "profession": self.profession,
+                "city": self.city,
+                "state": self.state,
+                "domain": domain,
+                "source_url": url
+            }
+            
+            # Add profession-specific info if available
+            if profession_info:
+                for key, value in profession_info.items():
+                    record[key] = value
+            
+            # Add the record only if it has at least a name, email or phone
+            if (record["name"] != "Not found" or 
+                record["email"] != "Not found" or 
+                record["phone"] != "Not found"):
+                self.run.buffer().append(record)
+                
+                # Debug info
+                if self.debug:
+                    print(f"Created record: {record['name']}, {record['email']}, {record['phone']}")
+
+    def create_structured_records(self, domain, url, records, fallback_values, profession_info=None):
+        """
+        Create contact records from structured data, filling fields that no
+        structured record provides from the page-level values (in order).
+        Returns {field: set of casefolded values} used by the records.
+        """
+        used = {field: set() for field in fallback_values}
+        # A field some record has is known to be absent (not missed) on the others
+        fallback_values = {field: [] if any(r.get(field) for r in records) else values
+                           for field, values in fallback_values.items()}
+        
+        for i, structured in enumerate(records[:5]):  # Same per-page limit as the regex records
+            record = {}
+            for field, values in fallback_values.items():
+                value = structured.get(field)
+                if not value:
+                    value = values[i] if i < len(values) else "Not found"
+                record[field] = value
+            record.update({
+                "profession": self.profession,
+                "city": self.city,
+                "state": self.state,
+                "domain": domain,
+                "source_url": url
+            })
+            
+            if profession_info:
+                for key, value in profession_info.items():
+                    record[key] = value
+                # The structured address is more reliable than the pattern match
+                if 'address' in profession_info and structured['address']:
+                    record['address'] = structured['address']
+            
+            self.run.buffer().append(record)
+            for field in used:
+                if record[field] != "Not found":
+                    used[field].add(str(record[field]).casefold())
+            if self.debug:
+                print(f"Created structured record: {record['name']}, {record['email']}, {record['phone']}")
+        return used
+
+    @staticmethod
+    def _covered(value, used):
+        """Whether a pattern-matched value is already in a structured record ("Ravi Kumar" vs "Dr. Ravi Kumar")"""
+        value = str(value).casefold()
+        return any(value == other or value in other or other in value for other in used)
+
+    def extract_social_media(self, html_content, pattern, deadline=None):
+        """Extract social media profile links from HTML content (text or bytes)"""
+        profiles = []
+        
+        # Find all profile URLs
+        matches = self.find_pattern(pattern, html_content, deadline)
+        
+        # Clean and deduplicate
+        for match in matches:
+            # Make sure we have a full URL
+            if not match.startswith('http'):
+                if 'linkedin.com' in match:
+                    match = f"https://{match}"
+                elif 'instagram.com' in match:
+                    match = f"https://{match}"
+                elif 'twitter.com' in match or 'x.com' in match:
+                    match = f"https://{match}"
+            
+            profiles.append(match)
+        
+        # Remove duplicates and return
+        return list(set(profiles))
+
+    def extract_phone_numbers(self, html_content, deadline=None):
+        """Extract phone numbers from HTML content (text or bytes), normalized to E.164"""
+        return self.phone_normalizer.extract(html_content, deadline)
+
+    def reuse_previous_extraction(self, url, reason, message):
+        """Incremental runs: keep a page's contacts from the last run instead of extracting it again"""
+        reused = self.run.incremental_run.reuse(url, reason)
+        if reused is None:
+            return None, None
+        contacts, result, urls = reused
+        # Pages crawled from it last time are kept too, so don't fetch them again
+        for reused_url in urls:
+            self.run.claim_url(reused_url)
+        self.run.buffer().extend(contacts)
+        print(f"{message}, reusing {len(contacts)} contacts from the last run")
+        return result, None
+
+    def extract_contact_info_from_page(self, url):
+        """Visit a URL and extract contact information"""
+        try:
+            result, html_content = self._visit_page(url)
+            
+            # Follow the landing page's contact/about/team links on the same site
+            if self.site_crawler and html_content is not None:
+                self.crawl_site(url, html_content)
+        finally:
+            # Page boundary: this thread's contacts join the run's list
+            found = self.run.flush()
+            for contact in found:
+                self.run.emit(CONTACT_FOUND, url=url, contact=contact, contacts=len(self.contacts))
+            self.run.emit(PAGE_FETCHED, url=url, found=len(found), contacts=len(self.contacts))
+        
+        return result
+
+    def extract_from_content(self, url, content, headers, via=None):
+        """
+        Extract contact information from a fetched page body. Used for live
+        fetches and for replaying archived pages (see page_archive.py);
+        returns (result, html_content) like _visit_page. Contacts go to this
+        thread's buffer in the current run.
+        """
+        run = self.run.incremental_run
+        fingerprints = self.run.page_fingerprints
+        
+        digest = content_hash(content)
+        if run and run.unchanged(url, digest):
+            return self.reuse_previous_extraction(url, 'unchanged', "Unchanged since the last run")
+        
+        # Identical content already extracted under another URL (mirrors, tracking params)
+        duplicate = fingerprints.lookup_exact(digest)
+        if duplicate:
+            print(f"Same content as {duplicate[0]}, reusing its extraction result")
+            if run:
+                run.record(url, digest, headers, duplicate[1], [], via)
+            return duplicate[1], None
+        
+        # Skip parsing entirely when the raw bytes show nothing to extract
+        # (the text is still returned so the site crawl can follow its links)
+        signals = self.prefilter.scan(content, self.run.prefilter_stats)
+        content_type = headers.get('Content-Type')
+        if not signals:
+            if self.debug:
+                print(f"No contact signals on {url}, skipping extraction")
+            if run:
+                run.record(url, digest, headers, None, [], via)
+            return None, decode_page(content, content_type)[0] if self.site_crawler else None
+        
+        # Decode with the declared charset instead of letting requests sniff the whole body
+        html_content, encoding = decode_page(content, content_type)
+        
+        # Emails, phones and profile URLs are ASCII, so in ASCII-compatible pages
+        # their extractors can scan the raw bytes
+        raw_content = content if is_ascii_compatible(encoding) else html_content
+        domain = get_domain_name(url)
+        
+        # Near-identical visible text with the same contacts (same listing with different ads or navigation)
+        fingerprint = fingerprints.text_fingerprint(html_content)
+        duplicate = fingerprints.lookup_near(fingerprint)
+        if duplicate:
+            print(f"Near-duplicate of {duplicate[0]}, reusing its extraction result")
+            if run:
+                run.record(url, digest, headers, duplicate[1], [], via)
+            return duplicate[1], None
+        
+        # One time budget for the page, covering the structured data and the extractors
+        deadline = ExtractionDeadline(self.extraction_budget, cancel_token=self.run.cancel_token)
+        
+        # Structured data is exact, so its contacts win where the two sources overlap;
+        # the regex extractors still run for contacts it doesn't describe
+        records, structured, known = self.extract_structured_data(html_content)
+        if records:
+            # A field the structured data covers needs its extractor only if the page has more of it
+            signals = self.prefilter.without_known(content, signals, known, self.run.prefilter_stats)
+        # Pattern-matched names only add to structured records for contacts they don't describe,
+        # or stand in where no record has a name
+        need_names = not records or bool(signals & {'emails', 'phones'}) or not structured['names']
+        
+        # Extract all types of information, running only the extractors with a signal
+        found = {
+            'email': self.run_extractor(
+                'emails', url, deadline, self.extract_and_filter_emails, raw_content, default=[])
+            if 'emails' in signals else [],
+            'phone': self.run_extractor(
+                'phones', url, deadline, self.extract_phone_numbers, raw_content, default=[])
+            if 'phones' in signals else [],
+            'linkedin': self.run_extractor(
+                'linkedin', url, deadline, self.extract_social_media, raw_content, self.linkedin_pattern,
+                default=[]) if 'linkedin' in signals else [],
+            'instagram': self.run_extractor(
+                'instagram', url, deadline, self.extract_social_media, raw_content, self.instagram_pattern,
+                default=[]) if 'instagram' in signals else [],
+            'twitter': self.run_extractor(
+                'twitter', url, deadline, self.extract_social_media, raw_content, self.twitter_pattern,
+                default=[]) if 'twitter' in signals else [],
+            'name': self.run_extractor(
+                'names', url, deadline, self.extract_names, html_content, default=[])
+            if need_names else [],
+        }
+        
+        # Page-level values: structured ones first, then what only the patterns found
+        def merged(field, structured_field):
+            values = list(structured[structured_field])
+            seen = {str(value).casefold() for value in values}
+            return values + [value for value in found[field] if str(value).casefold() not in seen]
+        
+        emails = merged('email', 'emails')
+        phones = merged('phone', 'phones')
+        linkedin_profiles = merged('linkedin', 'linkedin')
+        instagram_profiles = merged('instagram', 'instagram')
+        twitter_profiles = merged('twitter', 'twitter')
+        names = merged('name', 'names')
+        
+        # Extract profession-specific info (doctor qualifications, lawyer courts, ...)
+        profession_info = self.run_extractor(
+            'profession info', url, deadline, self.extract_profession_info, html_content, default={})
+        
+        # Create contact records
+        buffer = self.run.buffer()
+        contacts_before = len(buffer)
+        if records:
+            used = self.create_structured_records(domain, url, records, {
+                field: structured[structured_field] or found[field] for field, structured_field in (
+                    ('name', 'names'), ('email', 'emails'), ('phone', 'phones'),
+                    ('linkedin', 'linkedin'), ('instagram', 'instagram'), ('twitter', 'twitter'))
+            }, profession_info)
+            
+            # Contacts on the page that the structured data doesn't describe
+            def leftover(field):
+                return [value for value in found[field] if not self._covered(value, used[field])]
+            
+            if leftover('email') or leftover('phone'):
+                self.create_contact_records(domain, url, leftover('name'), leftover('email'), leftover('phone'),
+                                            leftover('linkedin'), leftover('instagram'), leftover('twitter'),
+                                            profession_info)
+        else:
+            self.create_contact_records(domain, url, names, emails, phones, 
+                                      linkedin_profiles, instagram_profiles, twitter_profiles, profession_info)
+        if self.domain_stats:
+            self.domain_stats.record_contacts(url, len(buffer) - contacts_before)
+        
+        result = {
+            'emails': emails,
+            'phones': phones,
+            'linkedin': linkedin_profiles,
+            'instagram': instagram_profiles,
+            'twitter': twitter_profiles,
+            'names': names,
+            'profession_info': profession_info
+        }
+        fingerprints.add(digest, fingerprint, url, result)
+        if run:
+            run.record(url, digest, headers, result, buffer[contacts_before:], via)
+        return result, html_content
+
+    def _visit_page(self, url, via=None):
+        """
+        Fetch a single URL and extract contact information from it.
+        Returns (result, html_content); html_content is None if the page couldn't be
+        fetched or was a duplicate, and result is None if nothing was extracted.
+        via is the landing page a crawled page was found from.
+        """
+        if not self.run.claim_url(url):
+            return None, None
+        
+        print(f"Visiting: {url}")
+        run = self.run.incremental_run
+        
+        try:
+            headers = self.get_random_headers()
+            if run:
+                headers.update(run.conditional_headers(url))
+            fetch_started = time.time()
+            response = self.fetcher.get(url, headers=headers, cancel_token=self.run.cancel_token)
+            
+            if self.domain_stats:
+                self.domain_stats.record_fetch(url, response.status_code in (200, 304),
+                                               time.time() - fetch_started, len(response.content))
+            
+            if self.archive:
+                self.archive.write_response(url, response, job=(self.state, self.city, self.profession),
+                                            output=self.output_file)
+            
+            if run and response.status_code == 304:
+                return self.reuse_previous_extraction(url, 'not_modified', "Not modified since the last run")
+            
+            if response.status_code != 200:
+                print(f"Failed to fetch {url}, status code: {response.status_code}")
+                # Only a page that is really gone takes its contacts with it
+                if run and response.status_code in (404, 410):
+                    run.mark_gone(url)
+                elif run:
+                    return self.reuse_previous_extraction(url, 'carried_forward', "Keeping last run's page")
+                return None, None
+            
+            return self.extract_from_content(url, response.content, response.headers, via)
+            
+        except Cancelled:
+            raise
+        except HostUnavailable as e:
+            print(e)
+        except requests.RequestException as e:
+            print(f"Request error for {url}: {e}")
+            if self.domain_stats:
+                self.domain_stats.record_fetch(url, False, time.time() - fetch_started)
+        except Exception as e:
+            print(f"Error processing {url}: {e}")
+        
+        # A fetch error isn't evidence the page's contacts are gone
+        if run:
+            return self.reuse_previous_extraction(url, 'carried_forward', "Keeping last run's page")
+        return None, None
+
+    def crawl_site(self, landing_url, landing_html):
+        """
+        Visit the most promising same-site pages (contact, about, team, ...) linked
+        from a landing page, within the crawler's depth and per-domain page budget
+        """
+        crawler = self.site_crawler
+        domain = get_domain_name(landing_url).lower()
+        if domain.startswith('www.'):
+            domain = domain[4:]
+        
+        budget = crawler.max_pages - self.run.crawled(domain)
+        if budget <= 0:
+            return
+        
+        frontier = crawler.new_frontier(landing_url, landing_html)
+        
+        # The sitemap often lists the contact page even when the landing page doesn't link it
+        if crawler.use_sitemap and self.run.claim_sitemap(domain):
+            try:
+                response = self.fetcher.get(crawler.sitemap_url(landing_url),
+                                            headers=self.get_random_headers(),
+                                            cancel_token=self.run.cancel_token)
+                if response.status_code == 200:
+                    frontier.add_sitemap(decode_page(response.content, response.headers.get('Content-Type'))[0])
+            except requests.RequestException as e:
+                if self.debug:
+                    print(f"Could not fetch sitemap for {domain}: {e}")
+        
+        while budget > 0:
+            if self.query_planner and not self.query_planner.has_budget():
+                self.run.cut_short = "request budget used up"
+                break
+            item = frontier.pop()
+            if item is None:
+                break
+            url, depth = item
+            if url in self.visited_urls:
+                continue
+            self.run.cancel_token.check()
+            if not self.run.cancel_token.can_finish(self.fetcher.expected_duration(url)):
+                print(f"Not enough time left to crawl {url}, stopping the crawl of {domain}")
+                self.run.deadline_skips.increment()
+                break
+            
+            print(f"Crawling {domain} (depth {depth}): {url}")
+            budget -= 1
+            self.run.note_crawled(domain)
+            if self.query_planner:
+                self.query_planner.note_requests()
+            _, html_content = self._visit_page(url, via=landing_url)
+            
+            if html_content is not None and depth < crawler.max_depth:
+                frontier.add_links(url, html_content, depth + 1)
+            
+            # Be polite to the site between crawled pages
+            self.run.cancel_token.sleep(random.uniform(1, 2))
+
+    def scrape_specific_url(self, url):
+        """
+        Scrape contact information directly from a specific URL
+        Returns a dictionary with extraction results and the contact record.
+        Each call gets its own run, so one scraper can serve concurrent calls.
+        """
+        print(f"Directly scraping URL: {url}")
+        
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url
+        
+        run = self.new_run()
+        with self.using_run(run):
+            try:
+                # Extract domain for record keeping
+                domain = get_domain_name(url)
+                
+                # Extract contact information
+                extraction_result = self.extract_contact_info_from_page(url)
+                
+                # Return the extraction results and contacts
+                return {
+                    'success': True,
+                    'extraction_result': extraction_result,
+                    'contacts': run.contacts,
+                    'domain': domain,
+                    'url': url
+                }
+            except Exception as e:
+                print(f"Error scraping URL {url}: {str(e)}")
+                return {
+                    'success': False,
+                    'error': str(e),
+                    'contacts': run.contacts
+                }
+
+    def run_queries(self, max_pages, totals):
+        """The search and extraction loop of scrape(); raises Cancelled when the run is stopped"""
+        token = self.run.cancel_token
+        templates = self.get_query_templates()
+        planner = self.query_planner
+        scope = query_scope(self.city, self.profession)
+        
+        # Most productive queries first when we have history for them
+        if planner:
+            templates = planner.order(templates, scope)
+        
+        for query_index, template in enumerate(templates):
+            if planner and not planner.has_budget():
+                print(f"Request budget of {planner.request_budget} used up, stopping")
+                self.run.cut_short = "request budget used up"
+                break
+            
+            query = self.format_query(template)
+            print(f"\nProcessing search query: {query}")
+            self.run.emit(QUERY_STARTED, query=query, query_index=query_index + 1, total=len(templates))
+            
+            page = 0
+            empty_pages_count = 0
+            max_empty_pages = 2  # Stop after this many consecutive empty pages
+            
+            # Requests made and contacts found by this query, for the planner
+            query_requests = 0
+            contacts_before = len(self.contacts)
+            
+            while (max_pages is None or page < max_pages) and empty_pages_count < max_empty_pages:
+                if planner and not planner.should_continue(template, scope, page, query_requests,
+                                                           len(self.contacts) - contacts_before):
+                    print(f"Low yield for query, moving to next query")
+                    self.run.cut_short = "low-yield queries cut off"
+                    break
+                
+                start_index = page * 10
+                token.check()
+                
+                # Fetch search results (from the cache when possible). With domain statistics
+                # we look at every result and visit the 10 with the best expected yield.
+                result_limit = None if self.domain_stats else 10
+                urls, from_cache = self.get_search_result_urls(query, start=start_index, limit=result_limit)
+                if urls and self.domain_stats:
+                    urls = self.domain_stats.rank_urls(urls, limit=10)
+                if urls:
+                    # Resolve the result hosts in the background while the first pages download
+                    self.fetcher.prefetch(urls)
+                if not from_cache:
+                    query_requests += 1
+                    if planner:
+                        planner.note_requests()
+                self.run.emit(SEARCH_PAGE_FETCHED, query=query, query_index=query_index + 1,
+                              page=page + 1, urls=len(urls or []), from_cache=from_cache)
+                
+                if urls is None:
+                    print(f"No HTML content returned for page {page+1} of query: {query}")
+                    empty_pages_count += 1
+                    if empty_pages_count >= max_empty_pages:
+                        print(f"Too many empty pages, moving to next query")
+                        break
+                    # No fixed penalty here: the fetcher already backs off the search host
+                    continue
+                    
+                if not urls:
+                    print(f"No URLs found on page {page+1} for query: {query}")
+                    empty_pages_count += 1
+                    if empty_pages_count >= max_empty_pages:
+                        print(f"No more URLs found, moving to next query")
+                        break
+                else:
+                    empty_pages_count = 0  # Reset counter when we find URLs
+                    totals['urls'] += len(urls)
+                    totals['pages'] += 1
+                    
+                    # Process each URL
+                    url_limit = len(urls)
+                    print(f"Processing {url_limit} URLs from page {page+1}")
+                    
+                    for url_idx, url in enumerate(urls[:url_limit]):
+                        if planner and not planner.has_budget():
+                            self.run.cut_short = "request budget used up"
+                            break
+                        # Don't start a page that can't be fetched before the run's deadline
+                        if not token.can_finish(self.fetcher.expected_duration(url)):
+                            print(f"Not enough time left for {url}, skipping")
+                            self.run.deadline_skips.increment()
+                            continue
+                        if url not in self.visited_urls:
+                            query_requests += 1
+                            if planner:
+                                planner.note_requests()
+                        
+                        print(f"URL {url_idx+1}/{url_limit}: {url}")
+                        result = self.extract_contact_info_from_page(url)
+                        
+                        # Print more detailed results for debugging
+                        if result:
+                            found_items = {k: len(v) for k, v in result.items() if isinstance(v, list)}
+                            print(f"Found items: {found_items}")
+                        self.run.emit(STATS, **self.stats_snapshot(totals))
+                        
+                        # Add random delay between requests
+                        token.sleep(random.uniform(2, 4))
+                
+                page += 1
+                print(f"Completed page {page} for query: {query}")
+                # Add longer delay between pages to prevent rate limiting
+                # (not needed when the results came from the cache)
+                if not from_cache:
+                    token.sleep(random.uniform(4, 7))
+            
+            # Stopped by the page limit while results were still coming
+            if max_pages is not None and page >= max_pages and empty_pages_count == 0:
+                self.run.cut_short = "page limit reached"
+            
+            if planner:
+                planner.record(template, scope, query_requests, len(self.contacts) - contacts_before)
+
+    def stats_snapshot(self, totals=None):
+        """Cumulative progress of the current run, as reported in STATS events"""
+        totals = totals or {}
+        return {
+            'contacts': len(self.contacts),
+            'search_attempts': self.search_attempts,
+            'successful_searches': self.successful_searches,
+            'search_pages': totals.get('pages', 0),
+            'urls_found': totals.get('urls', 0),
+            'pages_visited': len(self.visited_urls),
+            'elapsed': time.time() - self.run.started,
+            'time_left': self.run.cancel_token.remaining(),
+        }
+
+    def print_summary(self, totals):
+        """Print what the run did: searches, pages, contacts and each component's statistics"""
+        planner = self.query_planner
+        print(f"\nScraping summary:")
+        print(f"- Search attempts: {self.search_attempts}")
+        print(f"- Successful searches: {self.successful_searches}")
+        if self.search_cache:
+            print(f"- Search cache hits: {self.search_cache.stats['hits']}")
+        if planner:
+            print(f"- Requests used: {planner.requests_used}"
+                  + (f"/{planner.request_budget}" if planner.request_budget else ""))
+        print(f"- Pages processed: {totals['pages']}")
+        print(f"- URLs found: {totals['urls']}")
+        if self.site_crawler:
+            print(f"- Same-site pages crawled: {self.run.total_crawled()}")
+        print(f"- Contacts extracted: {len(self.contacts)}")
+        print(self.fetcher.host_health.summary())
+        if self.fetcher.summary():
+            print(self.fetcher.summary())
+        if self.fetcher.dns_cache:
+            print(self.fetcher.dns_cache.summary())
+        print(self.prefilter.summary(self.run.prefilter_stats))
+        if self.run.extraction_timeouts.value:
+            print(f"- Extractors abandoned over the time budget: {self.run.extraction_timeouts}")
+        print(f"- Regex backend: {REGEX_BACKEND}")
+        print(f"- Pages with structured contact data: {self.run.structured_data_stats['pages_with_records']}")
+        print(f"- Duplicate pages skipped: {self.run.page_fingerprints.stats['exact_duplicates']} exact, "
+              f"{self.run.page_fingerprints.stats['near_duplicates']} near")
+        if self.run.incremental_run:
+            print(self.run.incremental_run.summary())
+        if self.archive:
+            print(self.archive.summary())
+        if self.run.deadline_skips.value:
+            print(f"- Pages skipped for lack of time: {self.run.deadline_skips}")
+
+    def scrape(self, max_pages=None, cancel_token=None, observer=None, event_interval=DEFAULT_INTERVAL):
+        """
+        Main scraping method that coordinates the entire process. A cancel_token
+        (see cancellation.py) stops the run early, when cancelled or at its
+        deadline; the contacts found until then are kept. observer is called
+        with progress events (see scrape_events.py), at most every
+        event_interval seconds apart from query starts and the end of the run.
+        """
+        run = self.run
+        if cancel_token is not None:
+            run.cancel_token = cancel_token
+        if observer is not None:
+            run.observer = ThrottledObserver(observer, event_interval)
+        run.started = time.time()
+        
+        # Initialize counters
+        totals = {'urls': 0, 'pages': 0}
+        
+        try:
+            try:
+                self.run_queries(max_pages, totals)
+            except Cancelled as e:
+                print(f"\nStopping early: {e}")
+            finally:
+                # Whatever this thread extracted before stopping joins the results
+                run.flush()
+            
+            self.print_summary(totals)
+            # Complete only if every query's results were searched and visited
+            run.completed = (not run.cancel_token.cancelled and not run.deadline_skips.value
+                             and run.cut_short is None)
+            run.emit(FINISHED, completed=run.completed, reason=run.cancel_token.reason or run.cut_short,
+                     **self.stats_snapshot(totals))
+        finally:
+            # The observer was for this call only; the run outlives it (saving, the next scrape)
+            if run.observer is not None:
+                run.observer.flush()
+            run.observer = None
+                
+        # Return the number of contacts found
+        return len(self.contacts)
+
+    def csv_fieldnames(self):
+        """Columns of the output CSV: the base fields plus the profession's own"""
+        return ['name', 'email', 'phone', 'linkedin', 'instagram', 'twitter',
+                'profession', 'city', 'state', 'domain', 'source_url'] + self.additional_fields
+
+    def delta_file(self, kind):
+        """Path of a delta CSV next to the output file, e.g. ..._contacts.new.csv"""
+        base, ext = os.path.splitext(self.output_file)
+        return f"{base}.{kind}{ext or '.csv'}"
+
+    def save_incremental_delta(self):
+        """
+        Finish an incremental run: store it as the next run's baseline and write
+        the new, changed and vanished contacts next to the output file
+        """
+        delta, carried = self.run.incremental_run.finish(self.contacts)
+        if carried:
+            print(f"Kept {len(carried)} contacts from last run's pages this run didn't reach")
+            self.contacts.extend(carried)
+        
+        output_dir = os.path.dirname(self.output_file)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        
+        for kind, contacts in delta.items():
+            path = self.delta_file(kind)
+            fieldnames = self.csv_fieldnames() + (['changed_fields'] if kind == 'changed' else [])
+            try:
+                with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                    writer.writeheader()
+                    for contact in contacts:
+                        writer.writerow({field: str(contact.get(field, 'Not found')) for field in fieldnames})
+            except Exception as e:
+                print(f"Error writing {kind} contacts to {path}: {e}")
+        print(f"Changes since the last run: {len(delta['new'])} new, {len(delta['changed'])} changed, "
+              f"{len(delta['vanished'])} vanished (see {self.delta_file('*')})")
+
+    def save_to_csv(self):
+        """Save extracted contacts to CSV file"""
+        if self.run.incremental_run and not self.run.incremental_run.finished:
+            self.save_incremental_delta()
+        
+        if not self.contacts:
+            print("No contacts were found to save.")
+            # Create an empty file with headers to prevent file not found errors
+            try:
+                fieldnames = self.csv_fieldnames()
+                
+                # Ensure the output directory exists
+                output_dir = os.path.dirname(self.output_file)
+                if output_dir and not os.path.exists(output_dir):
+                    os.makedirs(output_dir)
+                
+                with open(self.output_file, 'w', newline='', encoding='utf-8') as csvfile:
+                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                    writer.writeheader()
+                
+                print(f"Created empty CSV file with headers: {self.output_file}")
+                return True
+            except Exception as e:
+                print(f"Error creating empty CSV file: {e}")
+                return False
+            
+        try:
+            fieldnames = self.csv_fieldnames()
+            
+            # Ensure the output directory exists
+            output_dir = os.path.dirname(self.output_file)
+            if output_dir and not os.path.exists(output_dir):
+                os.makedirs(output_dir)
+            
+            with open(self.output_file, 'w', newline='', encoding='utf-8') as csvfile:
+                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                writer.writeheader()
+                
+                for contact in self.contacts:
+                    # Ensure phone is stored as a properly formatted string
+                    if contact['phone'] != 'Not found':
+                        # Make sure it's a string to prevent scientific notation
+                        if isinstance(contact['phone'], (int, float)):
+                            contact['phone'] = f"+{int(contact['phone'])}"
+                        else:
+                            contact['phone'] = str(contact['phone'])
+                    
+                    # Write only the fields in fieldnames
+                    row_data = {field: contact.get(field, 'Not found') for field in fieldnames}
+                    writer.writerow(row_data)
+                    
+            print(f"Successfully saved {len(self.contacts)} contacts to {self.output_file}")
+            return True
+        except Exception as e:
+            print(f"Error saving to CSV: {e}")
+            # Try a fallback approach with a different filename
+            try:
+                fallback_file = f"{self.output_file}.fallback.csv"
+                with open(fallback_file, 'w', newline='', encoding='utf-8') as csvfile:
+                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                    writer.writeheader()
+                    for contact in self.contacts:
+                        row_data = {field: str(contact.get(field, 'Not found')) for field in fieldnames}
+                        writer.writerow(row_data)
+                print(f"Fallback save successful: {fallback_file}")
+                return True
+            except Exception as e2:
+                print(f"Fallback save also failed: {e2}")
+                return False
+
+
+def get_domain_name(url):
+    """Extract domain name from URL"""
+    parsed_url = urlparse(url)
+    return parsed_url.netloc
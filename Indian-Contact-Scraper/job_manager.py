@@ -0,0 +1,231 @@
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from cancellation import TIME_LIMIT_REASON, CancellationToken
+from http_fetcher import HttpFetcher
+from scrape_events import FINISHED
+from storage import DEFAULT_DB_PATH, open_database
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+STOPPED = "stopped"
+FAILED = "failed"
+# Was running when the server went down; its CSV holds what was saved
+INTERRUPTED = "interrupted"
+
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+# Scrapes running at once across every session of the app
+DEFAULT_MAX_JOBS = 4
+
+# Seconds between saving a running job's contacts to its CSV
+PARTIAL_SAVE_INTERVAL = 30
+
+
+
+class OutputInUse(ValueError):
+    """Another queued or running job is already writing to the output file"""
+
+
+_COLUMNS = ("id", "state", "city", "profession", "params", "output_file", "status", "progress",
+            "contacts", "error", "created_at", "started_at", "finished_at")
+
+
+class JobManager:
+    """
+    Runs scrape jobs on a shared pool of worker threads, so a web request only
+    submits a job and later polls it. Jobs are recorded in SQLite: status and
+    progress survive browser refreshes, and queued jobs are picked up again
+    after a restart. Running jobs' contacts are readable at any time. Every
+    job fetches through one HttpFetcher, so concurrent jobs share its
+    connections and per-host backoff instead of each hitting a host on its own.
+    A job that reaches its time limit is completed, with the reason in its
+    progress; only a user or shutdown stop is recorded as stopped.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, max_jobs=DEFAULT_MAX_JOBS):
+        self.lock = threading.Lock()
+        self.connection = open_database(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS scrape_jobs ("
+            " id TEXT PRIMARY KEY,"
+            " state TEXT NOT NULL,"
+            " city TEXT NOT NULL,"
+            " profession TEXT NOT NULL,"
+            " params TEXT NOT NULL,"
+            " output_file TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " progress TEXT,"
+            " contacts INTEGER NOT NULL DEFAULT 0,"
+            " error TEXT,"
+            " created_at REAL NOT NULL,"
+            " started_at REAL,"
+            " finished_at REAL)"
+        )
+        self.connection.commit()
+        self.executor = ThreadPoolExecutor(max_workers=max_jobs, thread_name_prefix="scrape-job")
+        self.fetcher = HttpFetcher()
+        # job id -> (scraper, cancel token) while the job runs
+        self.running = {}
+        self._recover()
+
+    def _execute(self, sql, args=()):
+        """Run an update; returns the number of rows it changed"""
+        with self.lock:
+            cursor = self.connection.execute(sql, args)
+            self.connection.commit()
+            return cursor.rowcount
+
+    def _recover(self):
+        """Mark jobs cut off by a restart, and queue again the ones that never started"""
+        self._execute("UPDATE scrape_jobs SET status = ?, finished_at = ? WHERE status = ?",
+                      (INTERRUPTED, time.time(), RUNNING))
+        for job in self.list_jobs(statuses=(QUEUED,), limit=None):
+            self.executor.submit(self._run, job["id"])
+
+    def submit(self, state, city, profession, output_file, max_pages=None, time_limit=None):
+        """
+        Queue a scrape; returns the job id. Raises OutputInUse if an active job
+        already writes to output_file, since the two would overwrite each other.
+        """
+        job_id = uuid.uuid4().hex
+        params = {"max_pages": max_pages, "time_limit": time_limit}
+        # Checked and inserted in one statement, so two sessions can't both get the file
+        added = self._execute(
+            "INSERT INTO scrape_jobs (id, state, city, profession, params, output_file, status, created_at)"
+            " SELECT ?, ?, ?, ?, ?, ?, ?, ? WHERE NOT EXISTS ("
+            " SELECT 1 FROM scrape_jobs WHERE output_file = ? AND status IN (?, ?))",
+            (job_id, state, city, profession, json.dumps(params), output_file, QUEUED, time.time(),
+             output_file) + ACTIVE_STATUSES
+        )
+        if not added:
+            raise OutputInUse(f"Another job is already writing {output_file}")
+        self.executor.submit(self._run, job_id)
+        return job_id
+
+    def get(self, job_id):
+        """The job's row as a dict (progress decoded), or None"""
+        with self.lock:
+            row = self.connection.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM scrape_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._job(row) if row else None
+
+    def list_jobs(self, statuses=None, limit=20):
+        """Most recent jobs first, optionally only those with the given statuses"""
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM scrape_jobs"
+        args = []
+        if statuses:
+            sql += f" WHERE status IN ({', '.join('?' for _ in statuses)})"
+            args.extend(statuses)
+        sql += " ORDER BY created_at DESC"
+        if limit:
+            sql += " LIMIT ?"
+            args.append(limit)
+        with self.lock:
+            rows = self.connection.execute(sql, args).fetchall()
+        return [self._job(row) for row in rows]
+
+    @staticmethod
+    def _job(row):
+        job = dict(zip(_COLUMNS, row))
+        job["params"] = json.loads(job["params"])
+        job["progress"] = json.loads(job["progress"]) if job["progress"] else {}
+        return job
+
+    def contacts(self, job_id):
+        """Contacts found so far by a running job; None once it isn't running (read its CSV)"""
+        running = self.running.get(job_id)
+        if running is None:
+            return None
+        scraper, _ = running
+        return list(scraper.contacts)
+
+    def cancel(self, job_id):
+        """Stop a job; a running one keeps and saves what it has found"""
+        running = self.running.get(job_id)
+        if running is not None:
+            running[1].cancel("stopped by user")
+        self._execute("UPDATE scrape_jobs SET status = ?, finished_at = ? WHERE id = ? AND status = ?",
+                      (STOPPED, time.time(), job_id, QUEUED))
+
+    def _run(self, job_id):
+        from indian_contact_scraper import IndianContactScraper
+        from search_cache import SearchResultsCache
+
+        job = self.get(job_id)
+        if job is None or job["status"] != QUEUED:
+            return
+
+        params = job["params"]
+        scraper = IndianContactScraper(job["state"], job["city"], job["profession"],
+                                       output_file=job["output_file"], search_cache=SearchResultsCache(),
+                                       fetcher=self.fetcher)
+        token = CancellationToken(timeout=params.get("time_limit"))
+        # Registered before the job is claimed, so a cancel can't slip in between
+        self.running[job_id] = (scraper, token)
+        if not self._execute("UPDATE scrape_jobs SET status = ?, started_at = ? WHERE id = ? AND status = ?",
+                             (RUNNING, time.time(), job_id, QUEUED)):
+            # Cancelled while it waited for a worker
+            del self.running[job_id]
+            return
+
+        # The latest of every progress field the scraper has reported
+        progress = {}
+        last_save = [time.monotonic()]
+
+        def record_progress(event):
+            progress.update((key, value) for key, value in event.data.items()
+                            if key not in ("contact", "contacts_found"))
+            self._execute("UPDATE scrape_jobs SET progress = ?, contacts = ? WHERE id = ?",
+                          (json.dumps(progress), len(scraper.contacts), job_id))
+            # Keep the CSV close to the results, in case the server goes down
+            if event.kind != FINISHED and time.monotonic() - last_save[0] > PARTIAL_SAVE_INTERVAL:
+                last_save[0] = time.monotonic()
+                scraper.save_to_csv()
+
+        status, error = COMPLETED, None
+        try:
+            scraper.scrape(max_pages=params.get("max_pages"), cancel_token=token, observer=record_progress)
+            # Running out of time is how a time-limited job ends; the FINISHED event put
+            # the reason in its progress
+            if token.cancelled and token.reason != TIME_LIMIT_REASON:
+                status = STOPPED
+        except Exception as e:
+            print(f"Scrape job {job_id} failed: {e}")
+            status, error = FAILED, str(e)
+        finally:
+            try:
+                scraper.save_to_csv()
+            finally:
+                self._execute(
+                    "UPDATE scrape_jobs SET status = ?, error = ?, contacts = ?, finished_at = ? WHERE id = ?",
+                    (status, error, len(scraper.contacts), time.time(), job_id)
+                )
+                del self.running[job_id]
+
+    def shutdown(self, wait=True):
+        """Stop every running job (they save their results) and the workers"""
+        for _, token in list(self.running.values()):
+            token.cancel("server shutting down")
+        self.executor.shutdown(wait=wait)
+        if wait:
+            self.fetcher.close()
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager(max_jobs=DEFAULT_MAX_JOBS):
+    """The process-wide job manager, so every app session shares one concurrency cap"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager(max_jobs=max_jobs)
+        return _manager
@@ -0,0 +1,280 @@
+import re
+from collections import deque
+
+# Honorifics and professional titles, mapped to the form used in output records
+TITLES = {
+    "dr": "Dr.", "dr.": "Dr.", "doctor": "Dr.",
+    "adv": "Adv.", "adv.": "Adv.", "advocate": "Adv.",
+    "ca": "CA",
+    "er": "Er.", "er.": "Er.",
+    "prof": "Prof.", "prof.": "Prof.",
+    "mr": "Mr.", "mr.": "Mr.", "mrs": "Mrs.", "mrs.": "Mrs.", "ms": "Ms.", "ms.": "Ms.",
+    "shri": "Shri", "smt": "Smt.", "smt.": "Smt.",
+}
+
+# Titles that are also ordinary words are only accepted in this exact casing
+CASE_SENSITIVE_TITLES = {"ca": "CA", "er": "Er", "er.": "Er.", "ms": "Ms", "ms.": "Ms."}
+
+GIVEN_NAMES = [
+    "aarav", "abhishek", "aditi", "aditya", "ajay", "akash", "akshay", "amit", "amitabh",
+    "anand", "anil", "anita", "anjali", "ankit", "anupam", "anuradha", "arjun", "arun",
+    "aruna", "arvind", "ashok", "ashwin", "bhavna", "deepak", "deepika", "devendra",
+    "dinesh", "divya", "ganesh", "gaurav", "geeta", "girish", "gopal", "harish", "hemant",
+    "ishaan", "jagdish", "jaya", "jayant", "kailash", "kavita", "kiran", "krishna",
+    "kunal", "lakshmi", "lalit", "madhu", "mahesh", "manish", "manoj", "meena", "meera",
+    "mohammed", "mohammad", "mohan", "mukesh", "naveen", "neha", "nikhil", "nisha",
+    "nitin", "pankaj", "pooja", "prakash", "pradeep", "pramod", "prashant", "praveen",
+    "priya", "rahul", "rajesh", "rajiv", "rakesh", "ramesh", "ravi", "rekha", "ritu",
+    "rohit", "sachin", "sandeep", "sanjay", "santosh", "sarita", "satish", "shalini",
+    "shankar", "shilpa", "shweta", "siddharth", "sneha", "sudha", "sunil", "sunita",
+    "suresh", "sushma", "swati", "tarun", "uma", "usha", "varun", "vijay", "vikas",
+    "vikram", "vinay", "vinod", "vishal", "vivek", "yogesh", "abdul", "ahmed", "ali",
+    "fatima", "imran", "irfan", "salman", "sameer", "zainab", "harpreet", "gurpreet",
+    "manpreet", "jaspreet", "joseph", "thomas", "mary", "george", "venkatesh",
+    "srinivas", "subramanian", "lakshman", "murali", "balaji", "karthik", "senthil",
+]
+
+SURNAMES = [
+    "agarwal", "aggarwal", "ahuja", "bansal", "banerjee", "bhat", "bhatt", "bose",
+    "chatterjee", "chauhan", "chopra", "das", "desai", "deshpande", "dubey", "dutta",
+    "gandhi", "ghosh", "goyal", "gupta", "iyer", "iyengar", "jain", "jha", "joshi",
+    "kapoor", "khan", "khanna", "kulkarni", "kumar", "kumari", "malhotra", "mehta",
+    "menon", "mishra", "mukherjee", "nair", "naidu", "patel", "pandey", "pillai",
+    "prasad", "rao", "reddy", "saxena", "sethi", "shah", "sharma", "shetty", "shukla",
+    "singh", "sinha", "srivastava", "tiwari", "trivedi", "varma", "verma", "yadav",
+    "hegde", "gowda", "naik", "pawar", "patil", "chavan", "jadhav", "shinde", "more",
+    "thakur", "rathore", "chaudhary", "choudhury", "qureshi", "siddiqui", "ansari",
+    "sheikh", "syed", "fernandes", "dsouza", "pereira", "mathew", "varghese", "kaur",
+    "gill", "sandhu", "sidhu", "dhillon", "grewal", "krishnan", "raman", "subramaniam",
+    "rajan", "murthy", "swamy", "acharya", "bhattacharya", "sen", "roy", "saha",
+]
+
+# Navigation and boilerplate words that end (or rule out) a name candidate
+STOPWORDS = {
+    "home", "about", "contact", "us", "our", "team", "services", "service", "privacy",
+    "policy", "terms", "conditions", "login", "logout", "sign", "register", "read",
+    "more", "click", "here", "book", "appointment", "call", "email", "phone", "menu",
+    "search", "blog", "news", "gallery", "careers", "faq", "faqs", "help", "support",
+    "copyright", "rights", "reserved", "follow", "share", "subscribe", "view", "all",
+    "profile", "details", "address", "location", "map", "hospital", "clinic", "centre",
+    "center", "pvt", "ltd", "limited", "private", "india", "the", "and", "of", "for",
+    "with", "in", "at", "to", "by", "consultation", "online", "specialist", "best", "top",
+    "review", "reviews", "rating", "fees", "timings", "submit", "send", "message",
+    # Contact labels that often follow a name on the same line
+    "mobile", "mob", "tel", "telephone", "ph", "whatsapp", "fax", "landline", "cell",
+    "mail", "website", "web",
+}
+
+# Degrees and professional memberships written after a name ("Dr. Priya Sharma MBBS, MD")
+QUALIFICATIONS = {
+    "mbbs", "md", "ms", "mds", "bds", "bams", "bhms", "bums", "dnb", "dm", "mch", "frcs",
+    "frcp", "mrcp", "mrcs", "facs", "dch", "dgo", "dms", "dpm", "bpt", "mpt", "bsc", "msc",
+    "llb", "llm", "ba", "bl", "bcom", "mcom", "fca", "aca", "acs", "fcs", "cma", "icwa",
+    "cfa", "phd", "mba", "be", "btech", "me", "mtech", "march", "barch",
+}
+
+# A capitalized token that can continue a name: Title-case word, ALL-CAPS word or an initial
+# (not the first letter of a dotted degree like "M.B.B.S.").
+# Any whitespace separates tokens since line breaks in HTML text render as spaces.
+_NAME_TOKEN = re.compile(r"\s{1,8}([A-Z][a-z]+|[A-Z]{2,}|[A-Z]\.(?![A-Za-z]))")
+
+# Lowercase ASCII letters only so offsets in the lowered text match the original
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+class AhoCorasick:
+    """Multi-pattern string matcher that finds every dictionary word in a single pass"""
+
+    def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.outputs = [[]]
+        self.built = False
+
+    def add(self, word, payload):
+        """Add a word with an associated payload"""
+        node = 0
+        for char in word:
+            next_node = self.goto[node].get(char)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][char] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+            node = next_node
+        self.outputs[node].append((len(word), payload))
+        self.built = False
+
+    def build(self):
+        """Compute failure links breadth-first"""
+        queue = deque(self.goto[0].values())
+        for node in queue:
+            self.fail[node] = 0
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+        self.built = True
+
+    def iter_matches(self, text):
+        """Yield (start, end, payload) for every dictionary word occurring in text"""
+        if not self.built:
+            self.build()
+
+        goto = self.goto
+        fail = self.fail
+        outputs = self.outputs
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if outputs[node]:
+                end = index + 1
+                for length, payload in outputs[node]:
+                    yield end - length, end, payload
+
+
+class NameExtractor:
+    """
+    Find person names in page text using a gazetteer of Indian given names,
+    surnames and professional titles, scanned with one Aho-Corasick pass
+    """
+
+    # Compiled automaton shared by all instances, built on first use
+    _automaton = None
+
+    def __init__(self, max_tokens=4):
+        self.max_tokens = max_tokens
+
+    @classmethod
+    def get_automaton(cls):
+        """Build the gazetteer automaton once per process"""
+        if cls._automaton is None:
+            automaton = AhoCorasick()
+            for title in TITLES:
+                automaton.add(title, "title")
+            for name in GIVEN_NAMES:
+                automaton.add(name, "given")
+            for name in SURNAMES:
+                automaton.add(name, "surname")
+            automaton.build()
+            cls._automaton = automaton
+        return cls._automaton
+
+    def _is_word(self, text, start, end):
+        """Check that a dictionary hit is a whole word rather than part of a longer one"""
+        if start > 0 and text[start - 1].isalnum():
+            return False
+        if end < len(text) and text[end].isalnum():
+            return False
+        return True
+
+    def _is_stopword(self, token):
+        """Boilerplate words, degrees and the next person's title all end a name"""
+        key = token.rstrip(".").lower()
+        return key in STOPWORDS or key in TITLES or key in QUALIFICATIONS
+
+    def _following_tokens(self, text, pos, limit, upper=None):
+        """
+        Collect capitalized tokens after pos, stopping at boilerplate words.
+        ALL-CAPS words only continue a name written entirely in capitals; upper
+        says whether it is, or None to let the first word decide.
+        """
+        tokens = []
+        while len(tokens) < limit:
+            match = _NAME_TOKEN.match(text, pos)
+            if not match or self._is_stopword(match.group(1)):
+                break
+            token = match.group(1)
+            if not token.endswith("."):
+                if upper is None:
+                    upper = token.isupper()
+                elif token.isupper() != upper:
+                    break
+            tokens.append(token)
+            pos = match.end()
+        return tokens, pos
+
+    def _is_upper(self, token):
+        """Whether a word that starts a name is written in capitals"""
+        return len(token) > 1 and token.isupper()
+
+    def _preceding_token(self, text, start):
+        """Return (token, token_start) for a capitalized word just before start, if any"""
+        pos = start
+        while pos > 0 and text[pos - 1].isspace():
+            pos -= 1
+        if pos == start:
+            return None, start
+        word_end = pos
+        while pos > 0 and text[pos - 1].isalpha():
+            pos -= 1
+        token = text[pos:word_end]
+        if (len(token) > 1 and token[0].isupper() and not self._is_stopword(token)
+                and self._is_word(text, pos, word_end)):
+            return token, pos
+        return None, start
+
+    def _format(self, tokens):
+        """Title-case ALL-CAPS tokens so the same person always produces the same string"""
+        return " ".join(t.title() if t.isupper() and len(t) > 2 else t for t in tokens)
+
+    def extract(self, text):
+        """Return candidate names found in text, deduplicated in order of appearance"""
+        if not text:
+            return []
+
+        lowered = text.translate(_ASCII_LOWER)
+        hits = sorted(self.get_automaton().iter_matches(lowered), key=lambda h: (h[0], -h[1]))
+
+        names = []
+        seen = set()
+        covered_until = 0
+        for start, end, kind in hits:
+            if start < covered_until or not self._is_word(text, start, end):
+                continue
+
+            original = text[start:end]
+            if not original[0].isupper():
+                continue
+
+            if kind == "title":
+                key = original.lower()
+                if key in CASE_SENSITIVE_TITLES and original != CASE_SENSITIVE_TITLES[key]:
+                    continue
+                # "Dr" without a dot still takes the dot from the text if there is one
+                if end < len(text) and text[end] == "." and not key.endswith("."):
+                    end += 1
+                tokens, name_end = self._following_tokens(text, end, self.max_tokens - 1)
+                if not tokens:
+                    continue
+                name = f"{TITLES[key]} {self._format(tokens)}"
+            elif kind == "given":
+                tokens, name_end = self._following_tokens(text, end, self.max_tokens - 1, self._is_upper(original))
+                if not tokens:
+                    continue
+                name = self._format([original] + tokens)
+            else:
+                # A surname needs a capitalized word in front of it to count as a name
+                previous, previous_start = self._preceding_token(text, start)
+                if previous is None or previous_start < covered_until:
+                    continue
+                if self._is_upper(previous) != self._is_upper(original):
+                    continue
+                tokens, name_end = self._following_tokens(text, end, self.max_tokens - 2, self._is_upper(original))
+                name = self._format([previous, original] + tokens)
+
+            covered_until = name_end
+            if 5 <= len(name) <= 40 and name not in seen:
+                seen.add(name)
+                names.append(name)
+
+        return names
+
@@ -0,0 +1,344 @@
+import argparse
+import gzip
+import mmap
+import os
+import threading
+import time
+import uuid
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from incremental import run_key
+
+DEFAULT_ARCHIVE_DIR = "archive"
+
+# Start a new file once the current one passes this size
+DEFAULT_MAX_FILE_SIZE = 256 * 1024 * 1024
+
+# Which state/city/profession run fetched a page, and the CSV it wrote, so
+# re-extraction can rebuild that run's contacts
+JOB_HEADER = "Scraper-Job"
+OUTPUT_HEADER = "Scraper-Output"
+
+# Re-extracted contacts go next to the run's CSV under this suffix, never over it
+REEXTRACTED_SUFFIX = "reextracted"
+
+# Statuses saying a page no longer exists; the only non-200 answers that replace
+# an earlier archived copy (a 304 or 5xx says nothing new about the page)
+GONE_STATUS = (404, 410)
+
+# These describe how the body was transferred; the archive stores it decoded
+_TRANSFER_HEADERS = {"content-encoding", "transfer-encoding", "content-length"}
+
+# Compressed bytes fed to the decompressor at a time when looking for record boundaries
+_SCAN_CHUNK = 64 * 1024
+
+
+def _warc_date(timestamp=None):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(timestamp))
+
+
+class PageArchive:
+    """
+    Writes every fetched page into gzip-compressed WARC files, one gzip member
+    per record so any record can be read on its own. Files are rotated at
+    max_file_size; each record is flushed as it is written, so a crash loses
+    at most the record in progress.
+    """
+
+    def __init__(self, directory=DEFAULT_ARCHIVE_DIR, max_file_size=DEFAULT_MAX_FILE_SIZE, prefix="pages"):
+        self.directory = directory
+        self.max_file_size = max_file_size
+        self.prefix = prefix
+        self.lock = threading.Lock()
+        self.file = None
+        self.path = None
+        self.serial = 0
+        self.stats = {"records": 0, "files": 0}
+
+    def _open_file(self):
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+        self.serial += 1
+        name = f"{self.prefix}-{time.strftime('%Y%m%d%H%M%S', time.gmtime())}-{os.getpid()}-{self.serial:05d}.warc.gz"
+        self.path = os.path.join(self.directory, name)
+        self.file = open(self.path, "ab")
+        self.stats["files"] += 1
+        info = "software: Indian-Contact-Scraper\r\nformat: WARC File Format 1.0\r\n".encode("utf-8")
+        self._write_record("warcinfo", {"WARC-Filename": name, "Content-Type": "application/warc-fields"}, info)
+
+    def _write_record(self, warc_type, fields, block):
+        header = [
+            "WARC/1.0",
+            f"WARC-Type: {warc_type}",
+            f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>",
+            f"WARC-Date: {_warc_date()}",
+        ]
+        header.extend(f"{name}: {value}" for name, value in fields.items())
+        header.append(f"Content-Length: {len(block)}")
+        record = "\r\n".join(header).encode("utf-8") + b"\r\n\r\n" + block + b"\r\n\r\n"
+        self.file.write(gzip.compress(record))
+        self.file.flush()
+
+    def write_response(self, url, response, job=None, output=None):
+        """
+        Archive a requests.Response (body already read) as a WARC response
+        record, tagged with the run's job and output CSV when given
+        """
+        headers = [(name, value) for name, value in response.headers.items()
+                   if name.lower() not in _TRANSFER_HEADERS]
+        headers.append(("Content-Length", str(len(response.content))))
+        http_head = f"HTTP/1.1 {response.status_code} {response.reason or ''}\r\n" + "".join(
+            f"{name}: {value}\r\n" for name, value in headers)
+        block = http_head.encode("latin-1", "replace") + b"\r\n" + response.content
+
+        fields = {"WARC-Target-URI": url, "Content-Type": "application/http; msgtype=response"}
+        if job:
+            fields[JOB_HEADER] = run_key(*job)
+        if output:
+            fields[OUTPUT_HEADER] = output
+        with self.lock:
+            if self.file is None or self.file.tell() >= self.max_file_size:
+                self.close()
+                self._open_file()
+            self._write_record("response", fields, block)
+            self.stats["records"] += 1
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def summary(self):
+        return f"- Pages archived: {self.stats['records']} in {self.stats['files']} file(s) under {self.directory}"
+
+
+def parse_record(payload):
+    """Split an uncompressed WARC record into (fields, block); field names are lower-cased"""
+    head, _, rest = payload.partition(b"\r\n\r\n")
+    fields = {}
+    for line in head.decode("utf-8", "replace").split("\r\n")[1:]:
+        name, _, value = line.partition(":")
+        fields[name.strip().lower()] = value.strip()
+    length = int(fields.get("content-length", len(rest)))
+    return fields, rest[:length]
+
+
+def parse_http_response(block):
+    """Split an archived HTTP response into (status, headers, body)"""
+    from requests.structures import CaseInsensitiveDict
+
+    head, _, body = block.partition(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    parts = lines[0].split(" ", 2)
+    status = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
+    headers = CaseInsensitiveDict()
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip()] = value.strip()
+    return status, headers, body
+
+
+def iter_members(data):
+    """Yield (offset, length, payload) for each gzip member of a .warc.gz file's bytes"""
+    view = memoryview(data)
+    try:
+        offset = 0
+        while offset < len(view):
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            chunks = []
+            position = offset
+            while not decompressor.eof:
+                if position >= len(view):
+                    # A record cut short by a crash while it was being written
+                    print(f"Skipping a truncated record at offset {offset}")
+                    return
+                chunk = view[position:position + _SCAN_CHUNK]
+                chunks.append(decompressor.decompress(chunk))
+                position += len(chunk)
+            end = position - len(decompressor.unused_data)
+            yield offset, end - offset, b"".join(chunks)
+            offset = end
+    finally:
+        view.release()
+
+
+def archive_files(paths):
+    """The .warc.gz files among paths, expanding directories"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                         if name.endswith(".warc.gz"))
+        elif os.path.exists(path):
+            files.append(path)
+        else:
+            print(f"No such archive: {path}")
+    return files
+
+
+def _http_status(block):
+    """Status code from the first line of an archived HTTP response, or 0"""
+    parts = block[:block.find(b"\r\n")].split(b" ", 2)
+    return int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
+
+
+def index_archive(path):
+    """
+    (path, offset, length, job, url, date, output, status) for every archived
+    page response in a file, read through a memory map; output is None for
+    pages archived without their run's CSV path
+    """
+    entries = []
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return entries
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            members = iter_members(data)
+            try:
+                for offset, length, payload in members:
+                    fields, block = parse_record(payload)
+                    if fields.get("warc-type") != "response":
+                        continue
+                    entries.append((path, offset, length, fields.get(JOB_HEADER.lower()),
+                                    fields.get("warc-target-uri"), fields.get("warc-date", ""),
+                                    fields.get(OUTPUT_HEADER.lower()), _http_status(block)))
+            finally:
+                # Release the generator's view before the map is closed
+                members.close()
+    return entries
+
+
+# Per-process state for re-extraction workers
+_worker_scrapers = {}
+_worker_maps = {}
+
+
+def _worker_scraper(job, extraction_budget):
+    scraper = _worker_scrapers.get(job)
+    if scraper is None:
+        from indian_contact_scraper import IndianContactScraper
+        state, city, profession = job.split("|")
+        scraper = _worker_scrapers[job] = IndianContactScraper(
+            state, city, profession, extraction_budget=extraction_budget)
+    return scraper
+
+
+def _read_member(path, offset, length):
+    data = _worker_maps.get(path)
+    if data is None:
+        with open(path, "rb") as f:
+            data = _worker_maps[path] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return zlib.decompress(data[offset:offset + length], 16 + zlib.MAX_WBITS)
+
+
+def extract_batch(batch, extraction_budget=5.0):
+    """Run the extractors over a batch of archived pages; returns [(job, target, contacts), ...]"""
+    results = []
+    for path, offset, length, job, url, target in batch:
+        _, block = parse_record(_read_member(path, offset, length))
+        status, headers, body = parse_http_response(block)
+        if status != 200:
+            continue
+        scraper = _worker_scraper(job, extraction_budget)
+        try:
+            scraper.extract_from_content(url, body, headers)
+        except Exception as e:
+            print(f"Error re-extracting {url}: {e}")
+        # Hand the page's contacts back instead of merging them into the worker's run
+        results.append((job, target, scraper.run.take_buffer()))
+    return results
+
+
+def reextracted_file(job, output=None, output_dir=None):
+    """
+    Where a run's re-extracted contacts go: beside the CSV the run wrote (or
+    in output_dir), e.g. doctors.csv -> doctors.reextracted.csv
+    """
+    if output:
+        directory, name = os.path.split(output)
+    else:
+        # Pages archived before the output path was recorded: the runners' default name
+        directory, name = "output", "{}_{}_{}_contacts.csv".format(*job.split("|"))
+    base, ext = os.path.splitext(name)
+    return os.path.join(output_dir or directory, f"{base}.{REEXTRACTED_SUFFIX}{ext or '.csv'}")
+
+
+def reextract(paths, output_dir=None, workers=None, batch_size=50, extraction_budget=5.0,
+              state=None, city=None, profession=None):
+    """
+    Replay archived pages through the current extractors in a process pool and
+    write each run's contacts to a .reextracted copy of its CSV, leaving the
+    CSV itself alone. Only the latest 200 copy of each page is used, unless
+    the page was later found gone (404/410). Returns {path written: number
+    of contacts}.
+    """
+    from indian_contact_scraper import IndianContactScraper
+
+    entries = {}
+    for path in archive_files(paths):
+        for entry in index_archive(path):
+            _, _, _, job, url, date, output, status = entry
+            if status != 200 and status not in GONE_STATUS:
+                continue
+            if not job or not url:
+                continue
+            entry_state, entry_city, entry_profession = job.split("|")
+            if ((state and entry_state != state) or (city and entry_city != city)
+                    or (profession and entry_profession != profession)):
+                continue
+            # WARC dates sort as strings; a later crawl of the page replaces an earlier one
+            key = (job, output, url)
+            if key not in entries or date >= entries[key][5]:
+                entries[key] = entry
+
+    # Each page carries the file its contacts are written to
+    pages = [entry[:5] + (reextracted_file(entry[3], entry[6], output_dir),)
+             for entry in entries.values() if entry[7] == 200]
+    print(f"Re-extracting {len(pages)} archived pages")
+    batches = [pages[i:i + batch_size] for i in range(0, len(pages), batch_size)]
+
+    contacts = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for results in executor.map(extract_batch, batches, [extraction_budget] * len(batches)):
+            for job, target, page_contacts in results:
+                contacts.setdefault((job, target), []).extend(page_contacts)
+
+    counts = {}
+    for (job, target), job_contacts in contacts.items():
+        job_state, job_city, job_profession = job.split("|")
+        scraper = IndianContactScraper(job_state, job_city, job_profession, output_file=target)
+        scraper.contacts = job_contacts
+        scraper.save_to_csv()
+        counts[target] = len(job_contacts)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Re-run contact extraction over archived pages, without the network')
+    parser.add_argument('archives', nargs='*', default=[DEFAULT_ARCHIVE_DIR],
+                        help=f'WARC files or directories of them (default: {DEFAULT_ARCHIVE_DIR})')
+    parser.add_argument('--output-dir',
+                        help="Where to write the regenerated CSVs (default: next to each run's own CSV); "
+                             "they are named <csv>.reextracted.csv so the original is kept")
+    parser.add_argument('--workers', type=int, default=None, help='Extraction processes (default: one per CPU)')
+    parser.add_argument('--batch-size', type=int, default=50, help='Pages handed to a process at a time (default: 50)')
+    parser.add_argument('--extraction-budget', type=float, default=5.0,
+                        help='Seconds the extractors may spend on one page before giving up (default: 5)')
+    parser.add_argument('--state', help='Only re-extract runs for this state')
+    parser.add_argument('--city', help='Only re-extract runs for this city')
+    parser.add_argument('--profession', help='Only re-extract runs for this profession')
+
+    args = parser.parse_args(argv)
+
+    started = time.time()
+    counts = reextract(args.archives, output_dir=args.output_dir, workers=args.workers,
+                       batch_size=args.batch_size, extraction_budget=args.extraction_budget,
+                       state=args.state, city=args.city, profession=args.profession)
+    for path, count in sorted(counts.items()):
+        print(f"{path}: {count} contacts")
+    print(f"Re-extraction finished in {time.time() - started:.1f} seconds")
+
+
+if __name__ == "__main__":
+    main()
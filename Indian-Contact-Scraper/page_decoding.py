@@ -0,0 +1,76 @@
+import codecs
+import re
+
+# Only the start of the document is searched for a <meta> charset declaration
+META_SNIFF_BYTES = 4096
+
+DEFAULT_ENCODING = "utf-8"
+
+_HEADER_CHARSET = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE)
+_META_CHARSET = re.compile(rb"<meta[^>]{0,200}?charset\s*=\s*[\"']?\s*([\w.:-]+)", re.IGNORECASE)
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# Labels browsers treat as something else (HTML spec encoding labels)
+_ALIASES = {"iso-8859-1": "cp1252", "latin1": "cp1252", "latin-1": "cp1252",
+            "us-ascii": "cp1252", "ascii": "cp1252", "x-user-defined": "cp1252"}
+
+
+def _known_encoding(label):
+    """Python codec name for a charset label, or None if it isn't one we can decode"""
+    if not label:
+        return None
+    label = label.strip().lower()
+    label = _ALIASES.get(label, label)
+    try:
+        return codecs.lookup(label).name
+    except LookupError:
+        return None
+
+
+def charset_from_headers(content_type):
+    """Charset declared in a Content-Type header, or None"""
+    match = _HEADER_CHARSET.search(content_type or "")
+    return _known_encoding(match.group(1)) if match else None
+
+
+def charset_from_meta(content, limit=META_SNIFF_BYTES):
+    """Charset declared by <meta charset> or <meta http-equiv> near the top of the page, or None"""
+    match = _META_CHARSET.search(content[:limit])
+    return _known_encoding(match.group(1).decode("ascii", "ignore")) if match else None
+
+
+def detect_encoding(content, content_type=None):
+    """
+    Encoding of a page from its byte order mark, Content-Type header or
+    <meta> tag, in that order, without scanning the whole body
+    """
+    for bom, encoding in _BOMS:
+        if content.startswith(bom):
+            return encoding
+    encoding = charset_from_headers(content_type)
+    if encoding:
+        return encoding
+
+    # A UTF-16 <meta> in a page we could read as ASCII is a lie; browsers ignore it too
+    encoding = charset_from_meta(content)
+    if encoding and encoding.startswith(("utf-16", "utf-32")):
+        encoding = None
+    return encoding or DEFAULT_ENCODING
+
+
+def is_ascii_compatible(encoding):
+    """Whether ASCII text (emails, phone numbers, URLs) appears byte-for-byte in this encoding"""
+    return not encoding.startswith(("utf-16", "utf-32"))
+
+
+def decode_page(content, content_type=None):
+    """Return (text, encoding) for a page body"""
+    encoding = detect_encoding(content, content_type)
+    return content.decode(encoding, "replace"), encoding
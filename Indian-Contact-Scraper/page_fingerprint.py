@@ -0,0 +1,139 @@
+import hashlib
+import re
+
+# Markup that never contributes visible text
+_INVISIBLE_BLOCK = re.compile(r"<(script|style|noscript)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_TAG = re.compile(r"<[^>]{0,2000}>")
+_WORD = re.compile(r"\w+")
+
+# What a page says about whom: emails, phone-like digit runs and titled names.
+# Template-identical profile pages differ only in these.
+_EMAIL_TOKEN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PHONE_TOKEN = re.compile(r"\+?\d[\d\s().-]{6,16}\d")
+_TITLED_NAME_TOKEN = re.compile(r"\b(?:Dr|Adv|Prof|Er|Ar|CA|Mr|Mrs|Ms)\.?\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?")
+
+SIMHASH_BITS = 64
+
+# The 64-bit fingerprint is split into bands; two fingerprints within
+# max_distance bits of each other must agree exactly on at least one band
+SIMHASH_BANDS = 4
+_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+
+def content_hash(content):
+    """Exact fingerprint of a page body"""
+    if isinstance(content, str):
+        content = content.encode("utf-8", "ignore")
+    return hashlib.sha1(content).hexdigest()
+
+
+def visible_text(html):
+    """Rough visible text of an HTML document, without building a parse tree"""
+    html = _INVISIBLE_BLOCK.sub(" ", html)
+    return _TAG.sub(" ", html)
+
+
+def simhash(text, shingle_size=3):
+    """64-bit SimHash over word shingles; similar texts differ in only a few bits"""
+    words = _WORD.findall(text.lower())
+    if len(words) < shingle_size:
+        shingles = {" ".join(words)} if words else set()
+    else:
+        shingles = {" ".join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)}
+    if not shingles:
+        return 0
+
+    counts = [0] * SIMHASH_BITS
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            counts[bit] += 1 if value >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, count in enumerate(counts):
+        if count > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def contact_tokens(text):
+    """Hash of the emails, phone numbers and titled names in a page's visible text"""
+    tokens = {email.lower() for email in _EMAIL_TOKEN.findall(text)}
+    for phone in _PHONE_TOKEN.findall(text):
+        digits = re.sub(r"\D", "", phone)
+        if len(digits) >= 8:
+            tokens.add(digits[-10:])
+    tokens.update(" ".join(name.split()) for name in _TITLED_NAME_TOKEN.findall(text))
+    return hashlib.sha1("\n".join(sorted(tokens)).encode("utf-8")).hexdigest()
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count("1")
+
+
+class PageFingerprintStore:
+    """
+    Remember pages already extracted, by exact content hash and by SimHash of
+    their visible text, so mirrors and re-served listings are extracted once.
+    Near-identical text only counts as a duplicate when the page also names
+    the same emails, phones and people: profile pages built from one site
+    template are nearly identical too, but each has its own contacts.
+    """
+
+    def __init__(self, max_distance=3, min_words=50):
+        self.max_distance = max_distance
+        self.min_words = min_words
+        self.exact = {}
+        self.near = {}
+        self.bands = [{} for _ in range(SIMHASH_BANDS)]
+        self.stats = {"exact_duplicates": 0, "near_duplicates": 0}
+
+    def _band_keys(self, fingerprint):
+        return [(fingerprint >> (band * _BAND_BITS)) & _BAND_MASK for band in range(SIMHASH_BANDS)]
+
+    def lookup_exact(self, digest):
+        """Return (source_url, result) for a page with identical content, or None"""
+        entry = self.exact.get(digest)
+        if entry is not None:
+            self.stats["exact_duplicates"] += 1
+        return entry
+
+    def lookup_near(self, fingerprint):
+        """
+        Return (source_url, result) for a page with near-identical text and the
+        same contact tokens, or None. fingerprint is from text_fingerprint.
+        """
+        if fingerprint is None:
+            return None
+        simhash_value, tokens = fingerprint
+        for band, key in enumerate(self._band_keys(simhash_value)):
+            for candidate in self.bands[band].get(key, ()):
+                if hamming_distance(candidate, simhash_value) <= self.max_distance:
+                    entry = self.near[candidate].get(tokens)
+                    if entry is not None:
+                        self.stats["near_duplicates"] += 1
+                        return entry
+        return None
+
+    def text_fingerprint(self, html):
+        """
+        (SimHash, contact token hash) of a page's visible text, or None if the
+        page is too short to compare safely
+        """
+        text = visible_text(html)
+        if len(_WORD.findall(text)) < self.min_words:
+            return None
+        return simhash(text), contact_tokens(text)
+
+    def add(self, digest, fingerprint, url, result):
+        """Record the extraction result for a page"""
+        entry = (url, result)
+        self.exact[digest] = entry
+        if fingerprint is not None:
+            simhash_value, tokens = fingerprint
+            if simhash_value not in self.near:
+                self.near[simhash_value] = {}
+                for band, key in enumerate(self._band_keys(simhash_value)):
+                    self.bands[band].setdefault(key, []).append(simhash_value)
+            self.near[simhash_value].setdefault(tokens, entry)
@@ -0,0 +1,90 @@
+import re
+
+# Cheap byte-level signals for each extractor. Substring checks run in C and
+# stop at the first hit, so they cost far less than parsing the page.
+EMAIL_SIGNAL = re.compile(rb"[\w.+-]@[\w-]+\.")
+PHONE_SIGNAL = re.compile(rb"\d(?:[ \t().\-]{0,3}\d){9}")
+TEL_SIGNAL = b"tel:"
+
+SOCIAL_SIGNALS = {
+    "linkedin": (b"linkedin.com",),
+    "instagram": (b"instagram.com",),
+    "twitter": (b"twitter.com", b"x.com/"),
+}
+
+# Extractors the prefilter can switch off, in the order they run
+EXTRACTORS = ("emails", "phones", "linkedin", "instagram", "twitter")
+
+# Counters scan() and without_known() bump, kept per run by the caller
+PREFILTER_STATS = (("pages_scanned", "pages_skipped") + tuple(f"{extractor}_skipped" for extractor in EXTRACTORS)
+                   + tuple(f"{extractor}_covered" for extractor in EXTRACTORS))
+
+
+class PagePrefilter:
+    """
+    Decide from the raw response bytes whether a page is worth parsing and
+    which extractors have anything to find. Holds no state of its own, so
+    one prefilter serves every run and thread; counts go to the stats passed
+    in (counters keyed by PREFILTER_STATS, see scraper_state.py).
+    """
+
+    def _has_signal(self, content, extractor):
+        if extractor == "emails":
+            return EMAIL_SIGNAL.search(content) is not None
+        if extractor == "phones":
+            return TEL_SIGNAL in content or PHONE_SIGNAL.search(content) is not None
+        return any(needle in content for needle in SOCIAL_SIGNALS[extractor])
+
+    def scan(self, content, stats=None):
+        """Return the set of extractors worth running on content (empty if the page can be skipped)"""
+        if isinstance(content, str):
+            content = content.encode("utf-8", "ignore")
+
+        signals = {extractor for extractor in EXTRACTORS if self._has_signal(content, extractor)}
+
+        if stats is not None:
+            stats["pages_scanned"].increment()
+            if not signals:
+                stats["pages_skipped"].increment()
+            for extractor in EXTRACTORS:
+                if extractor not in signals:
+                    stats[f"{extractor}_skipped"].increment()
+
+        return signals
+
+    def without_known(self, content, signals, known, stats=None):
+        """
+        The signals left once values already extracted another way (structured
+        data) are blanked out of content. An extractor whose only hits are those
+        values has nothing new to find. known maps extractors to the values as
+        written in the page.
+        """
+        if isinstance(content, str):
+            content = content.encode("utf-8", "ignore")
+
+        remaining = set(signals)
+        for extractor in signals:
+            values = [value for value in known.get(extractor, ()) if value]
+            if not values:
+                continue
+            rest = content
+            for value in values:
+                rest = rest.replace(value.encode("utf-8", "ignore"), b"")
+            if extractor == "phones":
+                # Every tel: link's number is among the known values
+                rest = rest.replace(TEL_SIGNAL, b"")
+            if not self._has_signal(rest, extractor):
+                remaining.discard(extractor)
+                if stats is not None:
+                    stats[f"{extractor}_covered"].increment()
+        return remaining
+
+    @staticmethod
+    def summary(stats):
+        """Human-readable summary of how much work the prefilter saved"""
+        scanned = stats["pages_scanned"].value
+        lines = [f"- Pages skipped by prefilter: {stats['pages_skipped'].value}/{scanned}"]
+        for extractor in EXTRACTORS:
+            lines.append(f"  - {extractor} extractor skipped: {stats[f'{extractor}_skipped'].value}"
+                         f" (+{stats[f'{extractor}_covered'].value} covered by structured data)")
+        return "\n".join(lines)
@@ -0,0 +1,302 @@
+import re
+
+from regex_backend import compile_pattern, iter_matches
+
+# Indian country code and the service prefixes that use a different length
+COUNTRY_CODE = "91"
+TOLL_FREE_PREFIXES = ("1800", "1860")
+
+# Leading digits of the 10-digit mobile series
+MOBILE_SERIES = ("6", "7", "8", "9")
+
+# STD codes (without the 0 trunk prefix) for the larger cities. Landlines with a
+# known code are checked against the subscriber number that follows it; codes
+# that are not listed fall back to the generic area digit entries below.
+STD_CODES = {
+    # Metro cities
+    "11": "Delhi", "20": "Pune", "22": "Mumbai", "33": "Kolkata",
+    "40": "Hyderabad", "44": "Chennai", "79": "Ahmedabad", "80": "Bengaluru",
+    # North
+    "120": "Noida/Ghaziabad", "121": "Meerut", "124": "Gurugram", "129": "Faridabad",
+    "135": "Dehradun", "141": "Jaipur", "144": "Alwar", "145": "Ajmer",
+    "151": "Bikaner", "161": "Ludhiana", "172": "Chandigarh", "175": "Patiala",
+    "177": "Shimla", "181": "Jalandhar", "183": "Amritsar", "191": "Jammu",
+    "194": "Srinagar",
+    # West
+    "231": "Kolhapur", "233": "Sangli", "240": "Aurangabad", "253": "Nashik",
+    "261": "Surat", "265": "Vadodara", "278": "Bhavnagar", "281": "Rajkot",
+    "291": "Jodhpur", "294": "Udaipur",
+    # East and North-East
+    "326": "Dhanbad", "343": "Durgapur", "353": "Siliguri", "360": "Itanagar",
+    "361": "Guwahati", "364": "Shillong", "370": "Kohima", "381": "Agartala",
+    "385": "Imphal", "389": "Aizawl", "3592": "Gangtok",
+    # South
+    "413": "Puducherry", "416": "Vellore", "422": "Coimbatore", "427": "Salem",
+    "431": "Tiruchirappalli", "452": "Madurai", "471": "Thiruvananthapuram",
+    "484": "Kochi", "487": "Thrissur", "495": "Kozhikode",
+    # Uttar Pradesh
+    "512": "Kanpur", "522": "Lucknow", "532": "Prayagraj", "542": "Varanasi",
+    "551": "Gorakhpur", "562": "Agra", "565": "Mathura", "571": "Aligarh",
+    "581": "Bareilly", "591": "Moradabad",
+    # Bihar, Jharkhand and Odisha
+    "612": "Patna", "621": "Muzaffarpur", "631": "Gaya", "651": "Ranchi",
+    "657": "Jamshedpur", "661": "Rourkela", "671": "Cuttack", "674": "Bhubaneswar",
+    # Central
+    "712": "Nagpur", "731": "Indore", "751": "Gwalior", "755": "Bhopal",
+    "761": "Jabalpur", "771": "Raipur", "788": "Durg-Bhilai",
+    # Karnataka, Goa, Andhra Pradesh and Telangana
+    "821": "Mysuru", "824": "Mangaluru", "831": "Belagavi", "832": "Goa",
+    "836": "Hubballi-Dharwad", "863": "Guntur", "866": "Vijayawada",
+    "870": "Warangal", "877": "Tirupati", "891": "Visakhapatnam",
+}
+
+# Landline subscriber numbers start with one of these digits
+LANDLINE_SUBSCRIBER_DIGITS = "234567"
+
+# Ascending and descending runs used to spot placeholder numbers like 9876543210
+_SEQUENTIAL_RUNS = "01234567890123456789" + "98765432109876543210"
+
+# Numbers mangled by spreadsheet float conversion end in a run of zeros
+_TRAILING_ZEROS = "00000"
+
+# Digit runs in free text that could hold phone numbers: 10-45 digits, allowing
+# short separator runs (spaces, hyphens, dots, brackets) between the digits, so
+# numbers written next to each other come as one run and are split afterwards.
+# A trailing colon means a timestamp, not a phone number.
+PHONE_CANDIDATE_PATTERN = r"(?<![\w.:])\+?\(?(?:\d[ \t().\-]{0,3}){9,44}\d(?![\w:])"
+
+# ISO-style dates glued to other digits ("2023-10-19 1234") look like landlines
+_DATE_PREFIX_PATTERN = re.compile(r"(?:19|20)\d{2}[-./](?:0[1-9]|1[0-2])[-./]\d{2}")
+
+# Digit groups of a candidate, split at its separators ("+91", "98450", "12345")
+_DIGIT_GROUP_PATTERN = re.compile(r"\+?\d+")
+
+
+def build_prefix_index():
+    """Build the prefix -> (kind, label) lookup table of the Indian numbering plan"""
+    index = {}
+
+    # Generic STD area digits: any landline whose code we don't list explicitly
+    for digit in "12345":
+        index[digit] = ("landline", None)
+
+    # 10x are emergency and service numbers, never a subscriber number
+    index["10"] = ("invalid", None)
+
+    for digit in MOBILE_SERIES:
+        index[digit] = ("mobile", None)
+
+    for code, city in STD_CODES.items():
+        index[code] = ("landline", city)
+
+    for prefix in TOLL_FREE_PREFIXES:
+        index[prefix] = ("toll_free", None)
+
+    return index
+
+
+# Precomputed once at import time and shared by every normalizer
+PREFIX_INDEX = build_prefix_index()
+PREFIX_LENGTHS = sorted({len(prefix) for prefix in PREFIX_INDEX}, reverse=True)
+
+
+class PhoneNormalizer:
+    """
+    Canonicalize Indian phone numbers to E.164 (+91XXXXXXXXXX) using a
+    precomputed prefix index of the national numbering plan
+    """
+
+    def __init__(self, prefix_index=None):
+        self.prefix_index = prefix_index or PREFIX_INDEX
+        if prefix_index is None:
+            self.prefix_lengths = PREFIX_LENGTHS
+        else:
+            self.prefix_lengths = sorted({len(p) for p in prefix_index}, reverse=True)
+        self.candidate_pattern = compile_pattern(PHONE_CANDIDATE_PATTERN)
+        self.candidate_bytes_pattern = compile_pattern(PHONE_CANDIDATE_PATTERN.encode("ascii"))
+
+    def _collect_digits(self, raw):
+        """Walk the raw value once, returning (digits, has_plus) or None if it can't be a phone"""
+        digits = []
+        has_plus = False
+        for char in raw:
+            if "0" <= char <= "9":
+                digits.append(char)
+                # Longer than any E.164 number, no need to look further
+                if len(digits) > 15:
+                    return None
+            elif char == "+":
+                # A plus sign is only meaningful before the first digit
+                if digits or has_plus:
+                    return None
+                has_plus = True
+            elif char not in " \t\n\r-.()/\u00a0":
+                return None
+        return "".join(digits), has_plus
+
+    def _national_number(self, digits, international):
+        """Strip international and trunk prefixes, returning the national significant number"""
+        if digits.startswith("00"):
+            digits = digits[2:]
+            international = True
+
+        if international:
+            if not digits.startswith(COUNTRY_CODE):
+                return None
+            digits = digits[len(COUNTRY_CODE):]
+            # "+91 (0) 80 ..." style numbers keep the trunk zero
+            if len(digits) == 11 and digits[0] == "0":
+                digits = digits[1:]
+            return digits
+
+        if digits.startswith(TOLL_FREE_PREFIXES):
+            return digits
+        if len(digits) == 12 and digits.startswith(COUNTRY_CODE):
+            return digits[len(COUNTRY_CODE):]
+        if len(digits) == 11 and digits[0] == "0":
+            return digits[1:]
+        return digits
+
+    def _is_placeholder(self, number):
+        """Spot repeated-digit and sequential filler numbers"""
+        return (len(set(number)) < 3 or number in _SEQUENTIAL_RUNS
+                or number.endswith(_TRAILING_ZEROS))
+
+    def classify(self, raw):
+        """
+        Normalize a single raw phone string.
+        Returns (e164, kind) where kind is 'mobile', 'landline' or 'toll_free',
+        or (None, None) if the value is not a possible Indian number.
+        """
+        if raw is None:
+            return None, None
+
+        collected = self._collect_digits(str(raw))
+        if not collected:
+            return None, None
+        digits, has_plus = collected
+        if len(digits) < 10:
+            return None, None
+
+        number = self._national_number(digits, has_plus)
+        if not number or number[0] == "0":
+            return None, None
+
+        # Toll-free numbers are 10 or 11 digits long, everything else exactly 10
+        if number.startswith(TOLL_FREE_PREFIXES):
+            if len(number) in (10, 11) and not self._is_placeholder(number[4:]):
+                return f"+{COUNTRY_CODE}{number}", "toll_free"
+            return None, None
+
+        if len(number) != 10 or self._is_placeholder(number):
+            return None, None
+
+        # Longest prefix first; fall back to shorter prefixes when a match doesn't validate
+        for length in self.prefix_lengths:
+            entry = self.prefix_index.get(number[:length])
+            if entry is None:
+                continue
+
+            kind, label = entry
+            if kind == "invalid":
+                return None, None
+            if kind == "landline" and label is not None:
+                # Known STD code: the subscriber number must look like a landline
+                if number[length] not in LANDLINE_SUBSCRIBER_DIGITS:
+                    continue
+            if kind in ("mobile", "landline"):
+                return f"+{COUNTRY_CODE}{number}", kind
+
+        return None, None
+
+    def normalize(self, raw):
+        """Return the E.164 form of a raw phone string, or None if it is not a valid number"""
+        return self.classify(raw)[0]
+
+    def normalize_batch(self, values):
+        """Normalize many values at once, returning a list aligned with the input (None for rejects)"""
+        cache = {}
+        results = []
+        for value in values:
+            key = str(value) if value is not None else None
+            if key not in cache:
+                cache[key] = self.normalize(key)
+            results.append(cache[key])
+        return results
+
+    def extract(self, text, deadline=None):
+        """
+        Find every valid phone number in free text (or raw page bytes in an
+        ASCII-compatible encoding), deduplicated in order of appearance
+        """
+        phones = []
+        seen = set()
+        binary = isinstance(text, bytes)
+        pattern = self.candidate_bytes_pattern if binary else self.candidate_pattern
+        for match in iter_matches(pattern, text, deadline):
+            candidate = match.group(0)
+            for phone in self._split_candidate(candidate.decode("ascii") if binary else candidate):
+                if phone not in seen:
+                    seen.add(phone)
+                    phones.append(phone)
+        return phones
+
+    def _split_candidate(self, candidate):
+        """
+        The phone numbers in a matched digit run, split at group boundaries:
+        "98450 12345 98450 12346" is two numbers, and in "2023-10-19 98450 12345"
+        the date's groups are dropped. Each number is the fewest groups from
+        its start that validate. A landline with no known STD code is only
+        accepted when no group was dropped before it, since leftover digits
+        would otherwise pass as one.
+        """
+        groups = [(match.start(), match.end()) for match in _DIGIT_GROUP_PATTERN.finditer(candidate)]
+        phones = []
+        dropped = False
+        start = 0
+        while start < len(groups):
+            found = None
+            digits = 0
+            for end in range(start, len(groups)):
+                digits += groups[end][1] - groups[end][0]
+                if digits > 16:
+                    break
+                span = candidate[groups[start][0]:groups[end][1]]
+                if _DATE_PREFIX_PATTERN.match(span):
+                    continue
+                phone, kind = self.classify(span)
+                if phone and not (dropped and kind == "landline" and self._generic_landline(phone)):
+                    found = end
+                    break
+            if found is None:
+                dropped = True
+                start += 1
+            else:
+                phones.append(phone)
+                start = found + 1
+        return phones
+
+    def _generic_landline(self, phone):
+        """Whether a normalized landline matched only a generic area digit, not a listed STD code"""
+        number = phone[len(COUNTRY_CODE) + 1:]
+        return not any(self.prefix_index.get(number[:length], ("", None))[1] is not None
+                       for length in self.prefix_lengths)
+
+
+def normalize_phone_column(rows, column="phone", normalizer=None, missing="Not found"):
+    """
+    Normalize the phone column of a list of CSV row dicts in place.
+    Values that can't be normalized are replaced with the missing marker.
+    Returns the number of rows whose value changed.
+    """
+    normalizer = normalizer or PhoneNormalizer()
+    present = [row for row in rows if row.get(column) and row[column] != missing]
+    normalized = normalizer.normalize_batch(row[column] for row in present)
+
+    changed = 0
+    for row, phone in zip(present, normalized):
+        value = phone or missing
+        if value != row[column]:
+            row[column] = value
+            changed += 1
+    return changed
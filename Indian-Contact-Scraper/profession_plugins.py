@@ -0,0 +1,194 @@
+import re
+
+from regex_backend import compile_pattern, iter_matches, search
+
+# Profession name or alias (lowercase) -> plugin class
+PROFESSION_PLUGINS = {}
+
+# Shared by every profession: "12+ years of experience"
+EXPERIENCE_PATTERN = r"([0-9]{1,2})\+?\s+years\s+(?:of\s+)?experience"
+
+
+def register_profession(plugin_class):
+    """Class decorator that makes a plugin available under its name and aliases"""
+    for alias in (plugin_class.name,) + tuple(plugin_class.aliases):
+        PROFESSION_PLUGINS[alias.lower()] = plugin_class
+    return plugin_class
+
+
+def get_profession_plugin(profession):
+    """Return the plugin instance for a profession, or None if it has no specific extractor"""
+    if not profession:
+        return None
+    plugin_class = PROFESSION_PLUGINS.get(profession.strip().lower())
+    return plugin_class() if plugin_class else None
+
+
+class ProfessionPlugin:
+    """
+    Base class for profession-specific extraction. Subclasses declare their
+    CSV fields, regex patterns and extra search queries; patterns are compiled
+    on first use and cached on the subclass.
+    """
+
+    name = None
+    aliases = ()
+
+    # Extra CSV columns, in output order
+    fields = ()
+
+    # Field -> regex; the first group (or the whole match) becomes the value
+    patterns = {}
+    pattern_flags = {}
+
+    # Extra search query templates, with {city} and {state} placeholders
+    extra_queries = ()
+
+    @classmethod
+    def compiled_patterns(cls):
+        """Compile this profession's patterns once per process"""
+        compiled = cls.__dict__.get("_compiled")
+        if compiled is None:
+            compiled = {
+                field: compile_pattern(pattern, cls.pattern_flags.get(field, 0))
+                for field, pattern in cls.patterns.items()
+            }
+            cls._compiled = compiled
+        return compiled
+
+    def empty_result(self):
+        """A result with every field marked as not found"""
+        return {field: "Not found" for field in self.fields}
+
+    def first_match(self, field, text, deadline=None):
+        """Return the first match object for a field's pattern, or None"""
+        pattern = self.compiled_patterns().get(field)
+        return search(pattern, text, deadline) if pattern else None
+
+    def match_value(self, match):
+        """The captured value of a match, falling back to the whole match"""
+        value = match.group(1) if match.groups() else match.group(0)
+        return value.strip()
+
+    def extract(self, text, deadline=None):
+        """Extract this profession's fields from page text"""
+        results = self.empty_result()
+        for field in self.compiled_patterns():
+            match = self.first_match(field, text, deadline)
+            if match:
+                results[field] = self.match_value(match)
+
+        if "experience" in results and results["experience"] != "Not found":
+            results["experience"] = f"{results['experience']} years"
+        return results
+
+
+@register_profession
+class DoctorPlugin(ProfessionPlugin):
+    name = "doctor"
+    aliases = ("physician",)
+
+    fields = ("designation", "qualification", "specialization",
+              "clinic_hospital", "address", "experience")
+
+    patterns = {
+        "designation": r"(?:Dr\.|Prof\.|Doctor|Professor|MD|MBBS|MS|MDS|DM|DNB|MCh)[,\s]+(?:[A-Z][a-zA-Z\s\.]{0,60})",
+        "qualification": r"\b(?:MBBS|MD|MS|DNB|DM|MCh|BDS|MDS|DO|DCH|DTCD|FRCS|MRCP)(?:\([A-Za-z]+\))?",
+        "specialization": r"(?:Specialist|Speciality|Specialization)[\s\:]+([A-Za-z\s\&]{1,80})",
+        "experience": EXPERIENCE_PATTERN,
+        "address": r"(?:Address|Location|Clinic)[\s\:]+([A-Za-z0-9\s\,\-\#\.\(\)]{3,200})(?:[\n\.\,]|Phone)",
+    }
+    pattern_flags = {"experience": re.IGNORECASE, "address": re.IGNORECASE}
+
+    extra_queries = (
+        "medical practitioners in {city} {state} contact details",
+        "specialist doctors in {city} {state}",
+        "hospitals in {city} {state} doctors contact",
+        "clinics in {city} {state} doctor information",
+    )
+
+    def extract(self, text, deadline=None):
+        """Extract doctor-specific information from page text"""
+        results = super().extract(text, deadline)
+
+        # All distinct qualifications, in order of appearance
+        qualifications = []
+        for match in iter_matches(self.compiled_patterns()["qualification"], text, deadline):
+            if match.group(0) not in qualifications:
+                qualifications.append(match.group(0))
+        if qualifications:
+            results["qualification"] = ", ".join(qualifications)
+
+        # The clinic/hospital name is usually the line right above the address.
+        # Walk back from the match offset instead of re-splitting the page.
+        address_match = self.first_match("address", text, deadline)
+        if address_match:
+            line_start = text.rfind("\n", 0, address_match.start())
+            if line_start > 0:
+                previous_start = text.rfind("\n", 0, line_start) + 1
+                potential_clinic = text[previous_start:line_start].strip()
+                if 3 <= len(potential_clinic) <= 50:  # Reasonable clinic name length
+                    results["clinic_hospital"] = potential_clinic
+
+        return results
+
+
+@register_profession
+class LawyerPlugin(ProfessionPlugin):
+    name = "lawyer"
+    aliases = ("advocate", "attorney", "legal advisor")
+
+    fields = ("practice_area", "court", "bar_enrollment", "experience")
+
+    patterns = {
+        "practice_area": r"(?:Practice Areas?|Areas? of Practice|Specialis(?:es|ing) in)[\s\:]+([A-Za-z ,&\-]{3,100})",
+        "court": r"((?:Supreme|High|District|Sessions|Family|Consumer) Court(?: of [A-Z][a-z]+)?)",
+        "bar_enrollment": r"(?:Enrol(?:l)?ment|Bar Council)\s*(?:No\.?|Number)?[\s\:]*([A-Z]{1,4}\/[0-9]{1,6}\/[0-9]{2,4})",
+        "experience": EXPERIENCE_PATTERN,
+    }
+    pattern_flags = {"experience": re.IGNORECASE, "practice_area": re.IGNORECASE}
+
+
+@register_profession
+class EngineerPlugin(ProfessionPlugin):
+    name = "engineer"
+    aliases = ("software engineer", "civil engineer")
+
+    fields = ("discipline", "qualification", "experience")
+
+    patterns = {
+        "discipline": r"\b(Civil|Mechanical|Electrical|Electronics|Computer|Chemical|Structural|Software) Engineer(?:ing)?",
+        "qualification": r"\b(B\.\s?Tech|M\.\s?Tech|B\.\s?E\.|M\.\s?E\.|BTech|MTech|Ph\.\s?D)",
+        "experience": EXPERIENCE_PATTERN,
+    }
+    pattern_flags = {"experience": re.IGNORECASE}
+
+
+@register_profession
+class CharteredAccountantPlugin(ProfessionPlugin):
+    name = "chartered accountant"
+    aliases = ("ca", "accountant")
+
+    fields = ("membership_number", "firm_registration", "services", "experience")
+
+    patterns = {
+        "membership_number": r"(?:Membership|M\.\s?No)\.?\s*(?:No\.?|Number)?[\s\:]*([0-9]{6})\b",
+        "firm_registration": r"\bFRN[\s\:\.]*([0-9]{6}[A-Z]?)\b",
+        "services": r"(?:Services|Expertise)[\s\:]+((?:Audit|Tax(?:ation)?|GST|Accounting|Assurance|Advisory)[A-Za-z ,&]{0,100})",
+        "experience": EXPERIENCE_PATTERN,
+    }
+    pattern_flags = {"experience": re.IGNORECASE}
+
+
+@register_profession
+class ConsultantPlugin(ProfessionPlugin):
+    name = "consultant"
+    aliases = ("consultancy", "advisor")
+
+    fields = ("consulting_area", "experience")
+
+    patterns = {
+        "consulting_area": r"(?:Consult(?:ing|ancy) (?:in|for|on)|Expertise in)[\s\:]+([A-Za-z ,&\-]{3,100})",
+        "experience": EXPERIENCE_PATTERN,
+    }
+    pattern_flags = {"experience": re.IGNORECASE, "consulting_area": re.IGNORECASE}
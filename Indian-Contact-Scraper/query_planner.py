@@ -0,0 +1,103 @@
+import threading
+
+from storage import DEFAULT_DB_PATH, open_database
+
+# Scope used for statistics aggregated over every city and profession
+GLOBAL_SCOPE = "*"
+
+
+def query_scope(city, profession):
+    """Statistics scope for a city/profession pair"""
+    return f"{city.strip().casefold()}|{profession.strip().casefold()}"
+
+
+class QueryPlanner:
+    """
+    Order search query templates by their historical contacts-per-request and
+    stop low-yield queries early, within an optional total request budget
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, request_budget=None, min_yield=0.05,
+                 min_pages=1, prior_requests=5, prior_yield=0.5):
+        self.request_budget = request_budget
+        self.min_yield = min_yield
+        self.min_pages = min_pages
+
+        # Templates without history start from this optimistic prior
+        self.prior_requests = prior_requests
+        self.prior_yield = prior_yield
+
+        self.requests_used = 0
+        self.lock = threading.Lock()
+        self.connection = open_database(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS query_yield ("
+            " template TEXT NOT NULL,"
+            " scope TEXT NOT NULL,"
+            " requests INTEGER NOT NULL DEFAULT 0,"
+            " contacts INTEGER NOT NULL DEFAULT 0,"
+            " PRIMARY KEY (template, scope))"
+        )
+        self.connection.commit()
+
+    def _stats(self, template, scope):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT requests, contacts FROM query_yield WHERE template = ? AND scope = ?",
+                (template, scope)
+            ).fetchone()
+        return row or (0, 0)
+
+    def expected_yield(self, template, scope):
+        """Smoothed contacts-per-request estimate for a template in a scope"""
+        requests, contacts = self._stats(template, scope)
+        global_requests, global_contacts = self._stats(template, GLOBAL_SCOPE)
+
+        # The template's record elsewhere acts as the prior for this city/profession
+        if global_requests:
+            prior = global_contacts / global_requests
+        else:
+            prior = self.prior_yield
+        return (contacts + prior * self.prior_requests) / (requests + self.prior_requests)
+
+    def order(self, templates, scope):
+        """Sort templates by expected yield, best first; ties keep their original order"""
+        ranked = sorted(enumerate(templates),
+                        key=lambda item: (-self.expected_yield(item[1], scope), item[0]))
+        return [template for _, template in ranked]
+
+    def has_budget(self):
+        """Whether the run may still make requests"""
+        return self.request_budget is None or self.requests_used < self.request_budget
+
+    def note_requests(self, count=1):
+        """Count requests made by the run against the budget"""
+        self.requests_used += count
+
+    def should_continue(self, template, scope, pages_done, requests, contacts):
+        """
+        Decide whether to fetch another results page for a query, given the
+        pages, requests and contacts it has produced so far in this run
+        """
+        if not self.has_budget():
+            return False
+        if pages_done < self.min_pages or requests == 0:
+            return True
+
+        # Stop only when both this run and the history say the query is poor
+        run_yield = contacts / requests
+        return run_yield >= self.min_yield or self.expected_yield(template, scope) >= self.min_yield
+
+    def record(self, template, scope, requests, contacts):
+        """Add a query's requests and contacts to its scope and global statistics"""
+        if not requests:
+            return
+        with self.lock:
+            for row_scope in (scope, GLOBAL_SCOPE):
+                self.connection.execute(
+                    "INSERT INTO query_yield (template, scope, requests, contacts) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (template, scope) DO UPDATE SET "
+                    "requests = requests + excluded.requests, contacts = contacts + excluded.contacts",
+                    (template, row_scope, requests, contacts)
+                )
+            self.connection.commit()
@@ -0,0 +1,109 @@
+import re
+import time
+
+# RE2 matches in linear time, so no page can make an extractor backtrack for seconds.
+# It's optional: without it (or for patterns it can't handle) we use the re module.
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+BACKEND = "re2" if re2 is not None else "re"
+
+# Inline equivalents of re flags, since RE2 bindings don't all accept re's flag values
+_INLINE_FLAGS = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"))
+
+# Long pages are scanned in windows so the deadline is checked between them even
+# where nothing matches (and after every match). The overlap must be longer than
+# any single match we expect.
+SCAN_WINDOW = 8192
+SCAN_OVERLAP = 512
+
+
+def compile_pattern(pattern, flags=0):
+    """Compile a pattern with RE2 when available and supported, otherwise with re"""
+    if re2 is not None:
+        inline = "".join(letter for flag, letter in _INLINE_FLAGS if flags & flag)
+        try:
+            return re2.compile(f"(?{inline}){pattern}" if inline else pattern)
+        except Exception:
+            # Lookbehind, backreferences and the like aren't supported by RE2
+            pass
+    return re.compile(pattern, flags)
+
+
+class ExtractionTimeout(Exception):
+    """Raised when a page's extraction budget runs out mid-extractor"""
+
+
+class ExtractionDeadline:
+    """
+    Time budget shared by all extractors running on one page (None means
+    unlimited). With a cancel_token the budget never runs past the end of
+    the run, and check() also stops on cancellation.
+    """
+
+    def __init__(self, budget=None, cancel_token=None):
+        self.cancel_token = cancel_token
+        remaining = cancel_token.remaining() if cancel_token else None
+        if remaining is not None:
+            budget = remaining if budget is None else min(budget, remaining)
+        self.budget = budget
+        self.started = time.monotonic()
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def expired(self):
+        return self.budget is not None and self.elapsed() > self.budget
+
+    def check(self):
+        """Raise ExtractionTimeout if the budget is used up (Cancelled if the run was stopped)"""
+        if self.cancel_token:
+            self.cancel_token.check()
+        if self.expired():
+            raise ExtractionTimeout(f"extraction budget of {self.budget}s exceeded")
+
+
+def iter_matches(pattern, text, deadline=None, window=SCAN_WINDOW, overlap=SCAN_OVERLAP):
+    """
+    finditer over text one window at a time, checking the deadline between
+    windows and after each match. Match positions are relative to the whole text.
+    """
+    length = len(text)
+    start = 0
+    last_end = 0
+    while start < length or start == 0:
+        if deadline is not None:
+            deadline.check()
+        end = min(start + window + overlap, length)
+        for match in pattern.finditer(text, start, end):
+            # Matches starting in the overlap belong to the next window
+            if match.start() >= start + window and end < length:
+                break
+            if match.start() < last_end:
+                continue
+            last_end = max(match.end(), match.start() + 1)
+            yield match
+            if deadline is not None:
+                deadline.check()
+        start += window
+        if start >= length:
+            break
+
+
+def search(pattern, text, deadline=None):
+    """First match of a pattern in text, or None"""
+    return next(iter_matches(pattern, text, deadline), None)
+
+
+def findall(pattern, text, deadline=None):
+    """Like re.findall, scanning in windows under an optional deadline"""
+    results = []
+    for match in iter_matches(pattern, text, deadline):
+        groups = match.groups()
+        if not groups:
+            results.append(match.group(0))
+        else:
+            results.append(groups[0] if len(groups) == 1 else groups)
+    return results
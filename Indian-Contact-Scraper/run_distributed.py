@@ -0,0 +1,116 @@
+from distributed import Coordinator, Worker
+from work_queue import open_queue, DEFAULT_QUEUE_PATH
+from indian_contact_scraper import IndianContactScraper
+from search_cache import SearchResultsCache
+from domain_stats import DomainStatsStore
+from http_fetcher import HttpFetcher
+from dns_cache import DnsCache
+import argparse
+import os
+
+def default_output_file(args):
+    """Same default location as run_scraper.py"""
+    if args.output:
+        return args.output
+    if not os.path.exists("output"):
+        os.makedirs("output")
+    return os.path.join("output", f"{args.state}_{args.city}_{args.profession}_contacts.csv")
+
+def run_coordinator(args):
+    queue = open_queue(args.queue)
+    coordinator = Coordinator(queue, args.state, args.city, args.profession,
+                              output_file=default_output_file(args))
+    coordinator.seed(pages_per_query=args.pages)
+
+    if args.no_wait:
+        print("Tasks queued; run 'collect' once the workers are done")
+        return
+
+    try:
+        coordinator.wait(poll_interval=args.poll)
+    except KeyboardInterrupt:
+        print("\nStopped waiting. Saving the contacts collected so far...")
+    count = coordinator.collect()
+    print(f"Collected {count} contacts for {args.profession}s in {args.city}, {args.state}")
+
+def run_collect(args):
+    queue = open_queue(args.queue)
+    coordinator = Coordinator(queue, args.state, args.city, args.profession,
+                              output_file=default_output_file(args))
+    count = coordinator.collect()
+    print(f"Collected {count} contacts for {args.profession}s in {args.city}, {args.state}")
+
+def run_worker(args):
+    queue = open_queue(args.queue)
+
+    # Caches and statistics are per node; dedup and politeness are shared through the queue
+    search_cache = None if args.no_cache else SearchResultsCache()
+    domain_stats = None if args.no_domain_ranking else DomainStatsStore()
+    fetcher = HttpFetcher(dns_cache=DnsCache())
+
+    def scraper_factory(state, city, profession):
+        return IndianContactScraper(
+            state=state,
+            city=city,
+            profession=profession,
+            search_cache=search_cache,
+            domain_stats=domain_stats,
+            fetcher=fetcher
+        )
+
+    worker = Worker(queue, scraper_factory, worker_id=args.worker_id,
+                    host_interval=args.host_interval, search_interval=args.search_interval)
+    try:
+        worker.run(idle_timeout=None if args.idle_timeout == 0 else args.idle_timeout)
+    except KeyboardInterrupt:
+        # Any task this worker held is picked up by another worker when its lease runs out
+        print("\nWorker stopped by user")
+    finally:
+        fetcher.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Distributed contact scraping over a shared work queue')
+    parser.add_argument('--queue', default=DEFAULT_QUEUE_PATH,
+                        help=f'SQLite queue file or redis:// URL shared by all nodes (default: {DEFAULT_QUEUE_PATH})')
+    subparsers = parser.add_subparsers(dest='command')
+
+    coordinator = subparsers.add_parser('coordinator', help='Queue the searches for a run and collect the results')
+    coordinator.add_argument('--state', required=True, help='State in India (e.g. Maharashtra)')
+    coordinator.add_argument('--city', required=True, help='City name (e.g. Mumbai)')
+    coordinator.add_argument('--profession', required=True, help='Profession to search for (e.g. doctor)')
+    coordinator.add_argument('--output', help='Output CSV filename (optional)')
+    coordinator.add_argument('--pages', type=int, default=3, help='Search result pages per query (default: 3)')
+    coordinator.add_argument('--poll', type=float, default=10.0, help='Seconds between progress checks (default: 10)')
+    coordinator.add_argument('--no-wait', action='store_true', help='Queue the searches and exit without waiting')
+
+    collect = subparsers.add_parser('collect', help='Write the contacts collected so far for a run to CSV')
+    collect.add_argument('--state', required=True)
+    collect.add_argument('--city', required=True)
+    collect.add_argument('--profession', required=True)
+    collect.add_argument('--output', help='Output CSV filename (optional)')
+
+    worker = subparsers.add_parser('worker', help='Claim and process tasks from the queue')
+    worker.add_argument('--worker-id', help='Name for this worker in logs and leases (default: host-pid)')
+    worker.add_argument('--idle-timeout', type=float, default=60.0,
+                        help='Exit after the queue has been empty this many seconds (0 to run forever)')
+    worker.add_argument('--host-interval', type=float, default=2.0,
+                        help='Minimum seconds between requests to the same site across all workers (default: 2)')
+    worker.add_argument('--search-interval', type=float, default=8.0,
+                        help='Minimum seconds between search requests across all workers (default: 8)')
+    worker.add_argument('--no-cache', action='store_true', help='Always fetch search results from the network')
+    worker.add_argument('--no-domain-ranking', action='store_true',
+                        help='Visit results in search order instead of ranking domains by past yield')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'coordinator':
+        run_coordinator(args)
+    elif args.command == 'collect':
+        run_collect(args)
+    elif args.command == 'worker':
+        run_worker(args)
+    else:
+        parser.print_help()
+
+if __name__ == "__main__":
+    main()
@@ -1,136 +1,205 @@
-from indian_contact_scraper import IndianContactScraper
-import argparse
-import os
-import time
-import csv
-
-def validate_csv_file(file_path):
-    """Check if a CSV file has proper phone number formatting"""
-    if not os.path.exists(file_path):
-        print(f"File not found: {file_path}")
-        return False
-        
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                # Check phone number format
-                if 'phone' in row and row['phone'] != 'Not found':
-                    phone = row['phone']
-                    if 'E+' in phone:  # Scientific notation detected
-                        print(f"❌ Scientific notation found in phone number: {phone}")
-                        return False
-        print(f"✅ CSV validation passed: {file_path}")
-        return True
-    except Exception as e:
-        print(f"Error validating CSV: {e}")
-        return False
-
-def fix_csv_phone_numbers(file_path):
-    """Fix any phone numbers in scientific notation in an existing CSV file"""
-    if not os.path.exists(file_path):
-        print(f"File not found: {file_path}")
-        return False
-        
-    try:
-        # Read the existing data
-        rows = []
-        with open(file_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            fieldnames = reader.fieldnames
-            for row in reader:
-                # Fix phone number format if in scientific notation
-                if 'phone' in row and row['phone'] != 'Not found':
-                    phone = row['phone']
-                    if 'E+' in phone:
-                        # Convert from scientific notation to full number string
-                        try:
-                            phone_float = float(phone)
-                            phone = f"+{int(phone_float)}"
-                            row['phone'] = phone
-                        except Exception as e:
-                            print(f"Error converting phone: {phone} - {e}")
-                rows.append(row)
-                
-        # Write the fixed data back
-        if rows:
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                for row in rows:
-                    writer.writerow(row)
-            print(f"✅ Fixed phone numbers in: {file_path}")
-            return True
-    except Exception as e:
-        print(f"Error fixing CSV: {e}")
-    return False
-
-def main():
-    parser = argparse.ArgumentParser(description='Enhanced scraper for Indian professional contact information')
-    parser.add_argument('--state', required=True, help='State in India (e.g. Maharashtra)')
-    parser.add_argument('--city', required=True, help='City name (e.g. Mumbai)')
-    parser.add_argument('--profession', required=True, help='Profession to search for (e.g. doctor, teacher)')
-    parser.add_argument('--output', help='Output CSV filename (optional)')
-    parser.add_argument('--pages', type=int, default=0, help='Maximum number of search pages to process (0 for unlimited)')
-    parser.add_argument('--fix', action='store_true', help='Fix an existing CSV file with scientific notation')
-    parser.add_argument('--debug', action='store_true', help='Enable debug mode for more verbose output')
-    
-    args = parser.parse_args()
-    
-    # Create output directory if needed
-    output_dir = "output"
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-    
-    # Generate default output file if not provided
-    output_file = args.output
-    if not output_file:
-        output_file = os.path.join(output_dir, f"{args.state}_{args.city}_{args.profession}_contacts.csv")
-    
-    # If --fix is specified, just fix an existing file
-    if args.fix:
-        fix_csv_phone_numbers(output_file)
-        return
-    
-    print(f"Starting contact information scraping for {args.profession}s in {args.city}, {args.state}")
-    print(f"Results will be saved to: {output_file}")
-    
-    # Create and run scraper
-    start_time = time.time()
-    scraper = IndianContactScraper(
-        state=args.state,
-        city=args.city,
-        profession=args.profession,
-        output_file=output_file
-    )
-    
-    # Enable debug mode if requested
-    if args.debug:
-        scraper.debug = True
-        print("Debug mode enabled: You'll see more detailed information during scraping")
-    
-    try:
-        # Convert pages=0 to None for unlimited scraping
-        max_pages = None if args.pages == 0 else args.pages
-        print(f"Search page limit: {'Unlimited' if max_pages is None else max_pages}")
-        
-        num_contacts = scraper.scrape(max_pages=max_pages)
-        scraper.save_to_csv()
-        
-        elapsed_time = time.time() - start_time
-        print(f"\nScraping completed in {elapsed_time:.2f} seconds")
-        print(f"Found {num_contacts} contacts for {args.profession}s in {args.city}, {args.state}")
-        
-        # Validate the output file
-        validate_csv_file(output_file)
-        
-    except KeyboardInterrupt:
-        print("\nScraping interrupted by user. Saving current results...")
-        scraper.save_to_csv()
-    except Exception as e:
-        print(f"\nError during scraping: {e}")
-        print("Attempting to save any results collected so far...")
-        scraper.save_to_csv()
-
-if __name__ == "__main__":
-    main()
+from indian_contact_scraper import IndianContactScraper
+from search_cache import SearchResultsCache
+from query_planner import QueryPlanner
+from domain_stats import DomainStatsStore
+from site_crawler import SiteCrawler
+from http_fetcher import HttpFetcher
+from dns_cache import DnsCache
+from incremental import IncrementalStore
+from page_archive import PageArchive
+from cancellation import CancellationToken, install_interrupt_handler
+import argparse
+import os
+import time
+import csv
+
+def validate_csv_file(file_path):
+    """Check if a CSV file has proper phone number formatting"""
+    if not os.path.exists(file_path):
+        print(f"File not found: {file_path}")
+        return False
+        
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                # Check phone number format
+                if 'phone' in row and row['phone'] != 'Not found':
+                    phone = row['phone']
+                    if 'E+' in phone:  # Scientific notation detected
+                        print(f"❌ Scientific notation found in phone number: {phone}")
+                        return False
+        print(f"✅ CSV validation passed: {file_path}")
+        return True
+    except Exception as e:
+        print(f"Error validating CSV: {e}")
+        return False
+
+def fix_csv_phone_numbers(file_path):
+    """Fix any phone numbers in scientific notation in an existing CSV file"""
+    if not os.path.exists(file_path):
+        print(f"File not found: {file_path}")
+        return False
+        
+    try:
+        # Read the existing data
+        rows = []
+        with open(file_path, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            fieldnames = reader.fieldnames
+            for row in reader:
+                # Fix phone number format if in scientific notation
+                if 'phone' in row and row['phone'] != 'Not found':
+                    phone = row['phone']
+                    if 'E+' in phone:
+                        # Convert from scientific notation to full number string
+                        try:
+                            phone_float = float(phone)
+                            phone = f"+{int(phone_float)}"
+                            row['phone'] = phone
+                        except Exception as e:
+                            print(f"Error converting phone: {phone} - {e}")
+                rows.append(row)
+                
+        # Write the fixed data back
+        if rows:
+            with open(file_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer.writeheader()
+                for row in rows:
+                    writer.writerow(row)
+            print(f"✅ Fixed phone numbers in: {file_path}")
+            return True
+    except Exception as e:
+        print(f"Error fixing CSV: {e}")
+    return False
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Enhanced scraper for Indian professional contact information')
+    parser.add_argument('--state', required=True, help='State in India (e.g. Maharashtra)')
+    parser.add_argument('--city', required=True, help='City name (e.g. Mumbai)')
+    parser.add_argument('--profession', required=True, help='Profession to search for (e.g. doctor, teacher)')
+    parser.add_argument('--output', help='Output CSV filename (optional)')
+    parser.add_argument('--pages', type=int, default=0, help='Maximum number of search pages to process (0 for unlimited)')
+    parser.add_argument('--fix', action='store_true', help='Fix an existing CSV file with scientific notation')
+    parser.add_argument('--debug', action='store_true', help='Enable debug mode for more verbose output')
+    parser.add_argument('--cache-ttl', type=float, default=168,
+                        help='Reuse cached search results younger than this many hours (default: 168)')
+    parser.add_argument('--no-cache', action='store_true', help='Always fetch search results from the network')
+    parser.add_argument('--request-budget', type=int, default=None,
+                        help='Maximum number of search and page requests for the whole run')
+    parser.add_argument('--no-planner', action='store_true',
+                        help='Run every query in fixed order instead of ordering by past yield')
+    parser.add_argument('--no-domain-ranking', action='store_true',
+                        help='Visit results in search order instead of ranking domains by past yield')
+    parser.add_argument('--crawl-depth', type=int, default=0,
+                        help='Follow contact/about/team links this many levels deep on each site (default: 0, off)')
+    parser.add_argument('--crawl-pages', type=int, default=3,
+                        help='Maximum extra pages to crawl per site (default: 3)')
+    parser.add_argument('--extraction-budget', type=float, default=5.0,
+                        help='Seconds the extractors may spend on one page before giving up (default: 5)')
+    parser.add_argument('--fetch-deadline', type=float, default=45.0,
+                        help='Maximum seconds for a single page download, body and retries included (default: 45)')
+    parser.add_argument('--no-dns-cache', action='store_true',
+                        help='Resolve every request through the system resolver instead of caching')
+    parser.add_argument('--http2', action='store_true',
+                        help='Fetch over HTTP/2 where servers support it (needs httpx[http2])')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only re-extract pages that changed since the last run and write new/changed/vanished CSVs')
+    parser.add_argument('--archive', metavar='DIR',
+                        help='Also save every fetched page to compressed WARC files in DIR for later re-extraction')
+    parser.add_argument('--time-limit', type=float, default=0,
+                        help='Stop after this many seconds and save what was found (default: 0, no limit)')
+    
+    args = parser.parse_args(argv)
+    
+    # Create output directory if needed
+    output_dir = "output"
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    
+    # Generate default output file if not provided
+    output_file = args.output
+    if not output_file:
+        output_file = os.path.join(output_dir, f"{args.state}_{args.city}_{args.profession}_contacts.csv")
+    
+    # If --fix is specified, just fix an existing file
+    if args.fix:
+        fix_csv_phone_numbers(output_file)
+        return
+    
+    print(f"Starting contact information scraping for {args.profession}s in {args.city}, {args.state}")
+    print(f"Results will be saved to: {output_file}")
+    
+    # Search results are shared across runs unless disabled
+    search_cache = None if args.no_cache else SearchResultsCache(ttl=args.cache_ttl * 3600)
+    
+    # Queries are ordered (and low-yield ones cut short) using past runs' statistics
+    query_planner = None if args.no_planner else QueryPlanner(request_budget=args.request_budget)
+    domain_stats = None if args.no_domain_ranking else DomainStatsStore()
+    
+    # Optionally follow each result site's contact/about/team pages
+    site_crawler = None
+    if args.crawl_depth > 0:
+        site_crawler = SiteCrawler(max_depth=args.crawl_depth, max_pages=args.crawl_pages)
+    
+    # Create and run scraper
+    start_time = time.time()
+    scraper = IndianContactScraper(
+        state=args.state,
+        city=args.city,
+        profession=args.profession,
+        output_file=output_file,
+        search_cache=search_cache,
+        query_planner=query_planner,
+        domain_stats=domain_stats,
+        site_crawler=site_crawler,
+        extraction_budget=args.extraction_budget,
+        fetcher=HttpFetcher(total_timeout=args.fetch_deadline,
+                            dns_cache=None if args.no_dns_cache else DnsCache(),
+                            http2=args.http2),
+        incremental=IncrementalStore() if args.incremental else None,
+        archive=PageArchive(args.archive) if args.archive else None,
+        debug=args.debug
+    )
+    
+    if args.debug:
+        print("Debug mode enabled: You'll see more detailed information during scraping")
+    
+    try:
+        # Convert pages=0 to None for unlimited scraping
+        max_pages = None if args.pages == 0 else args.pages
+        print(f"Search page limit: {'Unlimited' if max_pages is None else max_pages}")
+        
+        # Ctrl-C or the time limit stops the run between steps; results found so far are saved
+        cancel_token = CancellationToken(timeout=args.time_limit or None)
+        restore_interrupt = install_interrupt_handler(cancel_token)
+        if args.time_limit:
+            print(f"Time limit: {args.time_limit:g} seconds")
+        
+        try:
+            num_contacts = scraper.scrape(max_pages=max_pages, cancel_token=cancel_token)
+        finally:
+            # From here Ctrl-C interrupts as usual instead of cancelling a finished run
+            restore_interrupt()
+        scraper.save_to_csv()
+        
+        elapsed_time = time.time() - start_time
+        print(f"\nScraping completed in {elapsed_time:.2f} seconds")
+        print(f"Found {num_contacts} contacts for {args.profession}s in {args.city}, {args.state}")
+        
+        # Validate the output file
+        validate_csv_file(output_file)
+        
+    except KeyboardInterrupt:
+        print("\nScraping interrupted by user. Saving current results...")
+        scraper.save_to_csv()
+    except Exception as e:
+        print(f"\nError during scraping: {e}")
+        print("Attempting to save any results collected so far...")
+        scraper.save_to_csv()
+    finally:
+        scraper.fetcher.close()
+
+if __name__ == "__main__":
+    main()
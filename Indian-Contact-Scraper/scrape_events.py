@@ -0,0 +1,73 @@
+import threading
+import time
+from collections import namedtuple
+
+# Event kinds reported while a scrape runs
+QUERY_STARTED = "query_started"
+SEARCH_PAGE_FETCHED = "search_page_fetched"
+PAGE_FETCHED = "page_fetched"
+CONTACT_FOUND = "contact_found"
+STATS = "stats"
+FINISHED = "finished"
+
+# Always delivered as they happen; everything else may be coalesced
+MILESTONES = (QUERY_STARTED, FINISHED)
+
+# Minimum seconds between deliveries of the frequent events
+DEFAULT_INTERVAL = 0.5
+
+ScrapeEvent = namedtuple("ScrapeEvent", ["kind", "time", "data"])
+
+
+class ThrottledObserver:
+    """
+    Delivers scrape events to a callback at a bounded rate, so a consumer that
+    is slow per call (a UI redrawing on every contact) runs a few times a
+    second rather than once per event. Milestones always get through; the
+    frequent events are delivered at most once per interval, with newer
+    events of a kind replacing undelivered older ones. Counts in the events
+    are cumulative, so a coalesced event loses nothing but detail; contacts
+    aren't, so every delivered CONTACT_FOUND lists all contacts found since
+    the previous one in data["contacts_found"].
+
+    Delivery is synchronous, on the thread that emitted the event: the crawl
+    waits while the callback runs, so callbacks should return quickly (hand
+    slow work to another thread themselves).
+    """
+
+    def __init__(self, callback, interval=DEFAULT_INTERVAL):
+        self.callback = callback
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.last_delivery = 0.0
+
+    def emit(self, kind, **data):
+        event = ScrapeEvent(kind, time.time(), data)
+        now = time.monotonic()
+        with self.lock:
+            if kind == CONTACT_FOUND:
+                held = self.pending.get(kind)
+                found = held.data["contacts_found"] if held else []
+                found.append(data.get("contact"))
+                event.data["contacts_found"] = found
+            self.pending[kind] = event
+            if kind not in MILESTONES and now - self.last_delivery < self.interval:
+                return
+            self.last_delivery = now
+            events, self.pending = list(self.pending.values()), {}
+        self._deliver(events)
+
+    def flush(self):
+        """Deliver whatever is still held back"""
+        with self.lock:
+            events, self.pending = list(self.pending.values()), {}
+        self._deliver(events)
+
+    def _deliver(self, events):
+        for event in sorted(events, key=lambda event: event.time):
+            try:
+                self.callback(event)
+            except Exception as e:
+                # A broken progress display shouldn't end the run
+                print(f"Error in scrape event callback for {event.kind}: {e}")
@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import namedtuple
+
+from cancellation import CancellationToken
+from page_fingerprint import PageFingerprintStore
+from page_prefilter import PREFILTER_STATS
+from structured_data import STRUCTURED_DATA_STATS
+
+# What a scraper is configured with; fixed at construction and shared read-only
+# by every run and thread using it
+ScraperConfig = namedtuple("ScraperConfig", ["state", "city", "profession", "output_file", "extraction_budget",
+                                             "debug"])
+
+
+class AtomicCounter:
+    """Counter threads can bump and read at once; every access holds its lock"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = 0
+
+    def increment(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self):
+        with self._lock:
+            return self._value
+
+    def __int__(self):
+        return self.value
+
+    def __str__(self):
+        return str(self.value)
+
+
+class ScrapeRun:
+    """
+    Everything a single scrape changes: contacts, visited URLs, crawl budgets,
+    duplicate detection and counters. Each thread collects contacts in its own
+    buffer, merged into contacts with one list.extend at page boundaries, so
+    threads sharing a run never wait on each other. The run's cancel_token
+    stops it early, on request or at its deadline.
+    """
+
+    def __init__(self, incremental_run=None, cancel_token=None, observer=None):
+        self.contacts = []
+        # url/domain -> claim token; dict.setdefault is atomic, so exactly one thread wins a claim
+        self.visited_urls = {}
+        self.sitemaps_checked = {}
+        self.crawled_pages = {}
+        self.page_fingerprints = PageFingerprintStore()
+        self.search_attempts = AtomicCounter()
+        self.successful_searches = AtomicCounter()
+        self.extraction_timeouts = AtomicCounter()
+        # Pages not started because they couldn't finish before the deadline
+        self.deadline_skips = AtomicCounter()
+        # What the prefilter and structured data extractor did in this run
+        self.prefilter_stats = {name: AtomicCounter() for name in PREFILTER_STATS}
+        self.structured_data_stats = {name: AtomicCounter() for name in STRUCTURED_DATA_STATS}
+        self.incremental_run = incremental_run
+        self.cancel_token = cancel_token or CancellationToken()
+        self.completed = False
+        # Why the run stopped short of every query's results, when a budget or limit did it
+        self.cut_short = None
+        # Receives progress events (see scrape_events.py), if anyone is listening
+        self.observer = observer
+        self.started = time.time()
+        self._local = threading.local()
+
+    def emit(self, kind, **data):
+        if self.observer is not None:
+            self.observer.emit(kind, **data)
+
+    def buffer(self):
+        """This thread's contacts that haven't been merged into contacts yet"""
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = []
+        return buffer
+
+    def take_buffer(self):
+        """Detach and return this thread's buffered contacts without merging them"""
+        buffer = self.buffer()
+        self._local.buffer = []
+        return buffer
+
+    def flush(self):
+        """Merge this thread's buffered contacts into contacts; returns them"""
+        buffer = self.take_buffer()
+        if buffer:
+            self.contacts.extend(buffer)
+        return buffer
+
+    @staticmethod
+    def _claim(claims, key):
+        token = object()
+        return claims.setdefault(key, token) is token
+
+    def claim_url(self, url):
+        """Mark a URL visited; True only for the first caller"""
+        return self._claim(self.visited_urls, url)
+
+    def claim_sitemap(self, domain):
+        """Mark a domain's sitemap checked; True only for the first caller"""
+        return self._claim(self.sitemaps_checked, domain)
+
+    def crawled(self, domain):
+        """Same-site pages crawled on a domain so far"""
+        counter = self.crawled_pages.get(domain)
+        return counter.value if counter else 0
+
+    def note_crawled(self, domain):
+        self.crawled_pages.setdefault(domain, AtomicCounter()).increment()
+
+    def total_crawled(self):
+        return sum(counter.value for counter in list(self.crawled_pages.values()))
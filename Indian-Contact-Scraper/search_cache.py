@@ -0,0 +1,73 @@
+import json
+import re
+import threading
+import time
+
+from storage import DEFAULT_DB_PATH, open_database
+
+# Search results are reused for a week unless configured otherwise
+DEFAULT_TTL = 7 * 24 * 3600
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query):
+    """Canonical form of a query so trivial differences share a cache entry"""
+    return _WHITESPACE.sub(" ", query).strip().casefold()
+
+
+class SearchResultsCache:
+    """
+    Persistent cache of extracted search result URLs keyed by normalized
+    query and result offset, shared across cities, professions and runs
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, ttl=DEFAULT_TTL):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.connection = open_database(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS search_results ("
+            " query TEXT NOT NULL,"
+            " start INTEGER NOT NULL,"
+            " urls TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " PRIMARY KEY (query, start))"
+        )
+        self.connection.commit()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, query, start=0):
+        """Return the cached URL list for a results page, or None if missing or expired"""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT urls, fetched_at FROM search_results WHERE query = ? AND start = ?",
+                (normalize_query(query), start)
+            ).fetchone()
+
+        if row is None or (self.ttl is not None and time.time() - row[1] > self.ttl):
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        return json.loads(row[0])
+
+    def put(self, query, start, urls):
+        """Store the URLs extracted from a results page"""
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO search_results (query, start, urls, fetched_at) VALUES (?, ?, ?, ?)",
+                (normalize_query(query), start, json.dumps(list(urls)), time.time())
+            )
+            self.connection.commit()
+
+    def purge_expired(self):
+        """Delete entries older than the TTL, returning how many were removed"""
+        if self.ttl is None:
+            return 0
+        with self.lock:
+            cursor = self.connection.execute(
+                "DELETE FROM search_results WHERE fetched_at < ?", (time.time() - self.ttl,)
+            )
+            self.connection.commit()
+        return cursor.rowcount
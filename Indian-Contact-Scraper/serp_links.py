@@ -0,0 +1,119 @@
+from html.parser import HTMLParser
+from urllib.parse import urlparse, parse_qs
+
+# Hosts that belong to the search engine itself rather than to a result
+SEARCH_ENGINE_HOSTS = ("google.", "gstatic.com", "googleusercontent.com", "googleadservices.com")
+
+# Feed the tokenizer in chunks so we can stop as soon as we have enough links
+CHUNK_SIZE = 16384
+
+
+def decode_result_href(href):
+    """Turn a result-page href into the target URL, or None if it isn't an external result"""
+    if not href:
+        return None
+
+    # Redirect links: /url?q=<target>&sa=... (parse_qs also undoes the percent-encoding)
+    if href.startswith("/url?"):
+        params = parse_qs(urlparse(href).query)
+        targets = params.get("q") or params.get("url")
+        if not targets:
+            return None
+        href = targets[0]
+
+    if not href.startswith(("http://", "https://")):
+        return None
+
+    host = urlparse(href).netloc.lower()
+    if not host or any(host.startswith(h) or f".{h}" in host for h in SEARCH_ENGINE_HOSTS):
+        return None
+    return href
+
+
+class ResultLinkParser(HTMLParser):
+    """
+    Tokenizer-driven link collector for search result pages. An anchor wrapping
+    (or wrapped by) a result heading, or a /url?q= redirect, is an organic
+    result; other external links are kept only as a fallback.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.organic = []
+        self.fallback = []
+        self.current_href = None
+        self.current_emitted = False
+        self.heading_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            self.current_href = dict(attrs).get("href")
+            self.current_emitted = False
+            # Older layout: <h3><a href=...>
+            if self.heading_depth and self.current_href:
+                self._emit_current()
+        elif tag == "h3":
+            self.heading_depth += 1
+            # Current layout: <a href=...><h3>Title</h3></a>
+            if self.current_href:
+                self._emit_current()
+
+    def handle_endtag(self, tag):
+        if tag == "a":
+            if self.current_href and not self.current_emitted:
+                if self.current_href.startswith("/url?"):
+                    self._emit_current()
+                else:
+                    self.fallback.append(self.current_href)
+            self.current_href = None
+        elif tag == "h3" and self.heading_depth:
+            self.heading_depth -= 1
+
+    def _emit_current(self):
+        if not self.current_emitted:
+            self.organic.append(self.current_href)
+            self.current_emitted = True
+
+    def pop_organic(self):
+        """Return and forget the organic links seen so far"""
+        links, self.organic = self.organic, []
+        return links
+
+
+def iter_result_links(html, limit=None):
+    """Yield result URLs from a search results page in rank order, stopping after limit"""
+    if not html:
+        return
+
+    parser = ResultLinkParser()
+    seen = set()
+    found_organic = False
+
+    def unseen(hrefs):
+        for href in hrefs:
+            url = decode_result_href(href)
+            if url and url not in seen:
+                seen.add(url)
+                yield url
+
+    for offset in range(0, len(html), CHUNK_SIZE):
+        parser.feed(html[offset:offset + CHUNK_SIZE])
+        for url in unseen(parser.pop_organic()):
+            found_organic = True
+            yield url
+            if limit is not None and len(seen) >= limit:
+                return
+    parser.close()
+
+    for url in unseen(parser.pop_organic()):
+        found_organic = True
+        yield url
+        if limit is not None and len(seen) >= limit:
+            return
+
+    # Unrecognised layout: fall back to every external link on the page
+    if not found_organic:
+        for url in unseen(parser.fallback):
+            yield url
+            if limit is not None and len(seen) >= limit:
+                return
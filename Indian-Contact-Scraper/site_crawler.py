@@ -0,0 +1,148 @@
+import heapq
+import re
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse, urldefrag
+
+# Words in a link's anchor text or path that point at contact details, with weights
+LINK_KEYWORDS = {
+    "contact": 10, "reach-us": 8, "get-in-touch": 8, "enquiry": 6, "enquire": 6,
+    "team": 6, "our-team": 7, "people": 5, "staff": 5, "directory": 5,
+    "doctors": 6, "our-doctors": 7, "consultants": 5, "specialists": 5,
+    "lawyers": 6, "our-lawyers": 7, "advocates": 6, "attorneys": 6, "partners": 5,
+    "about": 5, "about-us": 6, "profile": 3, "faculty": 4, "members": 4,
+    "locations": 3, "branches": 3, "offices": 3, "clinic": 3, "hospital": 2,
+}
+
+# Links that never lead to contact details
+SKIP_KEYWORDS = ("login", "signin", "sign-in", "register", "cart", "checkout", "privacy",
+                 "terms", "cookie", "blog", "news", "careers", "wp-admin", "feed")
+SKIP_EXTENSIONS = (".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".zip",
+                   ".doc", ".docx", ".xls", ".xlsx", ".mp4", ".mp3", ".css", ".js", ".xml")
+
+_SITEMAP_LOC = re.compile(r"<loc>\s*([^<\s]+)\s*</loc>", re.IGNORECASE)
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def same_site(url, other):
+    """Whether two URLs are on the same host, ignoring a www. prefix"""
+    def host(u):
+        netloc = urlparse(u).netloc.lower()
+        return netloc[4:] if netloc.startswith("www.") else netloc
+    return host(url) == host(other)
+
+
+def score_link(url, anchor_text=""):
+    """How likely a link is to lead to contact details (0 means don't follow)"""
+    parsed = urlparse(url)
+    path = parsed.path.lower()
+    if path.endswith(SKIP_EXTENSIONS):
+        return 0
+
+    # Compare on hyphen-joined words so "Contact Us", "/contact_us" and "/contact-us" all match
+    haystack = "-" + _NON_WORD.sub("-", f"{path} {anchor_text.lower()}") + "-"
+    if any(f"-{word}-" in haystack for word in SKIP_KEYWORDS):
+        return 0
+
+    score = 0
+    for word, weight in LINK_KEYWORDS.items():
+        if f"-{word}-" in haystack:
+            score = max(score, weight)
+    # Shallow pages are more likely to be the site-wide contact page
+    if score:
+        score -= min(path.count("/"), 4) * 0.5
+    return score
+
+
+def parse_sitemap(xml_text):
+    """URLs listed in a sitemap.xml document"""
+    return _SITEMAP_LOC.findall(xml_text or "")
+
+
+class AnchorParser(HTMLParser):
+    """Collect (href, anchor text) pairs from a page without building a tree"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links = []
+        self.current_href = None
+        self.current_text = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            self.current_href = dict(attrs).get("href")
+            self.current_text = []
+
+    def handle_data(self, data):
+        if self.current_href is not None:
+            self.current_text.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self.current_href is not None:
+            self.links.append((self.current_href, " ".join(self.current_text).strip()))
+            self.current_href = None
+
+
+class CrawlFrontier:
+    """Priority queue of same-site links to visit, best-scoring first"""
+
+    def __init__(self, landing_url):
+        self.landing_url = landing_url
+        self.heap = []
+        self.queued = {urldefrag(landing_url)[0]}
+        self.counter = 0
+
+    def add(self, url, score, depth):
+        """Queue a link unless it is off-site, already queued or not worth following"""
+        url = urldefrag(url)[0]
+        if score <= 0 or url in self.queued or not same_site(url, self.landing_url):
+            return
+        self.queued.add(url)
+        self.counter += 1
+        heapq.heappush(self.heap, (-score, self.counter, url, depth))
+
+    def add_links(self, base_url, html, depth):
+        """Queue the promising links found on a page"""
+        parser = AnchorParser()
+        try:
+            parser.feed(html)
+            parser.close()
+        except Exception:
+            pass
+        for href, text in parser.links:
+            if not href or href.startswith(("mailto:", "tel:", "javascript:", "#")):
+                continue
+            url = urljoin(base_url, href)
+            if url.startswith(("http://", "https://")):
+                self.add(url, score_link(url, text), depth)
+
+    def add_sitemap(self, xml_text):
+        """Queue promising pages listed in the site's sitemap"""
+        for url in parse_sitemap(xml_text):
+            self.add(url, score_link(url), 1)
+
+    def pop(self):
+        """Return (url, depth) of the best remaining link, or None"""
+        if not self.heap:
+            return None
+        _, _, url, depth = heapq.heappop(self.heap)
+        return url, depth
+
+
+class SiteCrawler:
+    """Settings for the bounded same-site crawl that follows a landing page"""
+
+    def __init__(self, max_depth=1, max_pages=3, use_sitemap=True):
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.use_sitemap = use_sitemap
+
+    def new_frontier(self, landing_url, landing_html):
+        """Frontier seeded with the landing page's links"""
+        frontier = CrawlFrontier(landing_url)
+        frontier.add_links(landing_url, landing_html, 1)
+        return frontier
+
+    def sitemap_url(self, url):
+        """Location of the sitemap for the site a URL belongs to"""
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}/sitemap.xml"
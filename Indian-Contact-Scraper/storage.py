@@ -0,0 +1,18 @@
+import os
+import sqlite3
+
+# Persistent state (search cache, statistics, ...) lives in one SQLite file
+DEFAULT_CACHE_DIR = "cache"
+DEFAULT_DB_PATH = os.path.join(DEFAULT_CACHE_DIR, "scraper_cache.db")
+
+
+def open_database(path=DEFAULT_DB_PATH):
+    """Open the SQLite database at path, creating its directory if needed"""
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    # WAL lets readers and a writer (e.g. the app and a CLI run) share the file
+    connection.execute("PRAGMA journal_mode=WAL")
+    return connection
@@ -0,0 +1,287 @@
+import json
+import re
+from html.parser import HTMLParser
+from urllib.parse import unquote
+
+# schema.org types that describe a person or a business we can contact
+CONTACT_TYPES = {
+    "person", "physician", "dentist", "attorney", "legalservice", "localbusiness",
+    "organization", "medicalbusiness", "medicalclinic", "medicalorganization", "hospital",
+    "professionalservice", "accountingservice", "financialservice", "homeandconstructionbusiness",
+}
+
+# hCard / microformats2 class names and the field each one fills
+HCARD_ROOTS = {"vcard", "h-card"}
+HCARD_PROPERTIES = {
+    "fn": "name", "p-name": "name", "org": "organization", "p-org": "organization",
+    "tel": "telephone", "p-tel": "telephone", "email": "email", "u-email": "email",
+    "adr": "address", "p-adr": "address", "street-address": "streetAddress",
+    "p-street-address": "streetAddress", "locality": "addressLocality",
+    "p-locality": "addressLocality", "region": "addressRegion", "p-region": "addressRegion",
+    "postal-code": "postalCode", "p-postal-code": "postalCode", "url": "sameAs", "u-url": "sameAs",
+}
+
+# Elements whose property value is an attribute rather than their text
+_VALUE_ATTRIBUTES = {"meta": "content", "a": "href", "link": "href", "img": "src", "time": "datetime"}
+_VOID_TAGS = {"meta", "link", "img", "br", "hr", "input", "source", "area", "base", "col", "wbr"}
+_ADDRESS_PARTS = ("streetAddress", "addressLocality", "addressRegion", "postalCode")
+_WHITESPACE = re.compile(r"\s+")
+
+# Counters extract() bumps, kept per run by the caller
+STRUCTURED_DATA_STATS = ("pages", "pages_with_records", "records")
+
+
+def _clean(value):
+    return _WHITESPACE.sub(" ", str(value)).strip()
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _types(node):
+    """Lowercased schema.org type names of a JSON-LD node or microdata itemtype"""
+    names = []
+    for value in _as_list(node):
+        if isinstance(value, str):
+            names.extend(part.rstrip("/").rsplit("/", 1)[-1].lower() for part in value.split())
+    return names
+
+
+def format_address(value):
+    """Flatten a PostalAddress (dict or string) into one line"""
+    if isinstance(value, list):
+        value = value[0] if value else ""
+    if isinstance(value, dict):
+        parts = [_clean(value[key]) for key in _ADDRESS_PARTS if isinstance(value.get(key), str)]
+        return ", ".join(part for part in parts if part)
+    return _clean(value) if isinstance(value, str) else ""
+
+
+def _strip_scheme(value, scheme):
+    value = _clean(value)
+    if value.lower().startswith(scheme):
+        value = unquote(value[len(scheme):]).split("?")[0]
+    return value
+
+
+def _record_from_properties(properties):
+    """Contact record (name, email, telephone, address, links) from schema.org-style properties"""
+    record = {
+        "name": "", "email": [], "telephone": [], "address": "",
+        "links": [link for link in (_clean(v) for v in _as_list(properties.get("sameAs"))
+                                    + _as_list(properties.get("url"))) if link],
+    }
+    for value in _as_list(properties.get("name")) + _as_list(properties.get("organization")):
+        if isinstance(value, str) and _clean(value):
+            record["name"] = _clean(value)
+            break
+    for value in _as_list(properties.get("email")):
+        if isinstance(value, str) and "@" in value:
+            record["email"].append(_strip_scheme(value, "mailto:"))
+    for value in _as_list(properties.get("telephone")):
+        if isinstance(value, str) and _clean(value):
+            record["telephone"].append(_strip_scheme(value, "tel:"))
+
+    address = properties.get("address")
+    if address is None and any(key in properties for key in _ADDRESS_PARTS):
+        address = properties
+    record["address"] = format_address(address)
+    return record
+
+
+def _has_contact(record):
+    return bool(record["email"] or record["telephone"])
+
+
+class StructuredDataParser(HTMLParser):
+    """
+    Single tokenizer pass collecting JSON-LD blocks, microdata and hCard
+    scopes, and mailto:/tel: anchors
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.json_ld = []
+        self.scoped_records = []
+        self.mailto = []
+        self.tel = []
+
+        self.in_json_ld = False
+        self.json_ld_buffer = []
+
+        # Open elements: [tag, scope or None, capture or None]
+        self.stack = []
+        self.scopes = []
+
+    def handle_starttag(self, tag, attrs):
+        attributes = dict(attrs)
+
+        if tag == "script" and (attributes.get("type") or "").lower() == "application/ld+json":
+            self.in_json_ld = True
+            self.json_ld_buffer = []
+            return
+
+        if tag == "a":
+            href = (attributes.get("href") or "").strip()
+            if href.lower().startswith("mailto:"):
+                self.mailto.append(_strip_scheme(href, "mailto:"))
+            elif href.lower().startswith("tel:"):
+                self.tel.append(_strip_scheme(href, "tel:"))
+
+        classes = set((attributes.get("class") or "").lower().split())
+        properties = []
+        if "itemprop" in attributes and self.scopes:
+            properties.extend((attributes.get("itemprop") or "").split())
+        if self.scopes and self.scopes[-1]["kind"] == "hcard":
+            properties.extend(HCARD_PROPERTIES[c] for c in classes if c in HCARD_PROPERTIES)
+
+        # Property values carried in an attribute (<meta content>, <a href>, ...)
+        capture = None
+        if properties:
+            attribute = _VALUE_ATTRIBUTES.get(tag)
+            value = attributes.get("content") or (attributes.get(attribute) if attribute else None)
+            if value:
+                for name in properties:
+                    self._set_property(self.scopes[-1], name, value)
+            elif tag not in _VOID_TAGS and not ("itemscope" in attributes or classes & HCARD_ROOTS):
+                capture = {"properties": properties, "scope": self.scopes[-1], "text": []}
+
+        scope = None
+        if "itemscope" in attributes:
+            scope = {"kind": "microdata", "types": _types(attributes.get("itemtype")),
+                     "properties": {}, "parent_properties": properties}
+        elif classes & HCARD_ROOTS:
+            scope = {"kind": "hcard", "types": ["person"], "properties": {},
+                     "parent_properties": properties}
+        elif self.scopes and self.scopes[-1]["kind"] == "hcard" and "address" in properties:
+            # hCard adr is a nested block of street/locality/... parts
+            scope = {"kind": "hcard", "types": ["postaladdress"], "properties": {},
+                     "parent_properties": properties}
+            capture = None
+        if scope is not None:
+            self.scopes.append(scope)
+
+        if tag not in _VOID_TAGS:
+            self.stack.append([tag, scope, capture])
+
+    def handle_data(self, data):
+        if self.in_json_ld:
+            self.json_ld_buffer.append(data)
+            return
+        for _, _, capture in self.stack:
+            if capture is not None:
+                capture["text"].append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "script" and self.in_json_ld:
+            self.in_json_ld = False
+            self.json_ld.append("".join(self.json_ld_buffer))
+            return
+
+        # Close everything up to the matching open tag (tolerates unclosed children)
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index][0] == tag:
+                break
+        else:
+            return
+        while len(self.stack) > index:
+            _, scope, capture = self.stack.pop()
+            if capture is not None:
+                text = _clean(" ".join(capture["text"]))
+                if text:
+                    for name in capture["properties"]:
+                        self._set_property(capture["scope"], name, text)
+            if scope is not None:
+                self._close_scope(scope)
+
+    def close(self):
+        super().close()
+        while self.stack:
+            self.handle_endtag(self.stack[-1][0])
+
+    def _set_property(self, scope, name, value):
+        scope["properties"].setdefault(name, []).append(value)
+
+    def _close_scope(self, scope):
+        if scope in self.scopes:
+            self.scopes.remove(scope)
+        parent = self.scopes[-1] if self.scopes else None
+
+        # Nested scopes used as a property value (e.g. itemprop="address")
+        if parent is not None and scope["parent_properties"]:
+            value = {key: values[0] for key, values in scope["properties"].items()}
+            for name in scope["parent_properties"]:
+                self._set_property(parent, name, value)
+            if "postaladdress" in scope["types"]:
+                return
+
+        if set(scope["types"]) & CONTACT_TYPES or scope["kind"] == "hcard":
+            self.scoped_records.append(scope["properties"])
+
+
+class StructuredDataExtractor:
+    """
+    Extract exact contact records from schema.org JSON-LD, microdata,
+    hCard/h-card markup and mailto:/tel: links. Counts go to the stats passed
+    to extract() (counters keyed by STRUCTURED_DATA_STATS), kept per run.
+    """
+
+    def _json_ld_nodes(self, text):
+        """Every dict node in a JSON-LD block, including @graph members and nested entities"""
+        try:
+            data = json.loads(text.strip().rstrip(";"))
+        except ValueError:
+            return
+        pending = [data]
+        while pending:
+            node = pending.pop()
+            if isinstance(node, list):
+                pending.extend(node)
+            elif isinstance(node, dict):
+                yield node
+                for key, value in node.items():
+                    if key != "address" and isinstance(value, (dict, list)):
+                        pending.append(value)
+
+    def extract(self, html, stats=None):
+        """
+        Return (records, emails, phones) from a page: records from typed
+        structured data, plus raw mailto:/tel: values found in links
+        """
+        if stats is not None:
+            stats["pages"].increment()
+        parser = StructuredDataParser()
+        try:
+            parser.feed(html)
+            parser.close()
+        except Exception:
+            pass
+
+        records = []
+        for block in parser.json_ld:
+            for node in self._json_ld_nodes(block):
+                if set(_types(node.get("@type"))) & CONTACT_TYPES:
+                    record = _record_from_properties(node)
+                    # contactPoint often holds the phone/email of a business
+                    for point in _as_list(node.get("contactPoint")):
+                        if isinstance(point, dict):
+                            extra = _record_from_properties(point)
+                            record["telephone"].extend(extra["telephone"])
+                            record["email"].extend(extra["email"])
+                    if _has_contact(record):
+                        records.append(record)
+
+        for properties in parser.scoped_records:
+            record = _record_from_properties(
+                {key: values if len(values) > 1 else values[0] for key, values in properties.items()}
+            )
+            if _has_contact(record):
+                records.append(record)
+
+        if records and stats is not None:
+            stats["pages_with_records"].increment()
+            stats["records"].increment(len(records))
+        return records, parser.mailto, parser.tel
@@ -0,0 +1,108 @@
+import signal
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cancellation import Cancelled, CancellationToken, install_interrupt_handler
+from host_health import HALF_OPEN, HostHealthTracker, host_key
+from http_fetcher import HttpFetcher
+
+
+def test_deadline_cancels_the_token():
+    token = CancellationToken(timeout=0.2)
+    assert not token.cancelled
+    assert token.can_finish(0.1) and not token.can_finish(5)
+    assert token.cap(10) <= 0.2
+    time.sleep(0.25)
+    assert token.cancelled and token.reason == "time limit reached"
+    assert token.remaining() == 0.0
+
+    unlimited = CancellationToken()
+    assert unlimited.remaining() is None and unlimited.can_finish(1e6) and unlimited.cap(7) == 7
+
+
+def test_cancel_wakes_a_sleeper_and_runs_callbacks():
+    token = CancellationToken()
+    called = []
+    token.on_cancel(lambda: called.append("registered"))
+    unregister = token.on_cancel(lambda: called.append("unregistered"))
+    unregister()
+
+    threading.Timer(0.1, token.cancel, args=("stopped by user",)).start()
+    started = time.monotonic()
+    try:
+        token.sleep(10)
+        assert False, "sleep should have been cut short"
+    except Cancelled as e:
+        assert str(e) == "stopped by user"
+    assert time.monotonic() - started < 2
+    assert called == ["registered"]
+
+    # Registering on a cancelled token calls back at once
+    token.on_cancel(lambda: called.append("late"))
+    assert called == ["registered", "late"]
+
+
+def test_interrupt_handler_is_restored():
+    before = signal.getsignal(signal.SIGINT)
+    restore = install_interrupt_handler(CancellationToken())
+    assert signal.getsignal(signal.SIGINT) is not before
+    restore()
+    assert signal.getsignal(signal.SIGINT) is before
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    """Sends a body a few bytes per second"""
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", "1000")
+        self.end_headers()
+        try:
+            for _ in range(100):
+                self.wfile.write(b"x" * 10)
+                self.wfile.flush()
+                time.sleep(0.1)
+        except OSError:
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+def test_cancel_mid_body_releases_the_probe():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/slow"
+    host = host_key(url)
+    try:
+        health = HostHealthTracker(failure_threshold=1, reset_timeout=0)
+        health.record_failure(host)
+        fetcher = HttpFetcher(host_health=health, max_wait=0)
+        # Skip the failure's backoff; the circuit is open and ready for a probe
+        health.hosts[host].retry_at = 0.0
+
+        token = CancellationToken()
+        threading.Timer(0.5, token.cancel).start()
+        started = time.monotonic()
+        try:
+            fetcher.get(url, cancel_token=token)
+            assert False, "the fetch should have been cancelled"
+        except Cancelled:
+            pass
+        assert time.monotonic() - started < 5
+
+        # The cancelled probe said nothing about the host; the next request may probe
+        assert health.hosts[host].state == HALF_OPEN
+        assert health.allow(host)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_deadline_cancels_the_token()
+    test_cancel_wakes_a_sleeper_and_runs_callbacks()
+    test_interrupt_handler_is_restored()
+    test_cancel_mid_body_releases_the_probe()
+    print("All cancellation tests passed")
@@ -0,0 +1,37 @@
+import subprocess
+import sys
+
+from cli import COMMANDS, SCRIPT_DIR, time_import
+
+
+def _run(*args):
+    return subprocess.run([sys.executable, "cli.py"] + list(args), cwd=SCRIPT_DIR,
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+
+
+def test_light_commands_skip_the_heavy_packages():
+    # The CLI itself and the CSV tools load none of requests, bs4, pandas, httpx, ...
+    for module in ["cli", "fix_csv_numbers", "file_explorer", "csv_manager"]:
+        elapsed, loaded = time_import(module, repeat=1)
+        assert elapsed is not None and loaded == "", (module, loaded)
+    # The scraper needs requests up front, but parses pages with bs4 only when it has to
+    assert time_import("indian_contact_scraper", repeat=1)[1] == "requests"
+    assert time_import("no_such_module", repeat=1) == (None, "ModuleNotFoundError: No module named 'no_such_module'")
+
+
+def test_commands_are_listed_and_dispatched():
+    result = _run("--help")
+    assert result.returncode == 0
+    assert all(name in result.stdout for name in list(COMMANDS) + ["bench-imports"])
+
+    # A command's own options reach its runner's parser
+    result = _run("fix-csv", "--help")
+    assert result.returncode == 0
+    assert result.stdout.startswith("usage: cli.py fix-csv")
+    assert _run("no-such-command").returncode == 2
+
+
+if __name__ == "__main__":
+    test_light_commands_skip_the_heavy_packages()
+    test_commands_are_listed_and_dispatched()
+    print("All CLI tests passed")
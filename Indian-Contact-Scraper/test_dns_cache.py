@@ -0,0 +1,94 @@
+import socket
+import time
+
+from dns_cache import DnsCache
+
+ADDRESS = [(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", ("192.0.2.10", 443))]
+
+
+class _Resolver:
+    """Stands in for the system resolver, counting lookups per host"""
+
+    def __init__(self):
+        self.lookups = []
+
+    def __call__(self, host, port, family=0, type=0, proto=0, flags=0):
+        self.lookups.append(host)
+        if host.startswith("dead"):
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        if host.startswith("flaky"):
+            raise socket.gaierror(socket.EAI_AGAIN, "Temporary failure in name resolution")
+        return list(ADDRESS)
+
+
+def _cache(**settings):
+    cache = DnsCache(**settings)
+    cache.system_getaddrinfo = _Resolver()
+    return cache
+
+
+def _lookup_error(cache, host):
+    try:
+        cache.getaddrinfo(host, 443)
+    except socket.gaierror as e:
+        return e
+    raise AssertionError(f"{host} should not have resolved")
+
+
+def test_answers_and_missing_names_are_cached_for_their_ttl():
+    cache = _cache(default_ttl=0.2, negative_ttl=0.2)
+    resolver = cache.system_getaddrinfo
+    assert cache.getaddrinfo("Clinic.example", 443) == ADDRESS
+    assert cache.getaddrinfo("clinic.example", 443) == ADDRESS
+    # A name that doesn't exist fails from the cache the second time
+    assert _lookup_error(cache, "dead.example").args[0] == socket.EAI_NONAME
+    assert _lookup_error(cache, "dead.example").args[0] == socket.EAI_NONAME
+    assert resolver.lookups == ["clinic.example", "dead.example"]
+    assert (cache.stats["hits"], cache.stats["negative_hits"]) == (1, 1)
+
+    # Once the TTL is up both are looked up again
+    time.sleep(0.25)
+    cache.getaddrinfo("clinic.example", 443)
+    _lookup_error(cache, "dead.example")
+    assert resolver.lookups[2:] == ["clinic.example", "dead.example"]
+
+
+def test_transient_failures_and_addresses_bypass_the_cache():
+    cache = _cache()
+    resolver = cache.system_getaddrinfo
+    _lookup_error(cache, "flaky.example")
+    _lookup_error(cache, "flaky.example")
+    cache.getaddrinfo("127.0.0.1", 80)
+    cache.getaddrinfo("localhost", 80)
+    assert resolver.lookups == ["flaky.example", "flaky.example", "127.0.0.1", "localhost"]
+    assert cache.entries == {}
+
+
+def test_prefetch_and_install():
+    cache = _cache()
+    resolver = cache.system_getaddrinfo
+    cache.prefetch(["https://a.example/x", "https://a.example/y", "http://b.example:8080/"])
+    for _ in range(100):
+        if cache.stats["prefetched"] == 2:
+            break
+        time.sleep(0.01)
+    assert sorted(resolver.lookups) == ["a.example", "b.example"]
+    cache.shutdown()
+
+    # The fetch of a prefetched URL is a hit, through socket.getaddrinfo while installed
+    original = socket.getaddrinfo
+    cache.install()
+    try:
+        assert socket.getaddrinfo == cache.getaddrinfo
+        assert socket.getaddrinfo("a.example", 443, 0, socket.SOCK_STREAM) == ADDRESS
+    finally:
+        cache.uninstall()
+    assert socket.getaddrinfo == original
+    assert cache.stats["hits"] == 1 and len(resolver.lookups) == 2
+
+
+if __name__ == "__main__":
+    test_answers_and_missing_names_are_cached_for_their_ttl()
+    test_transient_failures_and_addresses_bypass_the_cache()
+    test_prefetch_and_install()
+    print("All DNS cache tests passed")
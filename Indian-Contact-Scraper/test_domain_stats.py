@@ -0,0 +1,42 @@
+import os
+import tempfile
+
+from domain_stats import DomainStatsStore, domain_key
+
+URLS = [
+    "https://slow-directory.example/doctors",
+    "https://www.fast-clinic.example/team",
+    "https://new-site.example/",
+    "https://empty-portal.example/list",
+]
+
+
+def test_urls_are_ranked_by_contacts_per_second():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "stats.db")
+        stats = DomainStatsStore(path)
+        # Unknown domains keep their search result order
+        assert stats.rank_urls(URLS) == URLS
+
+        for _ in range(3):
+            stats.record_fetch(URLS[0], True, latency=20.0, size=50000)
+            stats.record_contacts(URLS[0], 2)
+            stats.record_fetch("https://fast-clinic.example/about", True, latency=0.5, size=20000)
+            stats.record_contacts("https://fast-clinic.example/about", 2)
+        for _ in range(5):
+            stats.record_fetch(URLS[3], True, latency=1.0, size=10000)
+
+        # Statistics are per domain, with or without www., and survive a reopen
+        assert domain_key(URLS[1]) == "fast-clinic.example"
+        reopened = DomainStatsStore(path)
+        assert reopened.get("fast-clinic.example")["contacts"] == 6
+
+        # Fast and productive first, never-productive domains dropped
+        assert reopened.is_blocked(URLS[3])
+        assert reopened.rank_urls(URLS) == [URLS[1], URLS[2], URLS[0]]
+        assert reopened.rank_urls(URLS, limit=1) == [URLS[1]]
+
+
+if __name__ == "__main__":
+    test_urls_are_ranked_by_contacts_per_second()
+    print("All domain stats tests passed")
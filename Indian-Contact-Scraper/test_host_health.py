@@ -0,0 +1,60 @@
+import time
+
+from host_health import HostHealthTracker, host_key, parse_retry_after
+
+HOST = host_key("https://WWW.Clinic.example:8443/contact")
+
+
+def test_breaker_opens_probes_and_closes():
+    health = HostHealthTracker(failure_threshold=3, reset_timeout=0.2, base_backoff=0.01)
+    assert HOST == "www.clinic.example:8443"
+    for _ in range(2):
+        health.record_failure(HOST)
+    assert health.allow(HOST) and not health.is_open(HOST)
+    health.record_failure(HOST)
+    assert health.is_open(HOST)
+    assert not health.allow(HOST)
+
+    # After reset_timeout a single probe goes through
+    time.sleep(0.25)
+    assert health.allow(HOST)
+    assert not health.allow(HOST)
+    # A probe that told us nothing lets the next request probe instead
+    health.release_probe(HOST)
+    assert health.allow(HOST)
+    health.record_success(HOST)
+    assert health.allow(HOST) and health.allow(HOST)
+    assert health.stats["circuits_opened"] == 1
+
+
+def test_failed_probe_reopens_and_backoff_is_bounded():
+    health = HostHealthTracker(failure_threshold=1, reset_timeout=0.1, base_backoff=1.0, max_backoff=4.0)
+    health.record_failure(HOST)
+    time.sleep(0.15)
+    assert health.allow(HOST)
+    health.record_failure(HOST)
+    # Opened again straight away, without waiting for the threshold
+    assert health.is_open(HOST) and not health.allow(HOST)
+    assert health.stats["circuits_opened"] == 2
+    assert health.stats["skipped"] == 1
+
+    # Equal jitter keeps half of the capped delay; Retry-After is capped too
+    assert all(2.0 <= health.backoff(10) <= 4.0 for _ in range(20))
+    assert 0.5 <= health.backoff(1) <= 1.0
+    assert health.record_failure("other.example", retry_after=1000) == health.max_retry_after
+    assert 4 <= health.wait_time("other.example") <= health.max_retry_after
+    assert health.wait_time("unknown.example") == 0.0
+
+
+def test_retry_after_header_values():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:30 GMT", now=1445412480) == 30.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT", now=1445412480 + 60) == 0.0
+    assert parse_retry_after("soon") is None and parse_retry_after(None) is None
+
+
+if __name__ == "__main__":
+    test_breaker_opens_probes_and_closes()
+    test_failed_probe_reopens_and_backoff_is_bounded()
+    test_retry_after_header_values()
+    print("All host health tests passed")
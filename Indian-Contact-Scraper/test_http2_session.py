@@ -0,0 +1,106 @@
+import asyncio
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+
+import pytest
+
+from http2_session import Http2Session, create_session, http2_available
+from http_fetcher import HttpFetcher
+
+try:
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+except ImportError:
+    serve = None
+
+pytestmark = pytest.mark.skipif(
+    serve is None or not http2_available() or shutil.which("openssl") is None,
+    reason="needs httpx[http2], hypercorn and openssl"
+)
+
+PAGE = b"<html><body>Dr. Priya Sharma, 98450 12345</body></html>"
+
+
+async def _app(scope, receive, send):
+    """Tiny ASGI app serving the same page at every path"""
+    if scope["type"] != "http":
+        return
+    await send({"type": "http.response.start", "status": 200,
+                "headers": [(b"content-type", b"text/html; charset=utf-8")]})
+    await send({"type": "http.response.body", "body": PAGE})
+
+
+class _TlsServer:
+    """hypercorn on a free local port with a throwaway self-signed certificate"""
+
+    def __init__(self, directory):
+        self.certfile = f"{directory}/cert.pem"
+        self.keyfile = f"{directory}/key.pem"
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+             "-subj", "/CN=localhost", "-keyout", self.keyfile, "-out", self.certfile],
+            check=True, capture_output=True
+        )
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+
+        self.config = Config()
+        self.config.bind = [f"127.0.0.1:{self.port}"]
+        self.config.certfile = self.certfile
+        self.config.keyfile = self.keyfile
+        self.config.alpn_protocols = ["h2", "http/1.1"]
+        self.config.accesslog = None
+        self.config.errorlog = None
+        self.loop = asyncio.new_event_loop()
+        self.stopping = None
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+
+    def _serve(self):
+        asyncio.set_event_loop(self.loop)
+        self.stopping = asyncio.Event()
+        self.loop.run_until_complete(serve(_app, self.config, shutdown_trigger=self.stopping.wait))
+
+    def __enter__(self):
+        self.thread.start()
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", self.port), timeout=1).close()
+                return self
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+
+    def __exit__(self, *exc):
+        self.loop.call_soon_threadsafe(self.stopping.set)
+        self.thread.join(timeout=10)
+
+
+def test_requests_go_over_http2():
+    with tempfile.TemporaryDirectory() as directory, _TlsServer(directory) as server:
+        session = create_session(http2=True, verify=False)
+        assert isinstance(session, Http2Session)
+        fetcher = HttpFetcher(session=session)
+        try:
+            for i in range(10):
+                response = fetcher.get(f"https://localhost:{server.port}/page/{i}", timeout=(5, 5))
+                assert response.status_code == 200
+                assert response.content == PAGE
+                assert "Priya Sharma" in response.text
+        finally:
+            fetcher.close()
+
+        # Every request was multiplexed over HTTP/2, none fell back to HTTP/1.1
+        assert session.stats == {"HTTP/2": 10}
+        assert fetcher.summary() == "- HTTP protocol: 10 over HTTP/2"
+
+
+if __name__ == "__main__":
+    test_requests_go_over_http2()
+    print("All HTTP/2 session tests passed")
@@ -0,0 +1,116 @@
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from host_health import HostHealthTracker
+from http_fetcher import FetchDeadlineExceeded, HttpFetcher
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/stalls":
+            # Headers never arrive within the read timeout
+            time.sleep(2)
+            self.send_response(200)
+            self.end_headers()
+            return
+        # Headers at once, then a body that trickles in for longer than the deadline
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.end_headers()
+        for _ in range(20):
+            self.wfile.write(b"<p>slow</p>")
+            self.wfile.flush()
+            time.sleep(0.1)
+
+    def log_message(self, *args):
+        pass
+
+
+def _server(handler):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def _fetch_error(fetcher, url):
+    started = time.monotonic()
+    try:
+        fetcher.get(url)
+    except requests.RequestException as e:
+        return e, time.monotonic() - started
+    raise AssertionError(f"{url} should not have been fetched")
+
+
+def test_total_deadline_covers_retries_and_backoff():
+    server, base = _server(_SlowHandler)
+    try:
+        fetcher = HttpFetcher(host_health=HostHealthTracker(base_backoff=0.4, failure_threshold=5),
+                              max_retries=2, total_timeout=1.0)
+        fetcher.timeouts.default = (0.8, 0.8)
+
+        # Three 0.8s read timeouts plus backoff would take about 3s; the deadline ends it
+        error, elapsed = _fetch_error(fetcher, base + "/stalls")
+        assert isinstance(error, requests.Timeout)
+        assert elapsed < 1.5
+
+        # A body still arriving at the deadline is abandoned, not retried
+        error, elapsed = _fetch_error(fetcher, base + "/trickle")
+        assert isinstance(error, FetchDeadlineExceeded)
+        assert elapsed < 1.5
+        fetcher.close()
+    finally:
+        server.shutdown()
+
+
+class _FlakyHandler(BaseHTTPRequestHandler):
+    requests = 0
+
+    def do_GET(self):
+        _FlakyHandler.requests += 1
+        if _FlakyHandler.requests == 1:
+            # Drop the first connection without an answer
+            self.close_connection = True
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+def _closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_unreachable_hosts_are_not_retried():
+    health = HostHealthTracker(base_backoff=0.05)
+    fetcher = HttpFetcher(host_health=health, max_retries=2)
+    for url in [f"http://127.0.0.1:{_closed_port()}/", "http://no-such-host.invalid/"]:
+        error, _ = _fetch_error(fetcher, url)
+        assert isinstance(error, requests.ConnectionError)
+    # One failure recorded per host, no retries
+    assert health.stats["failures"] == 2
+
+    # A dropped connection is worth another try
+    server, base = _server(_FlakyHandler)
+    try:
+        assert fetcher.get(base + "/").text == "ok"
+        assert _FlakyHandler.requests == 2
+    finally:
+        server.shutdown()
+        fetcher.close()
+
+
+if __name__ == "__main__":
+    test_total_deadline_covers_retries_and_backoff()
+    test_unreachable_hosts_are_not_retried()
+    print("All HTTP fetcher tests passed")
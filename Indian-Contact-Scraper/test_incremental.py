@@ -0,0 +1,110 @@
+import csv
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from incremental import CHANGED, NEW, VANISHED, IncrementalStore
+from indian_contact_scraper import IndianContactScraper
+
+
+def _contact(url, name, phone):
+    return {"name": name, "phone": phone, "email": "Not found", "source_url": url}
+
+
+def test_delta_between_runs():
+    with tempfile.TemporaryDirectory() as directory:
+        store = IncrementalStore(os.path.join(directory, "state.db"))
+        pages = {"https://a.in": _contact("https://a.in", "Dr. Ramesh Kumar", "+919876543210"),
+                 "https://b.in": _contact("https://b.in", "Dr. Sunita Sharma", "+919812345678"),
+                 "https://c.in": _contact("https://c.in", "Dr. Anil Gupta", "+919898989898")}
+
+        first = store.begin("Karnataka", "Bangalore", "Doctor")
+        for url, contact in pages.items():
+            first.record(url, url + "-v1", {}, None, [contact])
+        delta, carried = first.finish(list(pages.values()))
+        assert len(delta[NEW]) == 3 and not delta[CHANGED] and not delta[VANISHED] and not carried
+
+        # b changed its phone, c is gone, and a wasn't reached at all
+        second = store.begin("Karnataka", "Bangalore", "Doctor")
+        changed = dict(pages["https://b.in"], phone="+919822222222")
+        second.record("https://b.in", "https://b.in-v2", {}, None, [changed])
+        second.mark_gone("https://c.in")
+        delta, carried = second.finish([changed])
+
+        assert not delta[NEW]
+        assert [c["name"] for c in delta[CHANGED]] == ["Dr. Sunita Sharma"]
+        assert delta[CHANGED][0]["changed_fields"] == "phone"
+        assert [c["name"] for c in delta[VANISHED]] == ["Dr. Anil Gupta"]
+        assert carried == [pages["https://a.in"]]
+
+        # The unvisited page is still in the baseline; the gone one isn't
+        assert sorted(store.load("Karnataka|Bangalore|Doctor")) == ["https://a.in", "https://b.in"]
+
+
+PAGES = {
+    "/a": "<html><body><h1>Dr. Ramesh Kumar</h1> mail ramesh@clinic.in call +91 98765 43210</body></html>",
+    "/b": "<html><body><h1>Dr. Sunita Sharma</h1> mail sunita@hosp.in phone 98123 45678</body></html>",
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = PAGES.get(self.path)
+        if body is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.end_headers()
+        self.wfile.write(body.encode("utf-8"))
+
+    def log_message(self, *args):
+        pass
+
+
+def _names(path):
+    with open(path, encoding="utf-8") as f:
+        return sorted(row["name"] for row in csv.DictReader(f))
+
+
+def test_partial_run_keeps_unvisited_pages():
+    server = HTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            store = IncrementalStore(os.path.join(directory, "state.db"))
+            output = os.path.join(directory, "contacts.csv")
+
+            def run(paths):
+                scraper = IndianContactScraper("Karnataka", "Bangalore", "Doctor",
+                                               output_file=output, incremental=store)
+                for path in paths:
+                    scraper.extract_contact_info_from_page(base + path)
+                # Even a run that saw every query through leaves some old pages unvisited
+                scraper.run.completed = True
+                scraper.save_to_csv()
+                return scraper
+
+            run(["/a", "/b"])
+            assert _names(output) == ["Dr. Ramesh Kumar", "Dr. Sunita Sharma"]
+
+            # Only /b is visited, and it now answers 404
+            removed = PAGES.pop("/b")
+            try:
+                run(["/b"])
+            finally:
+                PAGES["/b"] = removed
+            assert _names(output) == ["Dr. Ramesh Kumar"]
+            assert _names(output[:-4] + ".vanished.csv") == ["Dr. Sunita Sharma"]
+            assert _names(output[:-4] + ".new.csv") == []
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_delta_between_runs()
+    test_partial_run_keeps_unvisited_pages()
+    print("All incremental tests passed")
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import job_manager
+from indian_contact_scraper import IndianContactScraper
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(0.1)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.end_headers()
+        page = self.path.strip("/")
+        self.wfile.write(f"<html><body><h2>Dr. Ravi Kumar</h2> ravi{page}@clinic.in</body></html>".encode("utf-8"))
+
+    def log_message(self, *args):
+        pass
+
+
+def _wait_until(condition, timeout=30):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.05)
+
+
+def test_time_limit_completes_and_user_stop_stops():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    # Every query's results "come from the cache", so the jobs only fetch the local pages
+    patched = {
+        "get_query_templates": lambda self: ["{profession} in {city}"],
+        "get_search_result_urls": lambda self, query, start=0, limit=None: (
+            [f"{base}/{self.city}{start}{i}" for i in range(5)], True),
+    }
+    originals = {name: getattr(IndianContactScraper, name) for name in patched}
+    for name, method in patched.items():
+        setattr(IndianContactScraper, name, method)
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            manager = job_manager.JobManager(path=os.path.join(directory, "jobs.db"), max_jobs=2)
+            # The local pages answer at once; don't let the default 5s estimate skip them all
+            manager.fetcher.timeouts.default = (0.5, 1.0)
+            timed = manager.submit("Karnataka", "Mysore", "Doctor", os.path.join(directory, "timed.csv"),
+                                   max_pages=50, time_limit=1.5)
+            stopped = manager.submit("Karnataka", "Hubli", "Doctor", os.path.join(directory, "stopped.csv"),
+                                     max_pages=50)
+            # A second active job can't take over a running job's CSV
+            try:
+                manager.submit("Karnataka", "Mysore", "Doctor", os.path.join(directory, "timed.csv"))
+            except job_manager.OutputInUse:
+                pass
+            else:
+                raise AssertionError("two active jobs were given the same output file")
+
+            _wait_until(lambda: len(manager.running) == 2)
+            # Both jobs fetch through the manager's one fetcher
+            assert all(scraper.fetcher is manager.fetcher for scraper, _ in list(manager.running.values()))
+
+            _wait_until(lambda: manager.get(stopped)["contacts"] > 0)
+            manager.cancel(stopped)
+            _wait_until(lambda: not any(manager.get(job)["status"] in job_manager.ACTIVE_STATUSES
+                                        for job in (timed, stopped)))
+
+            job = manager.get(timed)
+            assert job["status"] == job_manager.COMPLETED
+            assert job["progress"]["reason"] == "time limit reached"
+            assert job["error"] is None
+            assert manager.get(stopped)["status"] == job_manager.STOPPED
+            assert os.path.exists(os.path.join(directory, "timed.csv"))
+            manager.shutdown()
+    finally:
+        for name, method in originals.items():
+            setattr(IndianContactScraper, name, method)
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_time_limit_completes_and_user_stop_stops()
+    print("All job manager tests passed")
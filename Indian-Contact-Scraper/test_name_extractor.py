@@ -0,0 +1,33 @@
+from name_extractor import NameExtractor
+
+
+def test_contact_labels_end_a_name():
+    """Labels like Mobile/Tel/Ph after a name aren't taken as a surname"""
+    text = ("Dr. Rajesh Kumar Mobile: 98450 12345. Dr. Priya Sharma Tel 080 2345 6789, "
+            "Adv. Anil Mehta Ph 9845012345, Dr. Suresh Rao Whatsapp 9845012346, Dr. Meena Iyer Mob 9845012347")
+    assert NameExtractor().extract(text) == [
+        "Dr. Rajesh Kumar", "Dr. Priya Sharma", "Adv. Anil Mehta", "Dr. Suresh Rao", "Dr. Meena Iyer"]
+
+
+def test_degrees_are_not_surnames():
+    """Qualifications after a name end it, however they are written"""
+    extractor = NameExtractor()
+    assert extractor.extract("Dr. Rajesh Kumar Mbbs") == ["Dr. Rajesh Kumar"]
+    assert extractor.extract("Adv. Anil Mehta Llb") == ["Adv. Anil Mehta"]
+    assert extractor.extract("CA Vikas Jain Fca") == ["CA Vikas Jain"]
+    assert extractor.extract("Dr. Priya Sharma MD") == ["Dr. Priya Sharma"]
+    assert extractor.extract("Dr. R. K. Sharma M.B.B.S., MS") == ["Dr. R. K. Sharma"]
+
+
+def test_all_caps_words_only_continue_all_caps_names():
+    extractor = NameExtractor()
+    assert extractor.extract("DR. RAJESH KUMAR MBBS") == ["Dr. Rajesh Kumar"]
+    assert extractor.extract("Vikas Jain FCA, Partner") == ["Vikas Jain"]
+    assert extractor.extract("Dr. Meena Iyer DGO Gynaecologist") == ["Dr. Meena Iyer"]
+
+
+if __name__ == "__main__":
+    test_contact_labels_end_a_name()
+    test_degrees_are_not_surnames()
+    test_all_caps_words_only_continue_all_caps_names()
+    print("All name extraction tests passed")
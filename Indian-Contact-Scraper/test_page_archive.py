@@ -0,0 +1,117 @@
+import csv
+import gzip
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from indian_contact_scraper import IndianContactScraper
+from page_archive import PageArchive, archive_files, index_archive, reextract
+
+PAGES = {
+    "/a": "<html><body><h1>Dr. Ramesh Kumar</h1> mail ramesh@clinic.in call 98765 43210</body></html>",
+    "/b": "<html><body><h1>Dr. Sunita Sharma</h1> mail sunita@hosp.in phone 98123 45678</body></html>",
+}
+
+# Status a page answers with instead of its body, e.g. on a later crawl
+STATUS = {}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path in STATUS:
+            self.send_response(STATUS[self.path])
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = PAGES.get(self.path)
+        if body is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        # Sent compressed; the archive stores the decoded body
+        data = gzip.compress(body.encode("utf-8"))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def _rows(path):
+    with open(path, encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_reextract_keeps_the_live_csv():
+    server = HTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            archive = PageArchive(os.path.join(directory, "warc"), max_file_size=300)
+            live = os.path.join(directory, "runs", "doctors.csv")
+            scraper = IndianContactScraper("Karnataka", "Bangalore", "Doctor", output_file=live, archive=archive)
+            for path in ["/a", "/b", "/missing"]:
+                scraper.extract_contact_info_from_page(base + path)
+            scraper.save_to_csv()
+            archive.close()
+            with open(live, encoding="utf-8") as f:
+                live_before = f.read()
+
+            entries = [entry for path in archive_files([archive.directory]) for entry in index_archive(path)]
+            assert len(entries) == 3
+            assert {entry[6] for entry in entries} == {live}
+
+            counts = reextract([archive.directory], workers=2)
+            target = os.path.join(directory, "runs", "doctors.reextracted.csv")
+            assert counts == {target: 2}
+            assert sorted(row["name"] for row in _rows(target)) == ["Dr. Ramesh Kumar", "Dr. Sunita Sharma"]
+            with open(live, encoding="utf-8") as f:
+                assert f.read() == live_before
+
+            # --output-dir keeps the run's file name
+            out = os.path.join(directory, "out")
+            assert reextract([archive.directory], output_dir=out, workers=1) == {
+                os.path.join(out, "doctors.reextracted.csv"): 2}
+    finally:
+        server.shutdown()
+
+
+def test_only_gone_pages_replace_an_archived_200():
+    server = HTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            archive = PageArchive(os.path.join(directory, "warc"))
+            live = os.path.join(directory, "doctors.csv")
+            for statuses in [{}, {"/a": 304, "/b": 410}]:
+                STATUS.clear()
+                STATUS.update(statuses)
+                # A fresh run each crawl, so both pages are fetched again
+                scraper = IndianContactScraper("Karnataka", "Bangalore", "Doctor", output_file=live, archive=archive)
+                for path in ["/a", "/b"]:
+                    scraper.extract_contact_info_from_page(base + path)
+            archive.close()
+
+            entries = [entry for path in archive_files([archive.directory]) for entry in index_archive(path)]
+            assert sorted(entry[7] for entry in entries) == [200, 200, 304, 410]
+
+            # The 304 keeps the earlier copy of /a; the 410 drops /b
+            target = os.path.join(directory, "doctors.reextracted.csv")
+            assert reextract([archive.directory], workers=1) == {target: 1}
+            assert [row["name"] for row in _rows(target)] == ["Dr. Ramesh Kumar"]
+    finally:
+        STATUS.clear()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_reextract_keeps_the_live_csv()
+    test_only_gone_pages_replace_an_archived_200()
+    print("All page archive tests passed")
@@ -0,0 +1,39 @@
+import codecs
+
+from page_decoding import META_SNIFF_BYTES, decode_page, detect_encoding, is_ascii_compatible
+
+NAME = "श्री रमेश कुमार"
+
+
+def test_encoding_comes_from_bom_header_then_meta():
+    page = f'<html><head><meta charset="windows-1252"></head><body>Café {NAME}</body></html>'
+    # A byte order mark beats everything else
+    assert detect_encoding(codecs.BOM_UTF8 + page.encode("utf-8"), "text/html; charset=cp1252") == "utf-8-sig"
+    assert decode_page(codecs.BOM_UTF16_LE + page.encode("utf-16-le"))[0] == page
+    # Then the Content-Type header, then the <meta> tag
+    assert detect_encoding(page.encode("utf-8"), 'text/html; charset="UTF-8"') == "utf-8"
+    assert detect_encoding(b'<meta charset="windows-1252"><p>Caf\xe9</p>', "text/html") == "cp1252"
+    assert detect_encoding(b'<meta http-equiv="Content-Type" content="text/html; charset=Shift_JIS">') == "shift_jis"
+
+    # ISO-8859-1 is read as windows-1252, like browsers do
+    text, encoding = decode_page("Rs. 500 – Dr. Café".encode("cp1252"), "text/html; charset=ISO-8859-1")
+    assert (text, encoding) == ("Rs. 500 – Dr. Café", "cp1252")
+
+
+def test_bad_or_missing_declarations_fall_back_to_utf8():
+    page = f"<p>{NAME} 98450 12345</p>".encode("utf-8")
+    assert decode_page(page, "text/html")[0] == f"<p>{NAME} 98450 12345</p>"
+    assert detect_encoding(page, "text/html; charset=no-such-charset") == "utf-8"
+    # A UTF-16 <meta> on a page readable as ASCII is ignored
+    assert detect_encoding(b'<meta charset="utf-16">' + page) == "utf-8"
+    # Only the start of the page is searched for a <meta> tag
+    late = b"<p>" + b" " * META_SNIFF_BYTES + b'</p><meta charset="windows-1252">'
+    assert detect_encoding(late) == "utf-8"
+
+    assert is_ascii_compatible("cp1252") and not is_ascii_compatible("utf-16")
+
+
+if __name__ == "__main__":
+    test_encoding_comes_from_bom_header_then_meta()
+    test_bad_or_missing_declarations_fall_back_to_utf8()
+    print("All page decoding tests passed")
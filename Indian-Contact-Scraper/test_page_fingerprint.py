@@ -0,0 +1,62 @@
+from indian_contact_scraper import IndianContactScraper
+from page_fingerprint import PageFingerprintStore, content_hash
+
+GUIDE = (
+    "Our directory lists verified medical practitioners across the city with clinic timings, fees, "
+    "qualifications and patient reviews so you can book a consultation with confidence. Every listing "
+    "is checked by our editorial team twice a year, and practitioners can update their own details "
+    "through the partner portal at any time. Ratings are collected only from patients who completed "
+    "an appointment booked through this website. Emergency services are not offered through the "
+    "directory; in an emergency please call your nearest hospital or dial the national helpline. "
+    "Information on this page is provided for general guidance and does not replace professional "
+    "medical advice. Consultation fees shown are indicative and may change without notice. Insurance "
+    "acceptance varies by clinic, so confirm coverage directly before your visit. Parking, wheelchair "
+    "access and languages spoken are listed where the clinic has shared them with us."
+)
+
+# Real directory pages carry far more shared text than profile text; numbering
+# the words keeps the copies from collapsing into the same shingles
+BOILERPLATE = " ".join(f"{word}{copy}" for copy in range(4) for word in GUIDE.split())
+
+TEMPLATE = ("<html><head><title>Doctor profile</title><script>var ads = 1;</script></head><body>"
+            "<nav>Home About Doctors Hospitals Blog</nav><p>{boilerplate}</p>"
+            "<div class='profile'><h2>{name}</h2><p>Phone: {phone}</p></div>"
+            "<footer>Copyright 2024 Directory. All rights reserved.</footer></body></html>")
+
+
+def profile_page(name, phone, ad=""):
+    return TEMPLATE.format(boilerplate=BOILERPLATE + ad, name=name, phone=phone)
+
+
+def test_near_duplicate_needs_same_contacts():
+    store = PageFingerprintStore()
+    page = profile_page("Dr. Ravi Kumar", "98450 12345")
+    store.add(content_hash(page), store.text_fingerprint(page), "https://d.example/doctor/0", {"phones": ["x"]})
+
+    # The same profile re-served with a different ad is a near-duplicate
+    reserved = profile_page("Dr. Ravi Kumar", "98450 12345", ad=" Sponsored")
+    assert store.lookup_near(store.text_fingerprint(reserved))[0] == "https://d.example/doctor/0"
+
+    # Another doctor on the same template is not
+    other = profile_page("Dr. Priya Sharma", "98450 54321")
+    assert store.lookup_near(store.text_fingerprint(other)) is None
+
+
+def test_template_pages_with_different_phones_are_all_extracted():
+    scraper = IndianContactScraper("Karnataka", "Bangalore", "doctor")
+    doctors = [("Dr. Ravi Kumar", "98450 12345"), ("Dr. Priya Sharma", "98450 54321"),
+               ("Dr. Anil Mehta", "98450 67890")]
+    for i, (name, phone) in enumerate(doctors):
+        page = profile_page(name, phone).encode("utf-8")
+        scraper.extract_from_content(f"https://d.example/doctor/{i}", page, {"Content-Type": "text/html"})
+    scraper.run.flush()
+
+    phones = {contact["phone"] for contact in scraper.contacts}
+    assert phones == {"+919845012345", "+919845054321", "+919845067890"}
+    assert scraper.run.page_fingerprints.stats["near_duplicates"] == 0
+
+
+if __name__ == "__main__":
+    test_near_duplicate_needs_same_contacts()
+    test_template_pages_with_different_phones_are_all_extracted()
+    print("All page fingerprint tests passed")
@@ -0,0 +1,80 @@
+import csv
+import os
+import tempfile
+
+from csv_manager import CSVManager
+from phone_normalizer import PhoneNormalizer, normalize_phone_column
+
+
+def test_normalize_formats():
+    """Common ways of writing the same Indian number all normalize to E.164"""
+    normalizer = PhoneNormalizer()
+    for raw in ["98450 12345", "098450 12345", "+91-98450-12345", "919845012345", "(+91) 98450-12345"]:
+        assert normalizer.normalize(raw) == "+919845012345", raw
+    assert normalizer.normalize("080 2345 6789") == "+918023456789"
+
+
+def test_normalize_rejects_invalid():
+    normalizer = PhoneNormalizer()
+    for raw in ["12345", "9999999999", "", "Not found"]:
+        assert normalizer.normalize(raw) is None, raw
+
+
+def test_extract_from_text():
+    normalizer = PhoneNormalizer()
+    text = "Call 98450 12345 or 080-23456789. Mobile: +91 98450 12345"
+    assert normalizer.extract(text) == ["+919845012345", "+918023456789"]
+    assert normalizer.extract(text.encode("ascii")) == ["+919845012345", "+918023456789"]
+
+
+def test_extract_numbers_next_to_each_other():
+    """Numbers separated only by spaces are split at group boundaries, not merged into a fake one"""
+    normalizer = PhoneNormalizer()
+    assert normalizer.extract("98450 12345 98450 12346") == ["+919845012345", "+919845012346"]
+    assert normalizer.extract("98450 12345 080 2345 6789") == ["+919845012345", "+918023456789"]
+    assert normalizer.extract("2023-10-19 98450 12345") == ["+919845012345"]
+    # Digits left over after dropping a group don't pass as a generic-area landline
+    assert normalizer.extract("5 12345 67890") == []
+
+
+def test_normalize_phone_column():
+    rows = [{"phone": "098450 12345"}, {"phone": "+919845012345"}, {"phone": "12345"}, {"phone": "Not found"}]
+    assert normalize_phone_column(rows) == 2
+    assert [row["phone"] for row in rows] == ["+919845012345", "+919845012345", "Not found", "Not found"]
+
+
+def _write_csv(path, phones):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["name", "phone"])
+        writer.writeheader()
+        for i, phone in enumerate(phones):
+            writer.writerow({"name": f"Contact {i}", "phone": phone})
+
+
+def test_csv_manager_normalize_phone_numbers():
+    with tempfile.TemporaryDirectory() as directory:
+        manager = CSVManager(directory)
+        path = manager.get_file_path("contacts.csv")
+
+        # Nothing to change: no backup is made
+        _write_csv(path, ["+919845012345"])
+        assert manager.normalize_phone_numbers("contacts.csv") == 0
+        assert not os.path.exists(path + ".backup")
+
+        _write_csv(path, ["098450 12345", "+918023456789"])
+        assert manager.normalize_phone_numbers("contacts.csv") == 1
+        assert os.path.exists(path + ".backup")
+        with open(path, encoding="utf-8") as f:
+            assert [row["phone"] for row in csv.DictReader(f)] == ["+919845012345", "+918023456789"]
+
+        assert manager.normalize_phone_numbers("missing.csv") is None
+
+
+if __name__ == "__main__":
+    test_normalize_formats()
+    test_normalize_rejects_invalid()
+    test_extract_from_text()
+    test_extract_numbers_next_to_each_other()
+    test_normalize_phone_column()
+    test_csv_manager_normalize_phone_numbers()
+    print("All phone normalization tests passed")
@@ -0,0 +1,46 @@
+import os
+import tempfile
+
+from query_planner import QueryPlanner, query_scope
+
+TEMPLATES = ["{profession} in {city}", "best {profession} {city} contact", "{profession} near {city} phone"]
+
+
+def test_templates_are_ordered_by_history():
+    with tempfile.TemporaryDirectory() as directory:
+        planner = QueryPlanner(os.path.join(directory, "planner.db"))
+        scope = query_scope("Bangalore", "Doctor")
+        # No history: the original order is kept
+        assert planner.order(TEMPLATES, scope) == TEMPLATES
+
+        planner.record(TEMPLATES[0], scope, requests=10, contacts=0)
+        planner.record(TEMPLATES[2], scope, requests=10, contacts=30)
+        assert planner.order(TEMPLATES, scope) == [TEMPLATES[2], TEMPLATES[1], TEMPLATES[0]]
+
+        # Another city starts from the templates' record everywhere else
+        assert planner.order(TEMPLATES, query_scope("Mysore", "Doctor"))[0] == TEMPLATES[2]
+        assert scope == query_scope(" bangalore", "DOCTOR ")
+
+
+def test_low_yield_queries_and_the_budget_stop_paging():
+    with tempfile.TemporaryDirectory() as directory:
+        planner = QueryPlanner(os.path.join(directory, "planner.db"), request_budget=3, min_pages=1)
+        scope = query_scope("Bangalore", "Doctor")
+        planner.record(TEMPLATES[0], scope, requests=20, contacts=0)
+
+        # Always at least min_pages, then a query that finds nothing anywhere is cut off
+        assert planner.should_continue(TEMPLATES[0], scope, pages_done=0, requests=0, contacts=0)
+        assert not planner.should_continue(TEMPLATES[0], scope, pages_done=1, requests=1, contacts=0)
+        # A good page in this run or a good history keeps it going
+        assert planner.should_continue(TEMPLATES[0], scope, pages_done=1, requests=1, contacts=2)
+        assert planner.should_continue(TEMPLATES[1], scope, pages_done=1, requests=1, contacts=0)
+
+        planner.note_requests(3)
+        assert not planner.has_budget()
+        assert not planner.should_continue(TEMPLATES[1], scope, pages_done=0, requests=0, contacts=0)
+
+
+if __name__ == "__main__":
+    test_templates_are_ordered_by_history()
+    test_low_yield_queries_and_the_budget_stop_paging()
+    print("All query planner tests passed")
@@ -0,0 +1,48 @@
+import time
+
+from indian_contact_scraper import IndianContactScraper
+from regex_backend import SCAN_WINDOW, ExtractionDeadline, ExtractionTimeout, compile_pattern, findall
+
+
+def test_matches_across_windows_are_found_once():
+    pattern = compile_pattern(r"[a-z]+@clinic\.in")
+    # One address straddles the first window boundary, one sits in the overlap
+    text = "." * (SCAN_WINDOW - 5) + " ravi@clinic.in " + "." * 100 + " meena@clinic.in " + "." * SCAN_WINDOW
+    assert findall(pattern, text, ExtractionDeadline(5.0)) == ["ravi@clinic.in", "meena@clinic.in"]
+
+
+def test_scan_stops_once_the_budget_runs_out():
+    pattern = compile_pattern(r"\d{10}")
+    deadline = ExtractionDeadline(0.01)
+    time.sleep(0.02)
+    try:
+        findall(pattern, "no numbers here " * 100, deadline)
+    except ExtractionTimeout:
+        pass
+    else:
+        raise AssertionError("the scan should have been abandoned")
+
+
+def test_html_parsing_counts_against_the_page_budget():
+    scraper = IndianContactScraper("Karnataka", "Bangalore", "Doctor", extraction_budget=0.1)
+    parse_html = scraper.parse_html
+
+    def slow_parse(html_content):
+        time.sleep(0.2)
+        return parse_html(html_content)
+
+    scraper.parse_html = slow_parse
+    page = b"<html><body><h2>Dr. Ravi Kumar</h2> ravi@clinic.in 98450 12345</body></html>"
+    result, _ = scraper.extract_from_content("https://example.com/a", page,
+                                             {"Content-Type": "text/html; charset=utf-8"})
+    # The emails and phones made it; the name extractor was abandoned over the budget
+    assert result["emails"] == ["ravi@clinic.in"]
+    assert result["names"] == []
+    assert scraper.run.extraction_timeouts.value == 1
+
+
+if __name__ == "__main__":
+    test_matches_across_windows_are_found_once()
+    test_scan_stops_once_the_budget_runs_out()
+    test_html_parsing_counts_against_the_page_budget()
+    print("All regex backend tests passed")
@@ -0,0 +1,57 @@
+from indian_contact_scraper import IndianContactScraper
+from scrape_events import CONTACT_FOUND, FINISHED, PAGE_FETCHED, QUERY_STARTED, STATS, ThrottledObserver
+
+
+def test_frequent_events_are_coalesced():
+    delivered = []
+    observer = ThrottledObserver(delivered.append, interval=60)
+    observer.emit(STATS, contacts=1)
+    for contacts in range(2, 6):
+        observer.emit(STATS, contacts=contacts)
+    observer.emit(PAGE_FETCHED, url="https://example.com")
+    # Only the first got through; the rest wait, newest per kind
+    assert [event.data for event in delivered] == [{"contacts": 1}]
+
+    observer.emit(QUERY_STARTED, query="doctors in Bangalore")
+    assert [event.kind for event in delivered] == [STATS, STATS, PAGE_FETCHED, QUERY_STARTED]
+    assert delivered[1].data == {"contacts": 5}
+
+
+def test_coalesced_contacts_are_batched():
+    delivered = []
+    observer = ThrottledObserver(delivered.append, interval=60)
+    for count, name in enumerate(["Dr. Ravi Kumar", "Dr. Priya Sharma", "Dr. Anil Mehta"], 1):
+        observer.emit(CONTACT_FOUND, contact={"name": name}, contacts=count)
+    observer.flush()
+
+    # The first went out alone; the two held back arrive together, none lost
+    assert [[c["name"] for c in event.data["contacts_found"]] for event in delivered] == [
+        ["Dr. Ravi Kumar"], ["Dr. Priya Sharma", "Dr. Anil Mehta"]]
+    assert delivered[1].data["contacts"] == 3
+
+
+def test_observer_is_cleared_after_scrape():
+    scraper = IndianContactScraper("Karnataka", "Bangalore", "Doctor")
+    scraper.get_query_templates = lambda: ["{profession} in {city}"]
+    # Search results come from the "cache" and are empty, so no request is made
+    scraper.get_search_result_urls = lambda query, start=0, limit=None: ([], True)
+
+    events = []
+    scraper.scrape(max_pages=1, observer=events.append)
+    assert [event.kind for event in events][0] == QUERY_STARTED
+    # Query progress uses the same key in every event that carries it
+    assert events[0].data["query_index"] == 1 and events[0].data["total"] == 1
+    assert events[-1].kind == FINISHED and events[-1].data["completed"]
+    assert scraper.run.observer is None
+
+    # Nothing more reaches the old callback
+    count = len(events)
+    scraper.run.emit(STATS, contacts=0)
+    assert len(events) == count
+
+
+if __name__ == "__main__":
+    test_frequent_events_are_coalesced()
+    test_coalesced_contacts_are_batched()
+    test_observer_is_cleared_after_scrape()
+    print("All scrape event tests passed")
@@ -0,0 +1,58 @@
+import threading
+
+from indian_contact_scraper import IndianContactScraper
+from page_prefilter import PagePrefilter
+from scraper_state import AtomicCounter, ScrapeRun
+
+
+def test_counter_reads_and_increments_from_many_threads():
+    counter = AtomicCounter()
+    seen = []
+
+    def work():
+        for _ in range(2000):
+            counter.increment()
+            seen.append(counter.value)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.value == 16000
+    # A read never reports more increments than have happened
+    assert max(seen) == 16000
+    counter.increment(5)
+    assert int(counter) == 16005 and str(counter) == "16005"
+
+
+def test_prefilter_stats_are_per_run():
+    prefilter = PagePrefilter()
+    first, second = ScrapeRun(), ScrapeRun()
+    prefilter.scan(b"<p>Call 98450 12345</p>", first.prefilter_stats)
+    prefilter.scan(b"<p>Nothing here</p>", first.prefilter_stats)
+    prefilter.scan(b"<p>mail priya@clinic.in</p>", second.prefilter_stats)
+
+    assert first.prefilter_stats["pages_scanned"].value == 2
+    assert first.prefilter_stats["pages_skipped"].value == 1
+    assert second.prefilter_stats["pages_scanned"].value == 1
+    assert second.prefilter_stats["pages_skipped"].value == 0
+    assert "Pages skipped by prefilter: 1/2" in prefilter.summary(first.prefilter_stats)
+
+
+def test_scrape_leaves_the_shared_configuration_alone():
+    scraper = IndianContactScraper("Karnataka", "Bangalore", "Doctor")
+    scraper.get_query_templates = lambda: ["{profession} in {city}"]
+    scraper.get_search_result_urls = lambda query, start=0, limit=None: ([], True)
+    config = scraper.config
+    scraper.scrape(max_pages=1)
+    assert scraper.config is config and not scraper.debug
+    assert IndianContactScraper("Karnataka", "Bangalore", "Doctor", debug=True).debug
+
+
+if __name__ == "__main__":
+    test_counter_reads_and_increments_from_many_threads()
+    test_prefilter_stats_are_per_run()
+    test_scrape_leaves_the_shared_configuration_alone()
+    print("All scraper state tests passed")
@@ -0,0 +1,54 @@
+import serp_links
+from serp_links import CHUNK_SIZE, decode_result_href, iter_result_links
+
+
+def _result(href, title="Clinic"):
+    return f'<div class="g"><a href="{href}"><h3>{title}</h3></a></div>'
+
+
+def test_both_result_layouts_in_rank_order():
+    html = ("<html><body>"
+            + _result("https://clinic-one.example/")
+            + '<h3><a href="/url?q=https://clinic-two.example/contact%3Fid%3D1&amp;sa=U">Two</a></h3>'
+            + '<a href="https://www.google.com/search?q=more">More results</a>'
+            + _result("https://clinic-one.example/")
+            + '<a href="/url?q=https://clinic-three.example/&sa=U">Three</a>'
+            + '<a href="https://ads.example/">Sponsored</a>'
+            + "</body></html>")
+    # Search engine links, duplicates and plain external links are left out
+    assert list(iter_result_links(html)) == [
+        "https://clinic-one.example/", "https://clinic-two.example/contact?id=1", "https://clinic-three.example/"]
+
+
+def test_links_split_across_chunks_and_early_stop():
+    padding = "<p>" + "x" * (CHUNK_SIZE - 20) + "</p>"
+    html = padding + _result("https://a.example/") + "".join(
+        padding + _result(f"https://site{i}.example/") for i in range(10))
+
+    assert list(iter_result_links(html))[:2] == ["https://a.example/", "https://site0.example/"]
+    assert len(list(iter_result_links(html))) == 11
+
+    # With a limit, the rest of the page isn't tokenized
+    fed = []
+    feed = serp_links.ResultLinkParser.feed
+    serp_links.ResultLinkParser.feed = lambda self, data: (fed.append(len(data)), feed(self, data))[1]
+    try:
+        assert list(iter_result_links(html, limit=2)) == ["https://a.example/", "https://site0.example/"]
+    finally:
+        serp_links.ResultLinkParser.feed = feed
+    assert sum(fed) < len(html) // 2
+
+
+def test_unknown_layout_falls_back_to_external_links():
+    html = ('<a href="https://clinic.example/">Clinic</a><a href="https://maps.google.com/x">Map</a>'
+            '<a href="/preferences">Settings</a>')
+    assert list(iter_result_links(html)) == ["https://clinic.example/"]
+    assert decode_result_href("/url?sa=U") is None
+    assert decode_result_href("https://webcache.googleusercontent.com/search?q=cache") is None
+
+
+if __name__ == "__main__":
+    test_both_result_layouts_in_rank_order()
+    test_links_split_across_chunks_and_early_stop()
+    test_unknown_layout_falls_back_to_external_links()
+    print("All search result link tests passed")
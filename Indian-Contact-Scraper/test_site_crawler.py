@@ -0,0 +1,80 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from indian_contact_scraper import IndianContactScraper
+from site_crawler import CrawlFrontier, SiteCrawler, score_link
+
+PAGES = {
+    "/": ('<a href="/blog/clinic-news">Blog</a><a href="/privacy">Privacy</a>'
+          '<a href="https://other.example/contact">Partner contact</a>'
+          '<a href="/our-team">Our Team</a><a href="/contact-us">Contact Us</a>'),
+    "/contact-us": '<a href="/contact-us/branches">Branches</a> reception@clinic.in',
+    "/our-team": "<h2>Dr. Meena Rao</h2>",
+    "/our-doctors": "<h2>Dr. Ravi Kumar</h2>",
+    "/about": '<a href="/contact-us">Contact</a><a href="/staff">Staff</a><a href="/our-lawyers">Our Lawyers</a>',
+    "/our-lawyers": "<h2>Adv. Kiran Shetty</h2>",
+    "/staff": "<h2>Dr. Anil Gowda</h2>",
+    "/sitemap.xml": "<urlset><url><loc>{base}/our-doctors</loc></url></urlset>",
+}
+
+REQUESTED = []
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        REQUESTED.append(self.path)
+        body = PAGES.get(self.path)
+        if body is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        data = body.format(base=f"http://127.0.0.1:{self.server.server_port}").encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_links_are_scored_and_queued_best_first():
+    assert score_link("https://clinic.example/contact-us", "Contact Us") > score_link("https://clinic.example/about")
+    assert score_link("https://clinic.example/contact_us") > 0
+    assert score_link("https://clinic.example/team/brochure.pdf", "Our Team") == 0
+    assert score_link("https://clinic.example/login", "Contact") == 0
+
+    frontier = CrawlFrontier("https://www.clinic.example/")
+    frontier.add_links("https://www.clinic.example/", PAGES["/"], 1)
+    frontier.add_sitemap("<loc>https://clinic.example/our-doctors</loc><loc>https://clinic.example/</loc>")
+    # Off-site, skipped and already-queued links are left out; www. is the same site
+    assert [frontier.pop() for _ in range(4)] == [
+        ("https://www.clinic.example/contact-us", 1), ("https://www.clinic.example/our-team", 1),
+        ("https://clinic.example/our-doctors", 1), None]
+
+
+def test_crawl_keeps_to_the_depth_and_per_domain_budget():
+    server = HTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    try:
+        crawler = SiteCrawler(max_depth=1, max_pages=4)
+        scraper = IndianContactScraper("Karnataka", "Bangalore", "Doctor", site_crawler=crawler)
+        scraper.extract_contact_info_from_page(base + "/")
+        # Best links first, sitemap pages included; links two clicks deep are left alone
+        assert REQUESTED == ["/", "/sitemap.xml", "/contact-us", "/our-team", "/our-doctors"]
+
+        # Another landing page on the same site gets what is left of the budget
+        scraper.extract_contact_info_from_page(base + "/about")
+        assert REQUESTED[5:] == ["/about", "/our-lawyers"]
+        assert scraper.run.total_crawled() == 4
+        scraper.fetcher.close()
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_links_are_scored_and_queued_best_first()
+    test_crawl_keeps_to_the_depth_and_per_domain_budget()
+    print("All site crawler tests passed")
@@ -0,0 +1,66 @@
+from indian_contact_scraper import IndianContactScraper
+
+PAGE = """<html><head>
+<script type="application/ld+json">
+{"@context": "https://schema.org", "@type": "Physician", "name": "Dr. Ravi Kumar",
+ "telephone": "+91 98450 12345", "email": "ravi.kumar@clinic.example"}
+</script></head><body>
+<h1>Dr. Ravi Kumar</h1><p>Call +91 98450 12345 or write to ravi.kumar@clinic.example</p>
+<h2>Also consulting here</h2>
+<p>Dr. Priya Sharma, Mobile: 98450 54321, priya.sharma@clinic.example</p>
+</body></html>"""
+
+
+def extract(page):
+    scraper = IndianContactScraper("Karnataka", "Bangalore", "doctor")
+    scraper.extract_from_content("https://clinic.example/team", page.encode("utf-8"), {"Content-Type": "text/html"})
+    scraper.run.flush()
+    return scraper.contacts
+
+
+def test_structured_and_visible_contacts_are_merged():
+    """The JSON-LD Physician doesn't hide the other doctor listed in the page text"""
+    contacts = {contact["phone"]: contact for contact in extract(PAGE)}
+    assert set(contacts) == {"+919845012345", "+919845054321"}
+    assert contacts["+919845012345"]["name"] == "Dr. Ravi Kumar"
+    assert contacts["+919845012345"]["email"] == "ravi.kumar@clinic.example"
+    assert contacts["+919845054321"]["email"] == "priya.sharma@clinic.example"
+
+
+def test_structured_data_wins_on_conflicts():
+    """A contact in both sources is recorded once, with the structured values"""
+    contacts = extract(PAGE.replace("<p>Dr. Priya Sharma, Mobile: 98450 54321, priya.sharma@clinic.example</p>", ""))
+    assert len(contacts) == 1
+    assert contacts[0]["name"] == "Dr. Ravi Kumar"
+    assert contacts[0]["phone"] == "+919845012345"
+
+
+def test_extractors_covered_by_structured_data_are_skipped():
+    """With nothing on the page beyond the structured contact, the email, phone and name extractors don't run"""
+    scraper = IndianContactScraper("Karnataka", "Bangalore", "doctor")
+    extract_names = scraper.extract_names
+    name_scans = []
+
+    def counting_extract_names(*args, **kwargs):
+        name_scans.append(args)
+        return extract_names(*args, **kwargs)
+
+    scraper.extract_names = counting_extract_names
+    stats = scraper.run.prefilter_stats
+    covered = PAGE.replace("<p>Dr. Priya Sharma, Mobile: 98450 54321, priya.sharma@clinic.example</p>", "")
+    scraper.extract_from_content("https://clinic.example/ravi", covered.encode("utf-8"), {"Content-Type": "text/html"})
+    assert stats["emails_covered"].value == 1 and stats["phones_covered"].value == 1
+    assert name_scans == []
+
+    # Another doctor in the text still gets the extractors
+    scraper.extract_from_content("https://clinic.example/team", PAGE.encode("utf-8"), {"Content-Type": "text/html"})
+    scraper.run.flush()
+    assert stats["emails_covered"].value == 1 and len(name_scans) == 1
+    assert {contact["phone"] for contact in scraper.contacts} == {"+919845012345", "+919845054321"}
+
+
+if __name__ == "__main__":
+    test_structured_and_visible_contacts_are_merged()
+    test_structured_data_wins_on_conflicts()
+    test_extractors_covered_by_structured_data_are_skipped()
+    print("All structured data tests passed")
@@ -0,0 +1,136 @@
+import os
+import tempfile
+import threading
+import time
+
+from distributed import Coordinator, Worker, job_key
+from work_queue import PAGE_TASK, SEARCH_TASK, SQLiteWorkQueue
+
+
+def _queue(directory):
+    return SQLiteWorkQueue(os.path.join(directory, "queue.db"))
+
+
+def test_dedup_and_priority():
+    with tempfile.TemporaryDirectory() as directory:
+        queue = _queue(directory)
+        assert queue.put(SEARCH_TASK, {"query": "dentist"}, dedup_key="search:dentist:0")
+        assert not queue.put(SEARCH_TASK, {"query": "dentist"}, dedup_key="search:dentist:0")
+        assert queue.put(PAGE_TASK, {"url": "https://example.com"}, dedup_key="page:https://example.com")
+
+        # Page tasks are claimed before search tasks
+        assert queue.claim("w1").kind == PAGE_TASK
+        assert queue.claim("w1").kind == SEARCH_TASK
+        assert queue.claim("w1") is None
+
+
+def test_expired_lease_is_reclaimed():
+    with tempfile.TemporaryDirectory() as directory:
+        queue = _queue(directory)
+        queue.put(PAGE_TASK, {"url": "https://example.com"})
+        first = queue.claim("w1", lease=0.2)
+        assert queue.claim("w2", lease=0.2) is None
+
+        time.sleep(0.3)
+        second = queue.claim("w2", lease=60)
+        assert second.id == first.id and second.attempts == 2
+
+        # The first worker's token no longer holds the lease
+        assert not queue.extend(first)
+        assert queue.fail(first, "timeout") == "lost"
+        assert not queue.complete(first, job="job", contacts=[{"name": "stale"}])
+        assert queue.complete(second, job="job", contacts=[{"name": "fresh"}])
+        assert queue.contacts("job") == [{"name": "fresh"}]
+        assert queue.stats()["done"] == 1
+
+
+def test_failed_task_is_retried_then_given_up():
+    with tempfile.TemporaryDirectory() as directory:
+        queue = _queue(directory)
+        queue.put(PAGE_TASK, {"url": "https://example.com"})
+        assert queue.fail(queue.claim("w1"), "timeout", max_attempts=2) == "pending"
+        assert queue.fail(queue.claim("w1"), "timeout", max_attempts=2) == "failed"
+        assert queue.claim("w1") is None
+        assert queue.stats()["failed"] == 1
+
+
+class _SlowScraper:
+    """Stands in for a scraper whose page visit outlasts the worker's lease"""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.contacts = []
+
+    def extract_contact_info_from_page(self, url):
+        time.sleep(self.seconds)
+        self.contacts.append({"name": "Dr. Priya Sharma", "url": url})
+
+
+def test_worker_keeps_its_lease_while_busy():
+    with tempfile.TemporaryDirectory() as directory:
+        queue = _queue(directory)
+        queue.put(PAGE_TASK, {"state": "Karnataka", "city": "Bangalore", "profession": "Doctor",
+                              "url": "https://example.com"})
+        other = _queue(directory)
+        worker = Worker(queue, lambda *job: _SlowScraper(1.0), worker_id="w1", lease=0.3, host_interval=0)
+
+        thread = threading.Thread(target=worker.run_once)
+        thread.start()
+        # Well past the original lease, the task must still be taken
+        time.sleep(0.7)
+        assert other.claim("w2") is None
+        thread.join()
+
+        assert worker.stats["page"] == 1 and worker.stats["contacts"] == 1
+        assert queue.stats()["done"] == 1
+
+
+class _SearchScraper:
+    """Every search returns the same two result pages"""
+
+    domain_stats = None
+
+    def get_search_result_urls(self, query, start=0, limit=None):
+        return ["https://example.com/a", "https://example.com/b"], True
+
+
+def test_dedup_is_scoped_to_a_run_of_a_job():
+    with tempfile.TemporaryDirectory() as directory:
+        queue = _queue(directory)
+        coordinator = Coordinator(queue, "Karnataka", "Bangalore", "Doctor",
+                                  output_file=os.path.join(directory, "doctors.csv"))
+        seeded = coordinator.seed(pages_per_query=1)
+        assert seeded > 0
+        other = Coordinator(queue, "Karnataka", "Mysore", "Doctor", output_file=os.path.join(directory, "m.csv"))
+        assert other.seed(pages_per_query=1) == seeded
+
+        # The same result page is queued once per job
+        worker = Worker(queue, None, worker_id="w1", search_interval=0)
+        pages = []
+        for task in iter(lambda: queue.claim("w1"), None):
+            if task.kind == SEARCH_TASK:
+                worker.run_search(task, _SearchScraper())
+                queue.complete(task)
+            else:
+                pages.append(task)
+        assert len(pages) == 4
+        assert {(task.payload["city"], task.payload["url"]) for task in pages} == {
+            (city, url) for city in ("Bangalore", "Mysore")
+            for url in ("https://example.com/a", "https://example.com/b")}
+        job = job_key("Karnataka", "Bangalore", "Doctor")
+        for task in pages:
+            queue.complete(task, job=job, contacts=[{"name": "Dr. Priya Sharma"}])
+        assert len(queue.contacts(job)) == 4
+
+        # Seeding the job again starts a new run instead of finding it all queued
+        assert coordinator.seed(pages_per_query=1) == seeded
+        assert queue.contacts(job) == []
+
+
+if __name__ == "__main__":
+    test_dedup_and_priority()
+    test_expired_lease_is_reclaimed()
+    test_failed_task_is_retried_then_given_up()
+    test_worker_keeps_its_lease_while_busy()
+    test_dedup_is_scoped_to_a_run_of_a_job()
+    print("All work queue tests passed")
@@ -0,0 +1,391 @@
+import json
+import os
+import threading
+import time
+import uuid
+
+from storage import DEFAULT_CACHE_DIR, open_database
+
+# Redis (or anything speaking its protocol) is optional; SQLite is always available
+try:
+    import redis
+except ImportError:
+    redis = None
+
+DEFAULT_QUEUE_PATH = os.path.join(DEFAULT_CACHE_DIR, "work_queue.db")
+
+# Task kinds; page tasks are claimed before search tasks so results drain steadily
+SEARCH_TASK = "search"
+PAGE_TASK = "page"
+TASK_PRIORITY = {PAGE_TASK: 1, SEARCH_TASK: 0}
+
+# How long Redis keeps a run's dedup keys after its last enqueue
+DEDUP_TTL = 7 * 24 * 3600
+
+
+def new_run_id():
+    """Identifier for one seeding of a job; dedup keys are scoped to it"""
+    return uuid.uuid4().hex[:12]
+
+
+class Task:
+    """A claimed unit of work; token proves the claimant still holds the lease"""
+
+    def __init__(self, task_id, kind, payload, attempts, token):
+        self.id = task_id
+        self.kind = kind
+        self.payload = payload
+        self.attempts = attempts
+        self.token = token
+
+    def __repr__(self):
+        return f"Task({self.id}, {self.kind}, attempts={self.attempts})"
+
+
+class SQLiteWorkQueue:
+    """
+    Work queue in a SQLite file that every worker can open (local disk or a
+    shared filesystem). Claims are single UPDATE statements, so two workers
+    never get the same task; a lease that runs out makes the task claimable again.
+    """
+
+    def __init__(self, path=DEFAULT_QUEUE_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = open_database(path)
+        self.connection.executescript(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " kind TEXT NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " dedup_key TEXT UNIQUE,"
+            " priority INTEGER NOT NULL DEFAULT 0,"
+            " status TEXT NOT NULL DEFAULT 'pending',"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " worker TEXT,"
+            " token TEXT,"
+            " lease_expires REAL,"
+            " error TEXT,"
+            " updated_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS tasks_claim ON tasks (status, priority, id);"
+            "CREATE TABLE IF NOT EXISTS task_contacts ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " job TEXT NOT NULL,"
+            " contact TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS host_slots ("
+            " host TEXT PRIMARY KEY,"
+            " next_at REAL NOT NULL);"
+        )
+        self.connection.commit()
+
+    def put(self, kind, payload, dedup_key=None, scope=None):
+        """
+        Enqueue a task; returns False if a task with the same dedup key was
+        already enqueued in the same scope (a job's run, see start_run)
+        """
+        if dedup_key is not None and scope:
+            dedup_key = f"{scope}:{dedup_key}"
+        with self.lock:
+            cursor = self.connection.execute(
+                "INSERT OR IGNORE INTO tasks (kind, payload, dedup_key, priority, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (kind, json.dumps(payload), dedup_key, TASK_PRIORITY.get(kind, 0), time.time())
+            )
+            self.connection.commit()
+        return cursor.rowcount == 1
+
+    def start_run(self, job):
+        """
+        Begin a new run of a job: drops the contacts and the finished tasks'
+        dedup keys of its earlier runs, and returns the new run's id
+        """
+        prefix = f"{job}|"
+        with self.lock:
+            self.connection.execute(
+                "UPDATE tasks SET dedup_key = NULL "
+                "WHERE substr(dedup_key, 1, ?) = ? AND status IN ('done', 'failed')",
+                (len(prefix), prefix)
+            )
+            self.connection.execute("DELETE FROM task_contacts WHERE job = ?", (job,))
+            self.connection.commit()
+        return new_run_id()
+
+    def claim(self, worker_id, lease=120.0):
+        """Lease the next pending (or abandoned) task, or return None if there is none"""
+        token = uuid.uuid4().hex
+        now = time.time()
+        with self.lock:
+            cursor = self.connection.execute(
+                "UPDATE tasks SET status = 'leased', worker = ?, token = ?, lease_expires = ?,"
+                " attempts = attempts + 1, updated_at = ? "
+                "WHERE id = (SELECT id FROM tasks"
+                "            WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?)"
+                "            ORDER BY priority DESC, id LIMIT 1)",
+                (worker_id, token, now + lease, now, now)
+            )
+            self.connection.commit()
+            if cursor.rowcount != 1:
+                return None
+            row = self.connection.execute(
+                "SELECT id, kind, payload, attempts FROM tasks WHERE token = ?", (token,)
+            ).fetchone()
+        if row is None:
+            return None
+        return Task(row[0], row[1], json.loads(row[2]), row[3], token)
+
+    def extend(self, task, lease=120.0):
+        """Renew a lease for a long-running task; False if it was lost to another worker"""
+        with self.lock:
+            cursor = self.connection.execute(
+                "UPDATE tasks SET lease_expires = ? WHERE id = ? AND token = ? AND status = 'leased'",
+                (time.time() + lease, task.id, task.token)
+            )
+            self.connection.commit()
+        return cursor.rowcount == 1
+
+    def complete(self, task, job=None, contacts=()):
+        """Mark a task done and store the contacts it produced, atomically"""
+        with self.lock:
+            cursor = self.connection.execute(
+                "UPDATE tasks SET status = 'done', updated_at = ? WHERE id = ? AND token = ? AND status = 'leased'",
+                (time.time(), task.id, task.token)
+            )
+            # Only the current lease holder may report results, so nothing is counted twice
+            if cursor.rowcount == 1 and contacts:
+                self.connection.executemany(
+                    "INSERT INTO task_contacts (job, contact) VALUES (?, ?)",
+                    [(job, json.dumps(contact)) for contact in contacts]
+                )
+            self.connection.commit()
+        return cursor.rowcount == 1
+
+    def fail(self, task, error, max_attempts=3):
+        """
+        Give a task back for another try, or mark it failed after max_attempts;
+        "lost" if the lease already went to another worker
+        """
+        status = "failed" if task.attempts >= max_attempts else "pending"
+        with self.lock:
+            cursor = self.connection.execute(
+                "UPDATE tasks SET status = ?, error = ?, updated_at = ? "
+                "WHERE id = ? AND token = ? AND status = 'leased'",
+                (status, str(error), time.time(), task.id, task.token)
+            )
+            self.connection.commit()
+        return status if cursor.rowcount == 1 else "lost"
+
+    def acquire_host(self, host, interval):
+        """
+        Reserve the next request slot for a host across all workers. Returns how
+        many seconds to wait before making the request.
+        """
+        now = time.time()
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.connection.execute(
+                    "SELECT next_at FROM host_slots WHERE host = ?", (host,)
+                ).fetchone()
+                slot = max(row[0], now) if row else now
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO host_slots (host, next_at) VALUES (?, ?)", (host, slot + interval)
+                )
+                self.connection.commit()
+            except Exception:
+                self.connection.rollback()
+                raise
+        return slot - now
+
+    def contacts(self, job):
+        """Every contact pushed back for a job"""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT contact FROM task_contacts WHERE job = ? ORDER BY id", (job,)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def stats(self):
+        """Task counts by status, plus collected contacts"""
+        with self.lock:
+            rows = self.connection.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall()
+            contacts = self.connection.execute("SELECT COUNT(*) FROM task_contacts").fetchone()[0]
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        counts.update(dict(rows))
+        counts["contacts"] = contacts
+        return counts
+
+
+# KEYS: the leases sorted set, then the pending lists in claim order.
+# ARGV: now, lease expiry, token, worker id, key prefix.
+_REDIS_CLAIM = """
+local prefix = ARGV[5]
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', KEYS[1], 0, ARGV[1])) do
+    redis.call('ZREM', KEYS[1], id)
+    local kind = redis.call('HGET', prefix .. ':task:' .. id, 'kind')
+    redis.call('LPUSH', prefix .. ':pending:' .. kind, id)
+end
+for i = 2, #KEYS do
+    local id = redis.call('RPOP', KEYS[i])
+    if id then
+        local key = prefix .. ':task:' .. id
+        redis.call('ZADD', KEYS[1], ARGV[2], id)
+        redis.call('HSET', key, 'token', ARGV[3])
+        redis.call('HSET', key, 'worker', ARGV[4])
+        local attempts = redis.call('HINCRBY', key, 'attempts', 1)
+        return {id, redis.call('HGET', key, 'kind'), redis.call('HGET', key, 'payload'), attempts}
+    end
+end
+return false
+"""
+
+# Lease changes below only go through while the caller's token still holds the task.
+# KEYS: the task hash, the leases sorted set. ARGV: token, task id, new expiry.
+_REDIS_EXTEND = """
+if redis.call('HGET', KEYS[1], 'token') ~= ARGV[1] or not redis.call('ZSCORE', KEYS[2], ARGV[2]) then
+    return 0
+end
+redis.call('ZADD', KEYS[2], ARGV[3], ARGV[2])
+return 1
+"""
+
+# KEYS: the task hash, the leases sorted set, the job's contacts list, the done counter.
+# ARGV: token, task id, then the contacts as JSON.
+_REDIS_COMPLETE = """
+if redis.call('HGET', KEYS[1], 'token') ~= ARGV[1] or redis.call('ZREM', KEYS[2], ARGV[2]) == 0 then
+    return 0
+end
+for i = 3, #ARGV do
+    redis.call('RPUSH', KEYS[3], ARGV[i])
+end
+redis.call('INCR', KEYS[4])
+return 1
+"""
+
+# KEYS: the task hash, the leases sorted set, the task kind's pending list, the failed counter.
+# ARGV: token, task id, error, "1" to give up on the task.
+_REDIS_FAIL = """
+if redis.call('HGET', KEYS[1], 'token') ~= ARGV[1] or redis.call('ZREM', KEYS[2], ARGV[2]) == 0 then
+    return 'lost'
+end
+redis.call('HSET', KEYS[1], 'error', ARGV[3])
+if ARGV[4] == '1' then
+    redis.call('INCR', KEYS[4])
+    return 'failed'
+end
+redis.call('LPUSH', KEYS[3], ARGV[2])
+return 'pending'
+"""
+
+
+class RedisWorkQueue:
+    """
+    The same queue on Redis (or a Redis-compatible server) for workers on
+    machines without a shared filesystem. Leases are a sorted set of expiry
+    times; expired leases are pushed back onto the pending lists on claim.
+    Claiming, renewing, completing and failing are each a single Lua script,
+    so a lease can't change hands between the check and the update.
+    """
+
+    def __init__(self, url="redis://localhost:6379/0", prefix="contact_scraper"):
+        if redis is None:
+            raise ImportError("The Redis queue backend needs 'pip install redis'")
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+        self._claim_script = self.client.register_script(_REDIS_CLAIM)
+        self._extend_script = self.client.register_script(_REDIS_EXTEND)
+        self._complete_script = self.client.register_script(_REDIS_COMPLETE)
+        self._fail_script = self.client.register_script(_REDIS_FAIL)
+
+    def _key(self, *parts):
+        return ":".join((self.prefix,) + parts)
+
+    def put(self, kind, payload, dedup_key=None, scope=None):
+        if dedup_key is not None:
+            # One set per run, expiring once the run stops adding to it
+            seen = self._key("seen", scope) if scope else self._key("seen")
+            if not self.client.sadd(seen, dedup_key):
+                return False
+            self.client.expire(seen, DEDUP_TTL)
+        task_id = str(self.client.incr(self._key("next_id")))
+        self.client.hset(self._key("task", task_id),
+                         mapping={"kind": kind, "payload": json.dumps(payload), "attempts": 0})
+        self.client.lpush(self._key("pending", kind), task_id)
+        return True
+
+    def start_run(self, job):
+        # Earlier runs' dedup sets expire on their own; their contacts go now
+        self.client.delete(self._key("contacts", job))
+        return new_run_id()
+
+    def claim(self, worker_id, lease=120.0):
+        # Requeuing expired leases, popping and leasing run as one script, so a
+        # worker dying midway can't leave a task off both the lists and the leases
+        kinds = sorted(TASK_PRIORITY, key=TASK_PRIORITY.get, reverse=True)
+        token = uuid.uuid4().hex
+        now = time.time()
+        claimed = self._claim_script(
+            keys=[self._key("leases")] + [self._key("pending", kind) for kind in kinds],
+            args=[now, now + lease, token, worker_id, self.prefix],
+        )
+        if not claimed:
+            return None
+        task_id, kind, payload, attempts = claimed
+        return Task(task_id, kind, json.loads(payload), int(attempts), token)
+
+    def extend(self, task, lease=120.0):
+        return bool(self._extend_script(
+            keys=[self._key("task", task.id), self._key("leases")],
+            args=[task.token, task.id, time.time() + lease],
+        ))
+
+    def complete(self, task, job=None, contacts=()):
+        return bool(self._complete_script(
+            keys=[self._key("task", task.id), self._key("leases"), self._key("contacts", job or ""),
+                  self._key("count", "done")],
+            args=[task.token, task.id] + [json.dumps(c) for c in contacts],
+        ))
+
+    def fail(self, task, error, max_attempts=3):
+        return self._fail_script(
+            keys=[self._key("task", task.id), self._key("leases"), self._key("pending", task.kind),
+                  self._key("count", "failed")],
+            args=[task.token, task.id, str(error), "1" if task.attempts >= max_attempts else "0"],
+        )
+
+    def acquire_host(self, host, interval):
+        key = self._key("host", host)
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    # Optimistic transaction: retried if another worker reserved a slot meanwhile
+                    pipe.watch(key)
+                    current = pipe.get(key)
+                    now = time.time()
+                    slot = max(float(current), now) if current else now
+                    pipe.multi()
+                    pipe.set(key, slot + interval, px=int((slot + interval - now + 60) * 1000))
+                    pipe.execute()
+                    return slot - now
+                except redis.WatchError:
+                    continue
+
+    def contacts(self, job):
+        return [json.loads(c) for c in self.client.lrange(self._key("contacts", job or ""), 0, -1)]
+
+    def stats(self):
+        pending = sum(self.client.llen(self._key("pending", kind)) for kind in TASK_PRIORITY)
+        return {
+            "pending": pending,
+            "leased": self.client.zcard(self._key("leases")),
+            "done": int(self.client.get(self._key("count", "done")) or 0),
+            "failed": int(self.client.get(self._key("count", "failed")) or 0),
+            "contacts": sum(self.client.llen(key) for key in self.client.scan_iter(self._key("contacts", "*"))),
+        }
+
+
+def open_queue(spec=None):
+    """Queue for a spec: a redis:// (or rediss://) URL, or the path of a SQLite file"""
+    spec = spec or DEFAULT_QUEUE_PATH
+    if spec.startswith(("redis://", "rediss://", "unix://")):
+        return RedisWorkQueue(spec)
+    return SQLiteWorkQueue(spec)